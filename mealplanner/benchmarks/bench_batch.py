@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.batch import RecipeBatch
+from src.ingredients import ingredient_registry
+
+COUNT = 100_000
+PER_RECIPE = 3
+
+
+def bench_validate_and_build_batch(benchmark):
+    ids = [ingredient_registry.intern(name) for name in ("flour", "milk", "eggs")]
+    rng = np.random.default_rng(0)
+    args = (
+        [f"R{index}" for index in range(COUNT)],
+        rng.uniform(0, 100, (COUNT, 4)),
+        np.arange(0, COUNT * PER_RECIPE + 1, PER_RECIPE),
+        np.tile(np.array(ids), COUNT),
+        rng.uniform(0, 100, COUNT * PER_RECIPE),
+    )
+
+    def build():
+        return RecipeBatch(*args).recipes()
+
+    recipes = benchmark.pedantic(build, rounds=5)
+    assert len(recipes) == COUNT
@@ -0,0 +1,18 @@
+from src.categories import Categorizer
+
+# Distinct names repeat, so the per-name cache is exercised as well.
+NAMES = [
+    f"organic {word} {index % 500}"
+    for index, word in zip(range(50_000), ["apples", "rice", "cod"] * 20_000)
+]
+
+
+def bench_classify_many(benchmark):
+    def setup():
+        return (Categorizer(),), {}
+
+    def classify(categorizer):
+        return categorizer.classify_many(NAMES)
+
+    categories = benchmark.pedantic(classify, setup=setup, rounds=20)
+    assert categories[:3] == ["produce", "pantry", "seafood"]
@@ -0,0 +1,38 @@
+from src.mealplan import MealPlan
+from src.synthetic import make_mealplan
+
+
+def bench_build_plan(benchmark, catalog, scale):
+    plan = benchmark(make_mealplan, catalog, scale)
+    assert sum(len(meals) for meals in plan.plan.values()) == scale
+
+
+def bench_weekly_summary_cold(benchmark, catalog, scale):
+    plan = make_mealplan(catalog, scale)
+
+    def invalidate():
+        # Forces the running totals to be rebuilt from every meal.
+        plan._totals.clear()
+
+    summary = benchmark.pedantic(plan.weekly_summary, setup=invalidate, rounds=20)
+    assert len(summary) == 7
+
+
+def bench_weekly_summary_cached(benchmark, catalog, scale):
+    plan = make_mealplan(catalog, scale)
+    plan.weekly_summary()
+    summary = benchmark(plan.weekly_summary)
+    assert len(summary) == 7
+
+
+def bench_remove_meals_by_handle(benchmark, meals):
+    def setup():
+        plan = MealPlan()
+        handles = [plan.add_meal("Monday", meal) for meal in meals]
+        return (plan, handles), {}
+
+    def remove_all(plan, handles):
+        for handle in handles:
+            plan.remove_meal_by_handle(handle)
+
+    benchmark.pedantic(remove_all, setup=setup, rounds=20)
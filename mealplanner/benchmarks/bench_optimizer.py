@@ -0,0 +1,38 @@
+import pytest
+
+from src.optimizer import PlanOptimizer
+
+# These runs last as long as their time budget rather than their workload,
+# so they are checked against the budget instead of a recorded baseline.
+pytestmark = pytest.mark.no_baseline
+
+TARGETS = {"kcal": 2000, "protein": 100, "fat": 70, "carbs": 250}
+
+
+def _slowest(benchmark):
+    return benchmark.stats.stats.max if benchmark.stats is not None else 0.0
+
+
+def bench_optimize_within_budget(benchmark, catalog):
+    optimizer = PlanOptimizer(
+        catalog[:300], TARGETS, min_meals=3, max_meals=5, candidates=200
+    )
+    plan = benchmark.pedantic(
+        optimizer.optimize,
+        kwargs={"days": ["Monday", "Friday"], "time_budget": 0.2},
+        rounds=5,
+    )
+    assert len(plan.get_meals("Monday")) >= 3
+    assert _slowest(benchmark) < 1.0
+
+
+def bench_optimize_exhausted_budget(benchmark, catalog):
+    optimizer = PlanOptimizer(catalog, TARGETS, candidates=200)
+
+    def exhaust():
+        with pytest.raises(TimeoutError):
+            optimizer.optimize(time_budget=0.0001)
+
+    benchmark.pedantic(exhaust, rounds=5)
+    # Giving up must not wait for the candidate pools to be built in full.
+    assert _slowest(benchmark) < 0.1
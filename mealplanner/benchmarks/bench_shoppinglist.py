@@ -0,0 +1,28 @@
+from src.aggregation import aggregate_shopping_list
+from src.shoppinglist import generate_shopping_list
+
+
+def bench_generate_shopping_list(benchmark, meals):
+    result = benchmark(generate_shopping_list, meals)
+    assert result
+
+
+def bench_aggregate_shopping_list(benchmark, meals):
+    result = benchmark(aggregate_shopping_list, meals)
+    assert result
+
+
+def bench_merge(benchmark, shopping_lists):
+    first, second = shopping_lists
+    merged = benchmark(first.merge, second)
+    assert merged.get_total_items() == first.get_total_items()
+
+
+def bench_filter_by_threshold(benchmark, shopping_lists):
+    filtered = benchmark(shopping_lists[0].filter_by_threshold, 500)
+    assert filtered.get_total_items() <= shopping_lists[0].get_total_items()
+
+
+def bench_scale_quantities(benchmark, shopping_lists):
+    # A factor of one keeps the shared list unchanged between rounds.
+    benchmark(shopping_lists[0].scale_quantities, 1.0)
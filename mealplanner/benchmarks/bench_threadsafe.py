@@ -0,0 +1,79 @@
+import sys
+import threading
+
+import pytest
+
+from src.mealplan import DAYS
+from src.synthetic import ingredient_names
+from src.threadsafe import ConcurrentMealPlan, ConcurrentShoppingList
+
+# Thread scheduling makes these timings too noisy for a regression gate;
+# they are recorded to compare scaling across thread counts and builds.
+pytestmark = pytest.mark.no_baseline
+
+
+def _run_threads(worker, threads):
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+
+def _record(benchmark, operations):
+    # The total work is fixed, so throughput shows how it scales with threads.
+    benchmark.extra_info["operations"] = operations
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    benchmark.extra_info["gil_enabled"] = gil_enabled
+    if benchmark.stats is not None:
+        benchmark.extra_info["ops_per_second"] = operations / benchmark.stats.stats.min
+
+
+def bench_concurrent_mealplan(benchmark, catalog, scale, threads):
+    per_thread = max(scale // threads, 1)
+
+    def setup():
+        return (ConcurrentMealPlan(),), {}
+
+    def stress(plan):
+        def worker(index):
+            day = DAYS[index % len(DAYS)]
+            for offset in range(per_thread):
+                handle = plan.add_meal(day, catalog[offset % len(catalog)])
+                if offset % 4 == 0:
+                    plan.weekly_summary()
+                if offset % 2 == 0:
+                    plan.remove_meal_by_handle(handle)
+
+        _run_threads(worker, threads)
+        return plan
+
+    plan = benchmark.pedantic(stress, setup=setup, rounds=10)
+    planned = sum(len(meals) for meals in plan.plan.values())
+    assert planned == threads * (per_thread // 2)
+    _record(benchmark, threads * per_thread)
+
+
+def bench_concurrent_shopping_list(benchmark, scale, threads):
+    per_thread = max(scale // threads, 1)
+    names = ingredient_names(1000)
+
+    def setup():
+        return (ConcurrentShoppingList(),), {}
+
+    def stress(shopping_list):
+        def worker(index):
+            for offset in range(per_thread):
+                name = names[(index * 7919 + offset) % len(names)]
+                shopping_list.add_item(name, 1)
+                if offset % 64 == 0:
+                    shopping_list.get_total_quantity()
+                if offset % 256 == 0:
+                    shopping_list.scale_quantities(1.0)
+
+        _run_threads(worker, threads)
+        return shopping_list
+
+    shopping_list = benchmark.pedantic(stress, setup=setup, rounds=10)
+    assert shopping_list.get_total_quantity() == threads * per_thread
+    _record(benchmark, threads * per_thread)
@@ -0,0 +1,100 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.synthetic import make_recipes, make_shopping_list, sample_meals
+
+SCALES = [
+    int(scale)
+    for scale in os.environ.get("MEALPLANNER_BENCH_SCALES", "1000").split(",")
+]
+THREADS = [
+    int(count)
+    for count in os.environ.get("MEALPLANNER_BENCH_THREADS", "1,2,4,8").split(",")
+]
+THRESHOLD = float(os.environ.get("MEALPLANNER_BENCH_THRESHOLD", "0.5"))
+UPDATE = os.environ.get("MEALPLANNER_BENCH_UPDATE") == "1"
+CHECK = os.environ.get("MEALPLANNER_BENCH_CHECK") == "1"
+BASELINES = Path(__file__).with_name("baselines.json")
+
+# Large workloads reference a catalog of at most this many distinct recipes.
+CATALOG_SIZE = 10_000
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        metafunc.parametrize("scale", SCALES, scope="session")
+    if "threads" in metafunc.fixturenames:
+        metafunc.parametrize("threads", THREADS)
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    return make_recipes(CATALOG_SIZE, seed=1)
+
+
+def _reference_workload() -> None:
+    totals = {}
+    for index in range(20_000):
+        key = index % 500
+        totals[key] = totals.get(key, 0.0) + index * 0.5
+    sorted(totals.items())
+
+
+@pytest.fixture(scope="session")
+def calibration():
+    """Fastest time of a fixed workload, measuring this machine's speed."""
+    fastest = float("inf")
+    for _ in range(30):
+        start = time.perf_counter()
+        _reference_workload()
+        fastest = min(fastest, time.perf_counter() - start)
+    return fastest
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    recorded = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    yield recorded
+    if UPDATE:
+        BASELINES.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(autouse=True)
+def check_regression(request, benchmark, baselines, calibration):
+    """Compares each benchmark with its baseline, relative to the calibration.
+
+    Baselines are stored as the fastest round divided by the calibration
+    time, so they carry over between machines of different speed. The
+    check only runs with MEALPLANNER_BENCH_CHECK=1.
+    """
+    yield
+    if benchmark.disabled or benchmark.stats is None:
+        return
+    if request.node.get_closest_marker("no_baseline"):
+        return
+    ratio = benchmark.stats.stats.min / calibration
+    benchmark.extra_info["calibrated_ratio"] = ratio
+    key = request.node.name
+    if UPDATE:
+        baselines[key] = ratio
+        return
+    baseline = baselines.get(key)
+    if CHECK and baseline is not None and ratio > baseline * (1 + THRESHOLD):
+        pytest.fail(
+            f"{key} regressed: {ratio:.3f}x vs baseline {baseline:.3f}x the "
+            f"calibration workload (threshold {THRESHOLD:.0%})"
+        )
+
+
+@pytest.fixture(scope="session")
+def meals(catalog, scale):
+    return sample_meals(catalog, scale, seed=2)
+
+
+@pytest.fixture(scope="session")
+def shopping_lists(scale):
+    return make_shopping_list(scale, seed=3), make_shopping_list(scale, seed=4)
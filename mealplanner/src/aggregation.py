@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.ingredients import IngredientMap, ingredient_registry
+from src.recipe import Recipe, ScaledRecipe
+
+
+class RecipeMatrix:
+    """CSR-style recipe x ingredient quantity matrix.
+
+    Row ``i`` holds the ingredients of the i-th recipe: its interned
+    ingredient ids are ``indices[indptr[i]:indptr[i + 1]]`` and the matching
+    quantities are the same slice of ``data``.
+    """
+
+    def __init__(self, recipes: Sequence[Recipe]) -> None:
+        lengths = np.zeros(len(recipes), dtype=np.int64)
+        ids: List[int] = []
+        quantities: List[float] = []
+        for row, recipe in enumerate(recipes):
+            ingredients = recipe.ingredients
+            if isinstance(ingredients, IngredientMap):
+                ids.extend(ingredients.ids)
+                quantities.extend(ingredients.quantities)
+            else:
+                for ingredient, quantity in ingredients.items():
+                    ids.append(ingredient_registry.intern(ingredient))
+                    quantities.append(quantity)
+            lengths[row] = len(ingredients)
+
+        self.indptr = np.zeros(len(recipes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.asarray(ids, dtype=np.int64)
+        self.data = np.asarray(quantities, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def shape(self) -> tuple:
+        return len(self), len(ingredient_registry)
+
+    def totals(self, multipliers: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Returns the matrix-vector product ``multipliers @ matrix``.
+
+        The result is a dense vector indexed by ingredient id. Without
+        multipliers every recipe is counted once.
+        """
+        weights = self._weights(multipliers)
+        return np.bincount(self.indices, weights=weights, minlength=self.shape[1])
+
+    def to_shopping_list(
+        self, multipliers: Optional[Sequence[float]] = None
+    ) -> Dict[str, float]:
+        """Returns the aggregated quantities keyed by ingredient name.
+
+        Like ``generate_shopping_list``, ingredients listed with a zero
+        quantity are kept; recipes with a zero multiplier contribute nothing.
+        """
+        weights = self._weights(multipliers)
+        totals = np.bincount(self.indices, weights=weights, minlength=self.shape[1])
+        if multipliers is None:
+            present = np.bincount(self.indices, minlength=self.shape[1]) > 0
+        else:
+            used = np.repeat(self._multipliers(multipliers) != 0, np.diff(self.indptr))
+            present = np.bincount(self.indices[used], minlength=self.shape[1]) > 0
+
+        names = ingredient_registry.names()
+        ingredient_ids = np.flatnonzero(present)
+        return dict(
+            zip(
+                [names[ingredient_id] for ingredient_id in ingredient_ids.tolist()],
+                totals[ingredient_ids].tolist(),
+            )
+        )
+
+    def _multipliers(self, multipliers: Sequence[float]) -> np.ndarray:
+        values = np.asarray(multipliers, dtype=np.float64)
+        if values.shape != (len(self),):
+            raise ValueError("Expected one multiplier per recipe")
+        if np.any(values < 0) or np.any(np.isnan(values)):
+            raise ValueError("Multipliers must be non-negative")
+        return values
+
+    def _weights(self, multipliers: Optional[Sequence[float]]) -> np.ndarray:
+        if multipliers is None:
+            return self.data
+        per_row = self._multipliers(multipliers)
+        return self.data * np.repeat(per_row, np.diff(self.indptr))
+
+
+def aggregate_shopping_list(
+    recipes: Iterable[Recipe], multipliers: Optional[Iterable[float]] = None
+) -> Dict[str, float]:
+    """Batch equivalent of ``generate_shopping_list`` for large orders.
+
+    Repeated recipe objects are collapsed into a single matrix row whose
+    multiplier is the sum of their multipliers, so an order of millions of
+    recipe instances only builds rows for the distinct recipes in it.
+    ``ScaledRecipe`` views share the row of their base recipe.
+    """
+    rows: Dict[int, int] = {}
+    unique: List[Recipe] = []
+    counts: List[float] = []
+    if multipliers is None:
+        pairs = ((recipe, 1.0) for recipe in recipes)
+    else:
+        pairs = zip(recipes, multipliers, strict=True)
+    for recipe, multiplier in pairs:
+        if isinstance(recipe, ScaledRecipe):
+            multiplier *= recipe.factor
+            recipe = recipe.base
+        row = rows.get(id(recipe))
+        if row is None:
+            row = rows[id(recipe)] = len(unique)
+            unique.append(recipe)
+            counts.append(0.0)
+        counts[row] += multiplier
+
+    return RecipeMatrix(unique).to_shopping_list(counts)
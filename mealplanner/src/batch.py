@@ -0,0 +1,165 @@
+from array import array
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from src.ingredients import IngredientMap, ingredient_registry
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS
+
+
+class RecipeValidationError(ValueError):
+    """Raised when rows of a ``RecipeBatch`` are invalid.
+
+    ``errors`` maps every bad row index to the problems found in it.
+    """
+
+    def __init__(self, errors: Dict[int, List[str]]) -> None:
+        self.errors = errors
+        shown = [
+            f"row {row}: {', '.join(problems)}"
+            for row, problems in list(errors.items())[:5]
+        ]
+        if len(errors) > len(shown):
+            shown.append(f"... and {len(errors) - len(shown)} more rows")
+        super().__init__(f"{len(errors)} invalid recipes: " + "; ".join(shown))
+
+
+class RecipeBatch:
+    """Many recipes held as columns and validated in one pass.
+
+    Ingredients are given CSR-style: the ingredients of recipe ``i`` are
+    ``ingredient_ids[indptr[i]:indptr[i + 1]]`` (ids interned in
+    ``ingredient_registry``) with the matching slice of ``quantities``.
+    All rows are checked with array operations for empty names, negative
+    or NaN values, unknown ingredient ids and repeated ingredients, and
+    every invalid row is reported together in a ``RecipeValidationError``.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        nutrients: Sequence[Sequence[float]],
+        indptr: Sequence[int],
+        ingredient_ids: Sequence[int],
+        quantities: Sequence[float],
+    ) -> None:
+        self.names = list(names)
+        self.nutrients = np.asarray(nutrients, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        ingredient_ids = np.asarray(ingredient_ids)
+        if ingredient_ids.size and not np.issubdtype(ingredient_ids.dtype, np.integer):
+            # Casting would silently truncate ids like 1.7.
+            raise TypeError("Ingredient ids must be integers")
+        # Ids keep their own dtype until checked against the registry, since
+        # narrowing first would wrap ids such as 2**32 + 1 onto valid ones.
+        self.ingredient_ids = ingredient_ids
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+
+        count = len(self.names)
+        if self.nutrients.shape != (count, len(NUTRIENTS)):
+            raise ValueError(f"nutrients must have shape ({count}, {len(NUTRIENTS)})")
+        if self.indptr.shape != (count + 1,):
+            raise ValueError("indptr must have one entry more than there are names")
+        if self.ingredient_ids.shape != self.quantities.shape:
+            raise ValueError("Ingredient ids and quantities must have equal length")
+        if (
+            self.indptr[0] != 0
+            or self.indptr[-1] != len(self.ingredient_ids)
+            or np.any(np.diff(self.indptr) < 0)
+        ):
+            raise ValueError("indptr must rise from 0 to the number of ingredients")
+        self._validate()
+        self.ingredient_ids = ingredient_ids.astype(np.intc)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        names: Sequence[str],
+        kcal: Sequence[float],
+        protein: Sequence[float],
+        fat: Sequence[float],
+        carbs: Sequence[float],
+        indptr: Sequence[int],
+        ingredient_ids: Sequence[int],
+        quantities: Sequence[float],
+    ) -> "RecipeBatch":
+        """Builds a batch from one array per nutrient."""
+        columns = (kcal, protein, fat, carbs)
+        nutrients = np.column_stack(
+            [np.asarray(column, dtype=np.float64) for column in columns]
+        )
+        return cls(names, nutrients, indptr, ingredient_ids, quantities)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _validate(self) -> None:
+        errors: Dict[int, List[str]] = {}
+
+        def report(rows: np.ndarray, problem: str) -> None:
+            for row in np.unique(rows).tolist():
+                errors.setdefault(row, []).append(problem)
+
+        valid_names = np.fromiter(
+            (isinstance(name, str) and name != "" for name in self.names),
+            dtype=bool,
+            count=len(self.names),
+        )
+        report(np.flatnonzero(~valid_names), "empty name")
+
+        nutrients = self.nutrients
+        report(np.flatnonzero(np.isnan(nutrients).any(axis=1)), "NaN nutrient")
+        report(np.flatnonzero((nutrients < 0).any(axis=1)), "negative nutrient")
+
+        rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        quantities = self.quantities
+        report(rows[np.isnan(quantities)], "NaN quantity")
+        report(rows[quantities < 0], "negative quantity")
+
+        ids = self.ingredient_ids
+        unknown = (ids < 0) | (ids >= len(ingredient_registry))
+        report(rows[unknown], "unknown ingredient")
+        order = np.lexsort((ids, rows))
+        repeated = (np.diff(rows[order]) == 0) & (np.diff(ids[order]) == 0)
+        report(rows[order][1:][repeated], "repeated ingredient")
+
+        if errors:
+            raise RecipeValidationError(dict(sorted(errors.items())))
+
+    def recipe(self, index: int) -> Recipe:
+        """Builds the recipe at the given row."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Recipe index out of range: {index}")
+        start, end = self.indptr[index : index + 2].tolist()
+        ids = array("i")
+        ids.frombytes(self.ingredient_ids[start:end].tobytes())
+        return self._build(
+            self.names[index],
+            ids,
+            self.quantities[start:end].tolist(),
+            self.nutrients[index].tolist(),
+        )
+
+    def __iter__(self) -> Iterator[Recipe]:
+        ids = array("i")
+        ids.frombytes(self.ingredient_ids.tobytes())
+        quantities = self.quantities.tolist()
+        bounds = self.indptr.tolist()
+        for index, values in enumerate(self.nutrients.tolist()):
+            start, end = bounds[index], bounds[index + 1]
+            yield self._build(
+                self.names[index], ids[start:end], quantities[start:end], values
+            )
+
+    def recipes(self) -> List[Recipe]:
+        """Builds every recipe of the batch."""
+        return list(self)
+
+    @staticmethod
+    def _build(
+        name: str, ids: array, quantities: List[float], values: List[float]
+    ) -> Recipe:
+        # The batch is already validated, so Recipe.__init__ is skipped.
+        ingredients = IngredientMap._from_validated(ids, quantities)
+        return Recipe._from_validated(name, ingredients, *values)
@@ -0,0 +1,206 @@
+import mmap
+import struct
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS
+
+MAGIC = b"MPRCAT01"
+
+# Magic, recipe count, ingredient entry count, string count and the byte
+# offsets of the seven sections, all little-endian.
+_HEADER = struct.Struct("<8s3Q7Q")
+
+_NUTRIENTS_DTYPE = np.dtype("<f8")
+_NAME_DTYPE = np.dtype("<i4")
+_INDPTR_DTYPE = np.dtype("<i8")
+_INGREDIENT_DTYPE = np.dtype("<i4")
+_QUANTITY_DTYPE = np.dtype("<f8")
+_STRING_OFFSET_DTYPE = np.dtype("<i8")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_catalog(path: str, recipes: Iterable[Recipe]) -> int:
+    """Writes recipes to a binary catalog file and returns their count.
+
+    The file holds fixed-width nutrient columns, CSR-style ingredient
+    arrays and a deduplicated UTF-8 string table for recipe and ingredient
+    names, all 8-byte aligned so they can be mapped without copying.
+    """
+    strings: Dict[str, int] = {}
+
+    def string_id(value: object) -> int:
+        if not isinstance(value, str):
+            raise TypeError("Recipe and ingredient names must be strings")
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    nutrients: List[float] = []
+    names: List[int] = []
+    indptr: List[int] = [0]
+    ingredient_ids: List[int] = []
+    quantities: List[float] = []
+    for recipe in recipes:
+        nutrients.extend((recipe.kcal, recipe.protein, recipe.fat, recipe.carbs))
+        names.append(string_id(recipe.name))
+        for ingredient, quantity in recipe.ingredients.items():
+            ingredient_ids.append(string_id(ingredient))
+            quantities.append(quantity)
+        indptr.append(len(ingredient_ids))
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=_STRING_OFFSET_DTYPE)
+    np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+
+    sections = [
+        np.asarray(nutrients, dtype=_NUTRIENTS_DTYPE).tobytes(),
+        np.asarray(names, dtype=_NAME_DTYPE).tobytes(),
+        np.asarray(indptr, dtype=_INDPTR_DTYPE).tobytes(),
+        np.asarray(ingredient_ids, dtype=_INGREDIENT_DTYPE).tobytes(),
+        np.asarray(quantities, dtype=_QUANTITY_DTYPE).tobytes(),
+        string_offsets.tobytes(),
+        b"".join(encoded),
+    ]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position = _align(position)
+        offsets.append(position)
+        position += len(section)
+
+    with open(path, "wb") as file:
+        counts = (len(names), len(ingredient_ids), len(encoded))
+        file.write(_HEADER.pack(MAGIC, *counts, *offsets))
+        for offset, section in zip(offsets, sections):
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(section)
+    return len(names)
+
+
+class MappedCatalog:
+    """Read-only recipe catalog backed by a memory-mapped file.
+
+    Opening only maps the file and creates array views into it, so the
+    cost does not depend on the catalog size and processes mapping the
+    same file share its pages. ``Recipe`` objects are built only on demand.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError("Not a recipe catalog file")
+        if header[0] != MAGIC:
+            self._mmap.close()
+            raise ValueError("Not a recipe catalog file")
+
+        recipes, entries, strings = header[1:4]
+        offsets = header[4:]
+        buffer = self._mmap
+        self.nutrient_columns = np.frombuffer(
+            buffer, _NUTRIENTS_DTYPE, recipes * len(NUTRIENTS), offsets[0]
+        ).reshape(recipes, len(NUTRIENTS))
+        self._names = np.frombuffer(buffer, _NAME_DTYPE, recipes, offsets[1])
+        self._indptr = np.frombuffer(buffer, _INDPTR_DTYPE, recipes + 1, offsets[2])
+        self._ingredients = np.frombuffer(
+            buffer, _INGREDIENT_DTYPE, entries, offsets[3]
+        )
+        self._quantities = np.frombuffer(buffer, _QUANTITY_DTYPE, entries, offsets[4])
+        self._string_offsets = np.frombuffer(
+            buffer, _STRING_OFFSET_DTYPE, strings + 1, offsets[5]
+        )
+        self._string_data = offsets[6]
+        self._string_ids: Optional[Dict[str, int]] = None
+
+    def close(self) -> None:
+        """Releases the array views and unmaps the file."""
+        self.nutrient_columns = self._names = self._indptr = None
+        self._ingredients = self._quantities = self._string_offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views handed out to callers keep the mapping alive until
+            # they are garbage collected.
+            pass
+
+    def __enter__(self) -> "MappedCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def name(self, index: int) -> str:
+        """Returns the name of the recipe at the given index."""
+        return self._string(int(self._names[self._check(index)]))
+
+    def nutrients(self, index: int) -> Dict[str, float]:
+        """Returns the nutrients of the recipe at the given index."""
+        row = self.nutrient_columns[self._check(index)]
+        return dict(zip(NUTRIENTS, row.tolist()))
+
+    def ingredients(self, index: int) -> Dict[str, float]:
+        """Returns the ingredients of the recipe at the given index."""
+        index = self._check(index)
+        start, end = self._indptr[index], self._indptr[index + 1]
+        return {
+            self._string(ingredient): quantity
+            for ingredient, quantity in zip(
+                self._ingredients[start:end].tolist(),
+                self._quantities[start:end].tolist(),
+            )
+        }
+
+    def recipe(self, index: int) -> Recipe:
+        """Materializes the recipe at the given index."""
+        return Recipe(
+            self.name(index), self.ingredients(index), **self.nutrients(index)
+        )
+
+    __getitem__ = recipe
+
+    def find_by_name(self, name: str) -> List[int]:
+        """Returns indexes of recipes with exactly the given name."""
+        string_id = self._lookup(name)
+        if string_id is None:
+            return []
+        return np.flatnonzero(self._names == string_id).tolist()
+
+    def find_by_ingredient(self, name: str) -> List[int]:
+        """Returns indexes of recipes using the given ingredient."""
+        string_id = self._lookup(name)
+        if string_id is None:
+            return []
+        entries = np.flatnonzero(self._ingredients == string_id)
+        return (np.searchsorted(self._indptr, entries, side="right") - 1).tolist()
+
+    def _check(self, index: int) -> int:
+        if not 0 <= index < len(self._names):
+            raise IndexError(f"Recipe index out of range: {index}")
+        return index
+
+    def _string(self, string_id: int) -> str:
+        start = self._string_data + int(self._string_offsets[string_id])
+        end = self._string_data + int(self._string_offsets[string_id + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def _lookup(self, value: str) -> Optional[int]:
+        # The string table is only decoded for searches, and only once.
+        if self._string_ids is None:
+            self._string_ids = {
+                self._string(string_id): string_id
+                for string_id in range(len(self._string_offsets) - 1)
+            }
+        return self._string_ids.get(value)
@@ -0,0 +1,209 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from src.mealplan import MealHandle, MealList, _RecipeWatcher
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS
+
+# Summaries are rounded to this many decimals, so removed meals leave no
+# floating-point residue in the trees' differences.
+_DIGITS = 9
+
+Values = Tuple[float, ...]
+
+
+def _values(meal: Recipe) -> Values:
+    return (meal.kcal, meal.protein, meal.fat, meal.carbs)
+
+
+class CalendarPlan:
+    """Meal plan indexed by calendar date over an arbitrary date range.
+
+    Nutrient totals are kept in one Fenwick tree per nutrient, so adding or
+    removing a meal and summarizing any date range both take O(log n) for
+    n days. Planned recipes report in-place changes of their nutrients
+    through a listener, and only the dates they are planned on are
+    updated, in O(log n) each.
+    """
+
+    def __init__(self, start: date, end: date) -> None:
+        if not isinstance(start, date) or not isinstance(end, date):
+            raise TypeError("start and end must be dates")
+        if end < start:
+            raise ValueError("end cannot be before start")
+        self.start = start
+        self.end = end
+        self._size = (end - start).days + 1
+        self._meals: Dict[int, MealList] = {}
+        self._handles: Dict[MealHandle, int] = {}
+        self._build()
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Trees and listeners are rebuilt from the meals.
+        state = self.__dict__.copy()
+        for name in ("_trees", "_watcher", "_watched"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._build()
+
+    def __del__(self) -> None:
+        # Nothing is watched yet if __init__ rejected its arguments.
+        for recipe, _, _ in getattr(self, "_watched", {}).values():
+            recipe.unsubscribe(self._watcher)
+
+    def __len__(self) -> int:
+        """Returns the number of days covered by the plan."""
+        return self._size
+
+    def days(self) -> Iterator[date]:
+        """Yields every date of the plan in order."""
+        for offset in range(self._size):
+            yield self.start + timedelta(days=offset)
+
+    def add_meal(self, day: date, meal: Recipe) -> MealHandle:
+        """Adds a meal to a date and returns a handle for removing it."""
+        if not isinstance(meal, Recipe):
+            raise TypeError("meal must be an instance of Recipe")
+        position = self._position(day)
+        handle = self._meals.setdefault(position, MealList()).add(meal)
+        self._handles[handle] = position
+        self._watch(meal, position)
+        return handle
+
+    def remove_meal(self, day: date, meal: Recipe) -> None:
+        """Removes one occurrence of a meal from a date."""
+        meals = self._meals.get(self._position(day))
+        handle = meals.handle_of(meal) if meals else None
+        if handle is None:
+            raise ValueError("Meal not found on the specified day")
+        self.remove_meal_by_handle(handle)
+
+    def remove_meal_by_handle(self, handle: MealHandle) -> Recipe:
+        """Removes the meal a handle refers to and returns its recipe."""
+        position = self._handles.pop(handle, None)
+        if position is None:
+            raise ValueError("Meal handle not found in the plan")
+        meal = self._meals[position].pop_handle(handle)
+        if not self._meals[position]:
+            del self._meals[position]
+        self._unwatch(meal, position)
+        return meal
+
+    def clear_day(self, day: date) -> None:
+        """Removes all meals from a date."""
+        meals = self._meals.get(self._position(day))
+        for handle in meals.handles() if meals else ():
+            self.remove_meal_by_handle(handle)
+
+    def get_meals(self, day: date) -> List[Recipe]:
+        """Returns a copy of the meals planned for a date."""
+        return list(self._meals.get(self._position(day), ()))
+
+    def daily_summary(self, day: date) -> Dict[str, float]:
+        """Returns nutrient totals for a single date."""
+        return self.range_summary(day, day)
+
+    def range_summary(self, first: date, last: date) -> Dict[str, float]:
+        """Returns nutrient totals over the inclusive range ``first..last``."""
+        low, high = self._position(first), self._position(last)
+        if high < low:
+            raise ValueError("last cannot be before first")
+        return {
+            nutrient: round(
+                self._prefix(tree, high + 1) - self._prefix(tree, low), _DIGITS
+            )
+            for nutrient, tree in zip(NUTRIENTS, self._trees)
+        }
+
+    def monthly_summary(self, year: int, month: int) -> Dict[str, float]:
+        """Returns totals for a calendar month, clipped to the plan's range."""
+        first, last = self._clip(*_month_bounds(year, month))
+        return self.range_summary(first, last)
+
+    def _clip(self, first: date, last: date) -> Tuple[date, date]:
+        first, last = max(first, self.start), min(last, self.end)
+        if last < first:
+            raise ValueError("Range does not overlap the plan")
+        return first, last
+
+    def _position(self, day: date) -> int:
+        if not isinstance(day, date):
+            raise TypeError("day must be a date")
+        if isinstance(day, datetime):
+            day = day.date()
+        position = (day - self.start).days
+        if not 0 <= position < self._size:
+            raise ValueError(f"{day} is outside the plan")
+        return position
+
+    def _watch(self, meal: Recipe, position: int) -> None:
+        entry = self._watched.get(id(meal))
+        if entry is None:
+            # The values are those added to the trees, to be taken back out.
+            entry = self._watched[id(meal)] = (meal, _values(meal), {})
+            meal.subscribe(self._watcher)
+        positions = entry[2]
+        positions[position] = positions.get(position, 0) + 1
+        self._update(position, entry[1])
+
+    def _unwatch(self, meal: Recipe, position: int) -> None:
+        _, values, positions = self._watched[id(meal)]
+        positions[position] -= 1
+        if not positions[position]:
+            del positions[position]
+            if not positions:
+                del self._watched[id(meal)]
+                meal.unsubscribe(self._watcher)
+        self._update(position, tuple(-value for value in values))
+
+    def _recipe_changed(self, recipe: Recipe) -> None:
+        _, old, positions = self._watched[id(recipe)]
+        new = _values(recipe)
+        self._watched[id(recipe)] = (recipe, new, positions)
+        for position, count in positions.items():
+            delta = tuple(count * (a - b) for a, b in zip(new, old))
+            self._update(position, delta)
+
+    def _update(self, position: int, values: Values) -> None:
+        index = position + 1
+        while index <= self._size:
+            for tree, value in zip(self._trees, values):
+                tree[index] += value
+            index += index & -index
+
+    @staticmethod
+    def _prefix(tree: List[float], count: int) -> float:
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def _build(self) -> None:
+        self._watcher = _RecipeWatcher(self)
+        self._watched: Dict[int, Tuple[Recipe, Values, Dict[int, int]]] = {}
+        self._trees = [[0.0] * (self._size + 1) for _ in NUTRIENTS]
+        for position, meals in self._meals.items():
+            for meal in meals:
+                entry = self._watched.get(id(meal))
+                if entry is None:
+                    entry = self._watched[id(meal)] = (meal, _values(meal), {})
+                    meal.subscribe(self._watcher)
+                entry[2][position] = entry[2].get(position, 0) + 1
+                for tree, value in zip(self._trees, entry[1]):
+                    tree[position + 1] += value
+        # Linear-time Fenwick construction: push each node into its parent.
+        for index in range(1, self._size + 1):
+            parent = index + (index & -index)
+            if parent <= self._size:
+                for tree in self._trees:
+                    tree[parent] += tree[index]
+
+
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    first = date(year, month, 1)
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return first, following - timedelta(days=1)
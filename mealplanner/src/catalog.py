@@ -0,0 +1,198 @@
+import sqlite3
+import weakref
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.recipe import Recipe
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    kcal NUMERIC NOT NULL,
+    protein NUMERIC NOT NULL,
+    fat NUMERIC NOT NULL,
+    carbs NUMERIC NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recipes_name ON recipes (name);
+
+CREATE TABLE IF NOT EXISTS ingredients (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS recipe_ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE,
+    ingredient_id INTEGER NOT NULL REFERENCES ingredients (id),
+    position INTEGER NOT NULL,
+    quantity NUMERIC NOT NULL,
+    PRIMARY KEY (recipe_id, ingredient_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_ingredient
+    ON recipe_ingredients (ingredient_id, recipe_id);
+"""
+
+
+class RecipeCatalog:
+    """Recipe catalog persisted in a SQLite database.
+
+    Opening a catalog only prepares the schema; recipes are materialized
+    one at a time when they are accessed. Materialized recipes are cached
+    weakly, so repeated lookups return the same object while it is in use.
+    Ingredient names must be strings.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(_SCHEMA)
+        self._ingredient_ids: Dict[str, int] = {}
+        self._loaded: "weakref.WeakValueDictionary[int, Recipe]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RecipeCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def __contains__(self, recipe_id: object) -> bool:
+        row = self._connection.execute(
+            "SELECT 1 FROM recipes WHERE id = ?", (recipe_id,)
+        ).fetchone()
+        return row is not None
+
+    def add(self, recipe: Recipe) -> int:
+        """Stores a recipe and returns its catalog id."""
+        return self.add_many([recipe])[0]
+
+    def add_many(self, recipes: Iterable[Recipe]) -> List[int]:
+        """Stores recipes in a single transaction and returns their ids.
+
+        Either all recipes are stored or, if any of them is invalid, none.
+        """
+        ids: List[int] = []
+        known = dict(self._ingredient_ids)
+        try:
+            with self._connection:
+                cursor = self._connection.cursor()
+                for recipe in recipes:
+                    if not isinstance(recipe, Recipe):
+                        raise TypeError("recipe must be an instance of Recipe")
+                    cursor.execute(
+                        "INSERT INTO recipes (name, kcal, protein, fat, carbs) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (
+                            recipe.name,
+                            recipe.kcal,
+                            recipe.protein,
+                            recipe.fat,
+                            recipe.carbs,
+                        ),
+                    )
+                    recipe_id = cursor.lastrowid
+                    cursor.executemany(
+                        "INSERT INTO recipe_ingredients "
+                        "(recipe_id, ingredient_id, position, quantity) "
+                        "VALUES (?, ?, ?, ?)",
+                        [
+                            (
+                                recipe_id,
+                                self._ingredient_id(cursor, name),
+                                position,
+                                quantity,
+                            )
+                            for position, (name, quantity) in enumerate(
+                                recipe.ingredients.items()
+                            )
+                        ],
+                    )
+                    ids.append(recipe_id)
+        except BaseException:
+            # Ingredient ids created inside the rolled back transaction are gone.
+            self._ingredient_ids = known
+            raise
+        return ids
+
+    def get(self, recipe_id: int) -> Recipe:
+        """Returns the recipe with the given id, loading it on first access."""
+        recipe = self._loaded.get(recipe_id)
+        if recipe is not None:
+            return recipe
+
+        row = self._connection.execute(
+            "SELECT name, kcal, protein, fat, carbs FROM recipes WHERE id = ?",
+            (recipe_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(recipe_id)
+        ingredients = self._connection.execute(
+            "SELECT i.name, ri.quantity FROM recipe_ingredients AS ri "
+            "JOIN ingredients AS i ON i.id = ri.ingredient_id "
+            "WHERE ri.recipe_id = ? ORDER BY ri.position",
+            (recipe_id,),
+        ).fetchall()
+        recipe = Recipe(row[0], dict(ingredients), *row[1:])
+        self._loaded[recipe_id] = recipe
+        return recipe
+
+    __getitem__ = get
+
+    def remove(self, recipe_id: int) -> None:
+        """Deletes a recipe from the catalog."""
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM recipes WHERE id = ?", (recipe_id,)
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(recipe_id)
+        self._loaded.pop(recipe_id, None)
+
+    def ids(self) -> Iterator[int]:
+        """Yields all recipe ids in ascending order."""
+        for (recipe_id,) in self._connection.execute(
+            "SELECT id FROM recipes ORDER BY id"
+        ):
+            yield recipe_id
+
+    def __iter__(self) -> Iterator[Recipe]:
+        """Lazily yields all recipes in id order."""
+        for recipe_id in list(self.ids()):
+            yield self.get(recipe_id)
+
+    def find_by_name(self, name: str) -> List[int]:
+        """Returns ids of recipes with exactly the given name."""
+        return self._column(
+            "SELECT id FROM recipes WHERE name = ? ORDER BY id", (name,)
+        )
+
+    def find_by_ingredient(self, name: str) -> List[int]:
+        """Returns ids of recipes using the given ingredient."""
+        return self._column(
+            "SELECT ri.recipe_id FROM ingredients AS i "
+            "JOIN recipe_ingredients AS ri ON ri.ingredient_id = i.id "
+            "WHERE i.name = ? ORDER BY ri.recipe_id",
+            (name,),
+        )
+
+    def _column(self, query: str, parameters: Tuple) -> List[int]:
+        return [row[0] for row in self._connection.execute(query, parameters)]
+
+    def _ingredient_id(self, cursor: sqlite3.Cursor, name: str) -> int:
+        ingredient_id = self._ingredient_ids.get(name)
+        if ingredient_id is not None:
+            return ingredient_id
+        if not isinstance(name, str):
+            raise TypeError("Ingredient names must be strings")
+        cursor.execute("INSERT OR IGNORE INTO ingredients (name) VALUES (?)", (name,))
+        ingredient_id = cursor.execute(
+            "SELECT id FROM ingredients WHERE name = ?", (name,)
+        ).fetchone()[0]
+        self._ingredient_ids[name] = ingredient_id
+        return ingredient_id
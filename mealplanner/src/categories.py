@@ -0,0 +1,164 @@
+import re
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+UNCATEGORIZED = "uncategorized"
+
+DEFAULT_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "produce": (
+        "apple", "avocado", "banana", "basil", "bean sprout", "bell pepper",
+        "berry", "broccoli", "cabbage", "carrot", "cauliflower", "celery",
+        "cucumber", "eggplant", "garlic", "ginger", "grape", "herb", "kale",
+        "leek", "lemon", "lettuce", "lime", "mango", "mushroom", "onion",
+        "orange", "parsley", "pea", "peach", "pear", "pepper", "potato",
+        "spinach", "squash", "tomato", "zucchini", "fruit", "vegetable",
+    ),
+    "dairy": (
+        "butter", "cheese", "cream", "egg", "milk", "mozzarella", "parmesan",
+        "yogurt", "yoghurt", "sour cream", "cream cheese",
+    ),
+    "meat": (
+        "bacon", "beef", "chicken", "ham", "lamb", "mince", "pork", "sausage",
+        "steak", "turkey", "veal",
+    ),
+    "seafood": (
+        "cod", "crab", "fish", "lobster", "mussel", "prawn", "salmon",
+        "shrimp", "tuna",
+    ),
+    "bakery": ("bagel", "baguette", "bread", "bun", "roll", "tortilla", "wrap"),
+    "pantry": (
+        "bean", "chickpea", "coconut milk", "flour", "honey", "lentil",
+        "noodle", "nut", "oat", "oil", "olive oil", "pasta", "peanut butter",
+        "rice", "sauce", "spaghetti", "stock", "sugar", "vinegar", "water",
+    ),
+    "spices": (
+        "black pepper", "chili", "cinnamon", "cumin", "curry", "nutmeg",
+        "oregano", "paprika", "salt", "thyme", "vanilla",
+    ),
+    "beverages": ("beer", "coffee", "juice", "soda", "tea", "wine"),
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_MIN_SUFFIX = 4
+
+
+def _singular(token: str) -> str:
+    # Crude, but applied to keywords and names alike, so only consistency
+    # matters: "tomatoes" and "tomato" both become "tomato".
+    if len(token) <= 3:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us")):
+        return token[:-1]
+    return token
+
+
+def _tokens(name: str) -> Tuple[str, ...]:
+    return tuple(_singular(token) for token in _TOKEN.findall(name.lower()))
+
+
+class Categorizer:
+    """Assigns shopping list categories to ingredient names.
+
+    Keywords are compiled into an exact-match table of normalized names
+    and a trie over reversed tokens. A name that is not a keyword itself
+    is matched by its longest keyword suffix, trying the last word first,
+    so "cherry tomatoes" is produce and "extra virgin olive oil" matches
+    "olive oil"; failing that, by a keyword ending one of its words, as in
+    "strawberries". Results are memoized per name.
+    """
+
+    def __init__(
+        self,
+        categories: Optional[Mapping[str, Iterable[str]]] = None,
+        cache_size: int = 100_000,
+    ) -> None:
+        if cache_size <= 0:
+            raise ValueError("cache_size must be positive")
+        self.cache_size = cache_size
+        self._exact: Dict[Tuple[str, ...], str] = {}
+        # Nodes are [category or None, {token: child}], keyed by tokens
+        # from the end of a keyword.
+        self._trie: List = [None, {}]
+        self._cache: Dict[Hashable, str] = {}
+        if categories is None:
+            categories = DEFAULT_CATEGORIES
+        for category, keywords in categories.items():
+            self.add(category, *keywords)
+
+    def add(self, category: str, *keywords: str) -> None:
+        """Registers keywords for a category; later keywords take precedence."""
+        for keyword in keywords:
+            tokens = _tokens(keyword)
+            if not tokens:
+                raise ValueError(f"Invalid keyword: {keyword!r}")
+            self._exact[tokens] = category
+            node = self._trie
+            for token in reversed(tokens):
+                node = node[1].setdefault(token, [None, {}])
+            node[0] = category
+        self._cache.clear()
+
+    def classify(self, name: Hashable) -> str:
+        """Returns the category of an ingredient name."""
+        category = self._cache.get(name)
+        if category is None:
+            category = self._lookup(name)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[name] = category
+        return category
+
+    def classify_many(self, names: Iterable[Hashable]) -> List[str]:
+        """Returns the categories of many names, in order."""
+        cache = self._cache
+        result = []
+        for name in names:
+            category = cache.get(name)
+            if category is None:
+                category = self.classify(name)
+            result.append(category)
+        return result
+
+    def group(
+        self, items: Mapping[Hashable, float]
+    ) -> Dict[str, Dict[Hashable, float]]:
+        """Groups ``{ingredient: quantity}`` items by category."""
+        grouped: Dict[str, Dict[Hashable, float]] = {}
+        for (name, quantity), category in zip(
+            items.items(), self.classify_many(items)
+        ):
+            grouped.setdefault(category, {})[name] = quantity
+        return grouped
+
+    def _lookup(self, name: Hashable) -> str:
+        if not isinstance(name, str):
+            return UNCATEGORIZED
+        tokens = _tokens(name)
+        category = self._exact.get(tokens)
+        if category is not None:
+            return category
+        for end in range(len(tokens), 0, -1):
+            node = self._trie
+            match = None
+            for token in reversed(tokens[:end]):
+                node = node[1].get(token)
+                if node is None:
+                    break
+                if node[0] is not None:
+                    match = node[0]
+            if match is not None:
+                return match
+        # Compound words such as "strawberries" end in a keyword.
+        words = self._trie[1]
+        for token in reversed(tokens):
+            for start in range(1, len(token) - _MIN_SUFFIX + 1):
+                node = words.get(token[start:])
+                if node is not None and node[0] is not None:
+                    return node[0]
+        return UNCATEGORIZED
+
+
+default_categorizer = Categorizer()
@@ -0,0 +1,374 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from heapq import heappush, heapreplace, merge
+from math import inf
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.ingredients import IngredientMap, ingredient_registry
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS
+
+# The k-d tree is rebuilt once more recipes than this (or than an eighth of
+# the index) changed since it was built; until then they are scanned.
+_REBUILD_AFTER = 64
+
+
+def _intersect(postings: List[List[int]]) -> List[int]:
+    """Intersects sorted posting lists, smallest first.
+
+    Each id of the running result is looked up with ``bisect_left`` in the
+    next list, starting from the previous match.
+    """
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        matched = []
+        low = 0
+        for recipe_id in result:
+            low = bisect_left(other, recipe_id, low)
+            if low == len(other):
+                break
+            if other[low] == recipe_id:
+                matched.append(recipe_id)
+        result = matched
+    return list(result)
+
+
+def _union(postings: Iterable[List[int]]) -> List[int]:
+    """Merges sorted posting lists into one sorted list without duplicates."""
+    result: List[int] = []
+    for recipe_id in merge(*postings):
+        if not result or result[-1] != recipe_id:
+            result.append(recipe_id)
+    return result
+
+
+def _difference(ids: List[int], excluded: List[int]) -> List[int]:
+    """Removes the sorted ``excluded`` ids from the sorted ``ids``."""
+    result = []
+    low = 0
+    for recipe_id in ids:
+        low = bisect_left(excluded, recipe_id, low)
+        if low == len(excluded) or excluded[low] != recipe_id:
+            result.append(recipe_id)
+    return result
+
+
+class _RecipeIndex(ABC):
+    """Bookkeeping shared by indexes over a changing set of recipes.
+
+    Subclasses index a recipe in ``_insert`` and drop it in ``_delete``;
+    recipe modifications reach them through ``_on_change``.
+    """
+
+    def __init__(self) -> None:
+        self._recipes: Dict[int, Recipe] = {}
+        self._ids: Dict[int, int] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    def __contains__(self, recipe_id: object) -> bool:
+        return recipe_id in self._recipes
+
+    def add(self, recipe: Recipe, recipe_id: Optional[int] = None) -> int:
+        """Indexes a recipe and returns its id.
+
+        An explicit ``recipe_id`` lets the index share ids with a catalog.
+        """
+        if not isinstance(recipe, Recipe):
+            raise TypeError("recipe must be an instance of Recipe")
+        if id(recipe) in self._ids:
+            raise ValueError("Recipe is already indexed")
+        if recipe_id is None:
+            recipe_id = self._next_id
+        elif recipe_id in self._recipes:
+            raise ValueError(f"Recipe id {recipe_id} is already in use")
+        self._next_id = max(self._next_id, recipe_id + 1)
+
+        self._recipes[recipe_id] = recipe
+        self._ids[id(recipe)] = recipe_id
+        self._insert(recipe_id, recipe)
+        recipe.subscribe(self._on_change)
+        return recipe_id
+
+    def remove(self, recipe_id: int) -> None:
+        """Removes a recipe from the index."""
+        recipe = self.get(recipe_id)
+        recipe.unsubscribe(self._on_change)
+        self._delete(recipe_id, recipe)
+        del self._recipes[recipe_id]
+        del self._ids[id(recipe)]
+
+    def get(self, recipe_id: int) -> Recipe:
+        """Returns the recipe indexed under the given id."""
+        try:
+            return self._recipes[recipe_id]
+        except KeyError:
+            raise ValueError(f"Invalid recipe id: {recipe_id}")
+
+    @abstractmethod
+    def _insert(self, recipe_id: int, recipe: Recipe) -> None:
+        """Adds a recipe to the index structures."""
+
+    @abstractmethod
+    def _delete(self, recipe_id: int, recipe: Recipe) -> None:
+        """Drops a recipe from the index structures."""
+
+    @abstractmethod
+    def _on_change(self, recipe: Recipe, change: str, detail: object) -> None:
+        """Follows an in-place modification of an indexed recipe."""
+
+
+class IngredientIndex(_RecipeIndex):
+    """Inverted index from ingredients to sorted lists of recipe ids.
+
+    Indexed recipes are watched through ``Recipe.subscribe``, so postings
+    follow ``add_ingredient`` and ``remove_ingredient`` calls. Changes made
+    directly on ``recipe.ingredients`` are not tracked.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._postings: Dict[int, List[int]] = {}
+
+    def _insert(self, recipe_id: int, recipe: Recipe) -> None:
+        for ingredient_id in self._ingredient_ids(recipe):
+            self._add_posting(ingredient_id, recipe_id)
+
+    def _delete(self, recipe_id: int, recipe: Recipe) -> None:
+        for ingredient_id in self._ingredient_ids(recipe):
+            self._remove_posting(ingredient_id, recipe_id)
+
+    def postings(self, ingredient: Hashable) -> List[int]:
+        """Returns the sorted ids of recipes containing an ingredient."""
+        return list(self._posting(ingredient))
+
+    def all_of(self, *ingredients: Hashable) -> List[int]:
+        """Returns ids of recipes containing every given ingredient."""
+        return self.query(all_of=ingredients)
+
+    def any_of(self, *ingredients: Hashable) -> List[int]:
+        """Returns ids of recipes containing at least one given ingredient."""
+        return self.query(any_of=ingredients)
+
+    def query(
+        self,
+        all_of: Iterable[Hashable] = (),
+        any_of: Iterable[Hashable] = (),
+        none_of: Iterable[Hashable] = (),
+    ) -> List[int]:
+        """Combines AND, OR and NOT conditions into one sorted id list.
+
+        Recipes must contain all of ``all_of``, at least one of ``any_of``
+        (when given) and none of ``none_of``. A query with only ``none_of``
+        ranges over every indexed recipe.
+        """
+        required = [self._posting(ingredient) for ingredient in all_of]
+        alternatives = [self._posting(ingredient) for ingredient in any_of]
+        if alternatives:
+            required.append(_union(alternatives))
+        if required:
+            result = _intersect(required)
+        else:
+            result = sorted(self._recipes)
+
+        excluded = [self._posting(ingredient) for ingredient in none_of]
+        if excluded and result:
+            result = _difference(result, _union(excluded))
+        return result
+
+    def _posting(self, ingredient: Hashable) -> List[int]:
+        ingredient_id = ingredient_registry.lookup(ingredient)
+        if ingredient_id is None:
+            return []
+        return self._postings.get(ingredient_id, [])
+
+    def _add_posting(self, ingredient_id: int, recipe_id: int) -> None:
+        posting = self._postings.setdefault(ingredient_id, [])
+        if not posting or posting[-1] < recipe_id:
+            posting.append(recipe_id)
+        else:
+            insort(posting, recipe_id)
+
+    def _remove_posting(self, ingredient_id: int, recipe_id: int) -> None:
+        posting = self._postings[ingredient_id]
+        del posting[bisect_left(posting, recipe_id)]
+        if not posting:
+            del self._postings[ingredient_id]
+
+    @staticmethod
+    def _ingredient_ids(recipe: Recipe) -> List[int]:
+        if isinstance(recipe.ingredients, IngredientMap):
+            return list(recipe.ingredients.ids)
+        return [ingredient_registry.intern(name) for name in recipe.ingredients]
+
+    def _on_change(self, recipe: Recipe, change: str, detail: object) -> None:
+        if change != "ingredient":
+            return
+        name, old_quantity, new_quantity = detail
+        if (old_quantity is None) == (new_quantity is None):
+            return
+        recipe_id = self._ids[id(recipe)]
+        ingredient_id = ingredient_registry.intern(name)
+        if old_quantity is None:
+            self._add_posting(ingredient_id, recipe_id)
+        else:
+            self._remove_posting(ingredient_id, recipe_id)
+
+
+class NutrientIndex(_RecipeIndex):
+    """Range and nearest-target index over recipe nutrients.
+
+    Every nutrient has a column of ``(value, recipe id)`` pairs kept sorted,
+    so a range condition is two binary searches. Nearest-target queries use
+    a k-d tree over all nutrients. Recipes added, removed or changed since
+    the tree was built are skipped in it and scanned instead, and the tree
+    is rebuilt only once enough of them piled up. Values follow the
+    ``update_*`` setters and ``scale_recipe`` of indexed recipes.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._values: Dict[int, Tuple[float, ...]] = {}
+        self._columns: List[List[Tuple[float, int]]] = [[] for _ in NUTRIENTS]
+        self._tree: Optional[tuple] = None
+        self._dirty: Set[int] = set()
+
+    def _insert(self, recipe_id: int, recipe: Recipe) -> None:
+        values = (recipe.kcal, recipe.protein, recipe.fat, recipe.carbs)
+        self._values[recipe_id] = values
+        for column, value in zip(self._columns, values):
+            insort(column, (value, recipe_id))
+        self._dirty.add(recipe_id)
+
+    def _delete(self, recipe_id: int, recipe: Recipe) -> None:
+        values = self._values.pop(recipe_id)
+        for column, value in zip(self._columns, values):
+            del column[bisect_left(column, (value, recipe_id))]
+        self._dirty.add(recipe_id)
+
+    def _on_change(self, recipe: Recipe, change: str, detail: object) -> None:
+        if change in ("nutrients", "scale"):
+            recipe_id = self._ids[id(recipe)]
+            self._delete(recipe_id, recipe)
+            self._insert(recipe_id, recipe)
+
+    def range(self, **bounds: Tuple[Optional[float], Optional[float]]) -> List[int]:
+        """Returns sorted ids of recipes within inclusive nutrient bounds.
+
+        Bounds are ``(low, high)`` pairs where ``None`` leaves a side open,
+        e.g. ``range(kcal=(400, 600), protein=(30, None))``. Candidates come
+        from the most selective nutrient and are checked against the rest.
+        """
+        conditions = []
+        for nutrient, (low, high) in bounds.items():
+            axis = self._axis(nutrient)
+            low = -inf if low is None else low
+            high = inf if high is None else high
+            column = self._columns[axis]
+            start = bisect_left(column, (low, -inf))
+            end = bisect_right(column, (high, inf))
+            conditions.append((end - start, axis, low, high, start, end))
+        if not conditions:
+            return sorted(self._recipes)
+
+        conditions.sort()
+        _, axis, _, _, start, end = conditions[0]
+        others = [(axis, low, high) for _, axis, low, high, _, _ in conditions[1:]]
+        result = []
+        for _, recipe_id in self._columns[axis][start:end]:
+            values = self._values[recipe_id]
+            if all(low <= values[axis] <= high for axis, low, high in others):
+                result.append(recipe_id)
+        result.sort()
+        return result
+
+    def nearest(
+        self,
+        k: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+        **target: float,
+    ) -> List[int]:
+        """Returns ids of the ``k`` recipes closest to a nutrient target.
+
+        Distance is the weighted squared difference over the nutrients
+        given in ``target``; ties are broken by recipe id.
+        """
+        if k <= 0:
+            raise ValueError("k must be positive")
+        if not target:
+            raise ValueError("At least one nutrient target is required")
+        point = [0.0] * len(NUTRIENTS)
+        scale = [0.0] * len(NUTRIENTS)
+        for nutrient, value in target.items():
+            axis = self._axis(nutrient)
+            point[axis] = value
+            scale[axis] = 1.0 if weights is None else weights.get(nutrient, 1.0)
+        if self._tree is None or len(self._dirty) > max(
+            _REBUILD_AFTER, len(self._values) // 8
+        ):
+            self._tree = self._build(list(self._values), 0)
+            self._dirty.clear()
+
+        best: List[Tuple[float, int]] = []
+        dirty = self._dirty
+
+        def consider(recipe_id: int, candidate: Tuple[float, ...]) -> None:
+            distance = sum(
+                weight * (value - wanted) ** 2
+                for weight, value, wanted in zip(scale, candidate, point)
+            )
+            entry = (-distance, -recipe_id)
+            if len(best) < k:
+                heappush(best, entry)
+            elif entry > best[0]:
+                heapreplace(best, entry)
+
+        for recipe_id in dirty:
+            candidate = self._values.get(recipe_id)
+            if candidate is not None:
+                consider(recipe_id, candidate)
+
+        def visit(node: Optional[tuple]) -> None:
+            if node is None:
+                return
+            # Nodes hold the values the tree was built from.
+            recipe_id, candidate, axis, left, right = node
+            if recipe_id not in dirty:
+                consider(recipe_id, candidate)
+
+            offset = point[axis] - candidate[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            visit(near)
+            if len(best) < k or scale[axis] * offset * offset <= -best[0][0]:
+                visit(far)
+
+        visit(self._tree)
+        return [-recipe_id for _, recipe_id in sorted(best, reverse=True)]
+
+    def _build(self, recipe_ids: List[int], depth: int) -> Optional[tuple]:
+        if not recipe_ids:
+            return None
+        axis = depth % len(NUTRIENTS)
+        recipe_ids.sort(key=lambda recipe_id: self._values[recipe_id][axis])
+        middle = len(recipe_ids) // 2
+        return (
+            recipe_ids[middle],
+            self._values[recipe_ids[middle]],
+            axis,
+            self._build(recipe_ids[:middle], depth + 1),
+            self._build(recipe_ids[middle + 1 :], depth + 1),
+        )
+
+    @staticmethod
+    def _axis(nutrient: str) -> int:
+        try:
+            return NUTRIENTS.index(nutrient)
+        except ValueError:
+            raise ValueError(f"Unknown nutrient: {nutrient}")
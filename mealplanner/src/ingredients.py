@@ -0,0 +1,246 @@
+import threading
+from array import array
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+class IngredientRegistry:
+    """Interns ingredient names to dense integer ids.
+
+    Ids are assigned in first-seen order starting from zero and are never
+    reused, so they can index plain arrays of per-ingredient values.
+    Interning is safe from several threads; looking up a known name takes
+    no lock.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[Hashable, int] = {}
+        self._names: List[Hashable] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def intern(self, name: Hashable) -> int:
+        """Returns the id of an ingredient, registering it if it is new."""
+        ingredient_id = self._ids.get(name)
+        if ingredient_id is None:
+            with self._lock:
+                ingredient_id = self._ids.get(name)
+                if ingredient_id is None:
+                    # The name is stored before its id is published, so
+                    # every id a reader can see resolves to a name.
+                    self._names.append(name)
+                    ingredient_id = self._ids[name] = len(self._names) - 1
+        return ingredient_id
+
+    def lookup(self, name: Hashable) -> Optional[int]:
+        """Returns the id of an ingredient, or None if it was never interned."""
+        return self._ids.get(name)
+
+    def name(self, ingredient_id: int) -> Hashable:
+        """Returns the ingredient name registered under the given id."""
+        if not 0 <= ingredient_id < len(self._names):
+            raise ValueError(f"Invalid ingredient id: {ingredient_id}")
+        return self._names[ingredient_id]
+
+    def names(self) -> List[Hashable]:
+        """Returns all ingredient names, indexed by ingredient id."""
+        return self._names
+
+
+ingredient_registry = IngredientRegistry()
+
+
+class _IngredientItems(ItemsView):
+    def __iter__(self) -> Iterator:
+        names = ingredient_registry.names()
+        mapping = self._mapping
+        for ingredient_id, quantity in zip(mapping.ids, mapping.quantities):
+            yield names[ingredient_id], quantity
+
+
+class _IngredientValues(ValuesView):
+    def __iter__(self) -> Iterator:
+        return iter(self._mapping.quantities)
+
+
+class IngredientMap(MutableMapping):
+    """Dict-style view over parallel ingredient id and quantity arrays.
+
+    Names are interned in ``ingredient_registry``; the map itself only keeps
+    a compact array of ingredient ids next to a list of quantities. Lookups
+    go through an id-to-position dict built on first use.
+    """
+
+    __slots__ = ("_ids", "quantities", "_index")
+
+    def __init__(self, ingredients: Optional[Mapping] = None) -> None:
+        self.ids = array("i")
+        self.quantities: List[float] = []
+        if ingredients:
+            intern = ingredient_registry.intern
+            for name, quantity in ingredients.items():
+                self._ids.append(intern(name))
+                self.quantities.append(quantity)
+
+    @property
+    def ids(self) -> array:
+        return self._ids
+
+    @ids.setter
+    def ids(self, ids: array) -> None:
+        self._ids = ids
+        self._index: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_arrays(
+        cls, ids: Iterable[int], quantities: Iterable[float]
+    ) -> "IngredientMap":
+        """Builds a map directly from interned ingredient ids and quantities."""
+        mapping = cls()
+        mapping.ids = array("i", ids)
+        mapping.quantities = list(quantities)
+        if len(mapping.ids) != len(mapping.quantities):
+            raise ValueError("Ingredient ids and quantities must have equal length")
+        ids = mapping.ids
+        if ids and (min(ids) < 0 or max(ids) >= len(ingredient_registry)):
+            raise ValueError("Ingredient ids must be interned in the registry")
+        if len(mapping._positions()) != len(mapping.ids):
+            raise ValueError("Ingredient ids must be unique")
+        return mapping
+
+    @classmethod
+    def _from_validated(cls, ids: array, quantities: List[float]) -> "IngredientMap":
+        """Wraps arrays already checked like ``from_arrays`` without copying."""
+        mapping = cls.__new__(cls)
+        mapping.ids = ids
+        mapping.quantities = quantities
+        return mapping
+
+    def _positions(self) -> Dict[int, int]:
+        index = self._index
+        if index is None:
+            index = self._index = {
+                ingredient_id: position
+                for position, ingredient_id in enumerate(self._ids)
+            }
+        return index
+
+    def _position(self, name: Hashable) -> int:
+        position = self._positions().get(ingredient_registry.lookup(name))
+        if position is None:
+            raise KeyError(name)
+        return position
+
+    def __getitem__(self, name: Hashable) -> float:
+        return self.quantities[self._position(name)]
+
+    def __setitem__(self, name: Hashable, quantity: float) -> None:
+        ingredient_id = ingredient_registry.intern(name)
+        index = self._positions()
+        position = index.get(ingredient_id)
+        if position is None:
+            index[ingredient_id] = len(self._ids)
+            self._ids.append(ingredient_id)
+            self.quantities.append(quantity)
+        else:
+            self.quantities[position] = quantity
+
+    def __delitem__(self, name: Hashable) -> None:
+        position = self._position(name)
+        del self._ids[position]
+        del self.quantities[position]
+        # Later positions shift; deleting is linear anyway.
+        self._index = None
+
+    def __contains__(self, name: object) -> bool:
+        return ingredient_registry.lookup(name) in self._positions()
+
+    def __iter__(self) -> Iterator:
+        names = ingredient_registry.names()
+        return (names[ingredient_id] for ingredient_id in self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def items(self) -> ItemsView:
+        return _IngredientItems(self)
+
+    def values(self) -> ValuesView:
+        return _IngredientValues(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IngredientMap):
+            return len(self.ids) == len(other.ids) and dict(
+                zip(self.ids, self.quantities)
+            ) == dict(zip(other.ids, other.quantities))
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        # Ids are only meaningful within one process, so pickle by name.
+        return (IngredientMap, (dict(self.items()),))
+
+    def copy(self) -> "IngredientMap":
+        return IngredientMap.from_arrays(self.ids, self.quantities)
+
+    def scale(self, factor: float) -> None:
+        """Multiplies every quantity by ``factor`` in place."""
+        self.quantities = [quantity * factor for quantity in self.quantities]
+
+
+class _ScaledItems(ItemsView):
+    def __iter__(self) -> Iterator:
+        factor = self._mapping.factor
+        for name, quantity in self._mapping.base.items():
+            yield name, quantity * factor
+
+
+class _ScaledValues(ValuesView):
+    def __iter__(self) -> Iterator:
+        factor = self._mapping.factor
+        return (quantity * factor for quantity in self._mapping.base.values())
+
+
+class ScaledIngredients(Mapping):
+    """Read-only view of an ingredient mapping with scaled quantities.
+
+    Quantities are multiplied by ``factor`` when read; nothing is copied.
+    """
+
+    __slots__ = ("base", "factor")
+
+    def __init__(self, base: Mapping, factor: float) -> None:
+        self.base = base
+        self.factor = factor
+
+    def __getitem__(self, name: Hashable) -> float:
+        return self.base[name] * self.factor
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.base
+
+    def __iter__(self) -> Iterator:
+        return iter(self.base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def items(self) -> ItemsView:
+        return _ScaledItems(self)
+
+    def values(self) -> ValuesView:
+        return _ScaledValues(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
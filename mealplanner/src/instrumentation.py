@@ -0,0 +1,201 @@
+import functools
+import math
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src import aggregation, shoppinglist
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+
+# Instrumented operations as (owner, attribute) pairs.
+_TARGETS: List[Tuple[object, str]] = [
+    (Recipe, "__init__"),
+    (MealPlan, "daily_summary"),
+    (MealPlan, "weekly_summary"),
+    (ShoppingList, "add_from_mealplan"),
+    (ShoppingList, "merge"),
+    (ShoppingList, "merge_in_place"),
+    (shoppinglist, "stream_shopping_list"),
+    (shoppinglist, "generate_shopping_list"),
+    (aggregation, "aggregate_shopping_list"),
+]
+
+
+# Enabled instances, replaced rather than mutated so wrappers can iterate
+# it without a lock; the originals are installed back once it is empty.
+_active: Tuple["Instrumentation", ...] = ()
+_originals: Dict[Tuple[object, str], Callable] = {}
+
+
+def _label(owner: object, name: str) -> str:
+    if isinstance(owner, type):
+        return f"{owner.__name__}.{name}"
+    return f"{owner.__name__.rsplit('.', 1)[-1]}.{name}"
+
+
+def _subclasses(cls: type) -> Iterator[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def _targets() -> Iterator[Tuple[object, str]]:
+    """``_TARGETS`` plus the overrides in currently defined subclasses."""
+    for owner, name in _TARGETS:
+        yield owner, name
+        if isinstance(owner, type):
+            for subclass in _subclasses(owner):
+                if name in vars(subclass):
+                    yield subclass, name
+
+
+def _install() -> None:
+    for owner, name in _targets():
+        if (owner, name) not in _originals:
+            original = getattr(owner, name)
+            _originals[owner, name] = original
+            setattr(owner, name, _wrap(original, _label(owner, name)))
+
+
+def _uninstall() -> None:
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def _wrap(function: Callable, label: str) -> Callable:
+    clock = time.perf_counter
+    blocks = sys.getallocatedblocks
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start_blocks = blocks()
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            net_blocks = blocks() - start_blocks
+            for active in _active:
+                active._record(label, elapsed, net_blocks)
+
+    return wrapper
+
+
+class OperationStats:
+    """Call count, latencies and allocations recorded for one operation."""
+
+    __slots__ = ("count", "total", "latencies", "blocks")
+
+    def __init__(self, samples: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+        self.blocks = 0
+
+    def percentile(self, percent: float) -> float:
+        """Returns a latency percentile over the most recent calls."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": max(self.latencies, default=0.0),
+            "net_blocks": self.blocks,
+        }
+
+
+class Instrumentation:
+    """Opt-in timing of the main meal planning operations.
+
+    While any instance is enabled, the operations in ``_TARGETS`` and
+    their overrides in subclasses defined at that time are replaced by
+    wrappers that record call counts, wall-clock latencies and the net
+    number of memory blocks allocated (from ``sys.getallocatedblocks``, so
+    other threads are counted too) into every enabled instance. When the
+    last instance is disabled the original functions are restored, so
+    there is no overhead at all when instrumentation is off. Module
+    functions are only instrumented when called through their module.
+
+    Use ``enable``/``disable`` or the instance as a context manager;
+    recorded stats survive disabling until ``reset`` is called.
+    """
+
+    def __init__(self, samples: int = 10000) -> None:
+        if samples <= 0:
+            raise ValueError("samples must be positive")
+        self.samples = samples
+        self._stats: Dict[str, OperationStats] = {}
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._depth > 0
+
+    def enable(self) -> None:
+        """Starts recording; nested calls must be matched by ``disable``."""
+        global _active
+        self._depth += 1
+        if self._depth > 1:
+            return
+        if not _active:
+            _install()
+        _active = _active + (self,)
+
+    def disable(self) -> None:
+        """Stops recording once every ``enable`` has been matched."""
+        global _active
+        if self._depth == 0:
+            raise ValueError("Instrumentation is not enabled")
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        _active = tuple(active for active in _active if active is not self)
+        if not _active:
+            _uninstall()
+
+    def __enter__(self) -> "Instrumentation":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def reset(self) -> None:
+        """Discards everything recorded so far."""
+        self._stats.clear()
+
+    def stats(self, operation: Optional[str] = None) -> Dict[str, object]:
+        """Returns recorded stats for all operations or for one of them.
+
+        Operations are named like ``"MealPlan.weekly_summary"`` or
+        ``"shoppinglist.generate_shopping_list"``.
+        """
+        if operation is not None:
+            recorded = self._stats.get(operation)
+            return recorded.as_dict() if recorded else OperationStats(1).as_dict()
+        return {label: recorded.as_dict() for label, recorded in self._stats.items()}
+
+    def _record(self, label: str, elapsed: float, net_blocks: int) -> None:
+        recorded = self._stats.get(label)
+        if recorded is None:
+            recorded = self._stats[label] = OperationStats(self.samples)
+        recorded.count += 1
+        recorded.total += elapsed
+        recorded.latencies.append(elapsed)
+        recorded.blocks += net_blocks
+
+
+instrumentation = Instrumentation()
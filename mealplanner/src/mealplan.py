@@ -1,79 +1,417 @@
-from typing import Dict, List
+import math
+import weakref
+from collections.abc import MutableSequence
+from itertools import repeat
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 from src.recipe import Recipe
 
+DAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+_NUTRIENT_KEYS = ("kcal", "protein", "fat", "carbs")
+_nutrient_values = itemgetter(*_NUTRIENT_KEYS)
+
+
+class MealHandle:
+    """Opaque, stable reference to one meal planned on a day."""
+
+    __slots__ = ()
+
+
+class MealList(MutableSequence):
+    """Meals of one day, each stored under a ``MealHandle``.
+
+    Behaves like a list of recipes, but a meal can also be removed through
+    its handle in constant time, without scanning the day or comparing
+    recipes. Appending and indexing are cheap; the first index after a
+    removal or insertion, and inserting in the middle, are linear in the
+    number of meals. ``mutations`` counts every change, so caches derived
+    from the list can tell whether it was modified.
+    """
+
+    def __init__(self, meals: Iterable[Recipe] = ()) -> None:
+        self._meals: Dict[MealHandle, Recipe] = {}
+        # Handles in order, rebuilt on demand after removals and inserts.
+        self._order: Optional[List[MealHandle]] = []
+        self.mutations = 0
+        for meal in meals:
+            self.add(meal)
+
+    def _reordered(self) -> None:
+        self._order = None
+        self.mutations += 1
+
+    def _handle_at(self, index: int) -> MealHandle:
+        if self._order is None:
+            self._order = list(self._meals)
+        return self._order[index]
+
+    def add(self, meal: Recipe) -> MealHandle:
+        """Appends a meal and returns its handle."""
+        handle = MealHandle()
+        self._meals[handle] = meal
+        if self._order is not None:
+            self._order.append(handle)
+        self.mutations += 1
+        return handle
+
+    def pop_handle(self, handle: MealHandle) -> Recipe:
+        """Removes the meal stored under a handle and returns it."""
+        meal = self._meals.pop(handle)
+        self._reordered()
+        return meal
+
+    def has_handle(self, handle: MealHandle) -> bool:
+        return handle in self._meals
+
+    def handles(self) -> List[MealHandle]:
+        """Returns the handles of all meals, in order."""
+        return list(self._meals)
+
+    def handle_of(self, meal: Recipe) -> Optional[MealHandle]:
+        """Returns the handle of the first occurrence of a meal.
+
+        The same recipe object is looked for first, so equality (which
+        compares whole ingredient maps) is only used as a fallback.
+        """
+        for handle, planned in self._meals.items():
+            if planned is meal:
+                return handle
+        for handle, planned in self._meals.items():
+            if planned == meal:
+                return handle
+        return None
+
+    def __len__(self) -> int:
+        return len(self._meals)
+
+    def __iter__(self) -> Iterator[Recipe]:
+        return iter(self._meals.values())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._meals.values())[index]
+        return self._meals[self._handle_at(index)]
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            meals = list(self)
+            meals[index] = value
+            self._meals = {}
+            self._reordered()
+            self.extend(meals)
+        else:
+            # The replaced meal keeps its handle and position, but the
+            # change is counted so cached totals are rebuilt.
+            self._meals[self._handle_at(index)] = value
+            self.mutations += 1
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            handles = list(self._meals)[index]
+        else:
+            handles = [self._handle_at(index)]
+        for handle in handles:
+            del self._meals[handle]
+        self._reordered()
+
+    def insert(self, index: int, value: Recipe) -> None:
+        if index >= len(self._meals):
+            self.add(value)
+            return
+        entries = list(self._meals.items())
+        entries.insert(index, (MealHandle(), value))
+        self._meals = dict(entries)
+        self._reordered()
+
+    def append(self, value: Recipe) -> None:
+        self.add(value)
+
+    def clear(self) -> None:
+        self._meals.clear()
+        self._reordered()
+
+    def remove(self, value: Recipe) -> None:
+        handle = self.handle_of(value)
+        if handle is None:
+            raise ValueError("MealList.remove(x): x not in list")
+        del self._meals[handle]
+        self._reordered()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MealList):
+            other = list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MealList({list(self)!r})"
+
+
+class _StaleMarker:
+    """Recipe listener marking day totals stale without keeping them alive."""
+
+    __slots__ = ("_totals",)
+
+    def __init__(self, totals: "_DayTotals") -> None:
+        self._totals = weakref.ref(totals)
+
+    def __call__(self, recipe: Recipe, change: str, detail: object) -> None:
+        totals = self._totals()
+        if totals is None:
+            recipe.unsubscribe(self)
+        elif change != "ingredient":
+            totals.stale = True
+
+
+class _RecipeWatcher:
+    """Recipe listener reporting nutrient changes to an owner it keeps weakly.
+
+    The owner's ``_recipe_changed(recipe)`` is called for every change
+    except ingredient edits.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: object) -> None:
+        self._owner = weakref.ref(owner)
+
+    def __call__(self, recipe: Recipe, change: str, detail: object) -> None:
+        owner = self._owner()
+        if owner is None:
+            recipe.unsubscribe(self)
+        elif change != "ingredient":
+            owner._recipe_changed(recipe)
+
+
+class _DayTotals:
+    """Nutrient totals for one day of a meal plan, kept up to date cheaply.
+
+    Edits only adjust how many meals use each recipe; the totals are then
+    summed once, on the next read, with ``math.fsum`` over those recipes,
+    so they are exact and never depend on the order of past edits. They
+    are valid only for the exact ``MealList`` they were built from, while
+    its ``mutations`` count is unchanged apart from the edits applied
+    through ``add`` and ``subtract``, and none of its recipes has changed
+    its nutrients since. Recipes report such changes through a
+    listener, so checking validity is O(1) and edits of recipes planned
+    elsewhere do not matter. Totals of a plain list can never be checked,
+    so they are always rebuilt.
+    """
+
+    __slots__ = (
+        "meals",
+        "mutations",
+        "stale",
+        "_totals",
+        "_watched",
+        "_marker",
+        "__weakref__",
+    )
+
+    def __init__(self, meals: Sequence[Recipe]) -> None:
+        self.meals = meals
+        self.stale = False
+        self._totals: Optional[Dict[str, float]] = None
+        # id(recipe) -> [recipe, number of meals using it]
+        self._watched: Dict[int, List] = {}
+        self._marker = _StaleMarker(self)
+        for recipe in meals:
+            self._add(recipe)
+        self.mutations = getattr(meals, "mutations", None)
+
+    def __del__(self) -> None:
+        for recipe, _ in self._watched.values():
+            recipe.unsubscribe(self._marker)
+
+    def is_valid(self, meals: Sequence[Recipe]) -> bool:
+        return (
+            self.meals is meals
+            and not self.stale
+            and self.mutations is not None
+            and self.mutations == meals.mutations
+        )
+
+    def _add(self, recipe: Recipe) -> None:
+        entry = self._watched.get(id(recipe))
+        if entry is None:
+            self._watched[id(recipe)] = [recipe, 1]
+            recipe.subscribe(self._marker)
+        else:
+            entry[1] += 1
+        self._totals = None
+
+    def add(self, recipe: Recipe) -> None:
+        """Accounts for a meal just appended to the list."""
+        self._add(recipe)
+        self.mutations = self.meals.mutations
+
+    def subtract(self, recipe: Recipe) -> None:
+        """Accounts for a meal just removed from the list."""
+        self.mutations = self.meals.mutations
+        entry = self._watched.get(id(recipe))
+        if entry is not None:
+            entry[1] -= 1
+        if entry is not None and entry[1] == 0:
+            del self._watched[id(recipe)]
+            recipe.unsubscribe(self._marker)
+        self._totals = None
+
+    def totals(self) -> Dict[str, float]:
+        if self._totals is None:
+            rows: List[tuple] = []
+            for recipe, count in self._watched.values():
+                row = _nutrient_values(recipe.total_nutrients())
+                if count == 1:
+                    rows.append(row)
+                else:
+                    rows.extend(repeat(row, count))
+            columns = zip(*rows) if rows else [()] * len(_NUTRIENT_KEYS)
+            self._totals = dict(zip(_NUTRIENT_KEYS, map(math.fsum, columns)))
+        return self._totals
+
 
 class MealPlan:
     def __init__(self) -> None:
-        self.plan: Dict[str, List[Recipe]] = {
-            day: []
-            for day in [
-                "Monday",
-                "Tuesday",
-                "Wednesday",
-                "Thursday",
-                "Friday",
-                "Saturday",
-                "Sunday",
-            ]
+        self.plan: Dict[str, MealList] = {day: MealList() for day in DAYS}
+        self._totals: Dict[str, _DayTotals] = {
+            day: _DayTotals(meals) for day, meals in self.plan.items()
         }
+        self._listeners: Optional[List[Callable]] = None
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Running totals and listeners are tied to live in-process objects.
+        state = self.__dict__.copy()
+        del state["_totals"]
+        state["_listeners"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self._listeners = None
+        self.__dict__.update(state)
+        self._totals = {day: _DayTotals(meals) for day, meals in self.plan.items()}
+
+    def subscribe(self, listener: Callable[["MealPlan", str, object], None]) -> None:
+        """Registers a callback notified about changes made through the plan.
+
+        Listeners are called as ``listener(plan, change, detail)`` where
+        ``change`` is ``"add"`` or ``"remove"`` with a ``(day, recipe)``
+        detail, or ``"clear"`` with a ``(day, removed_recipes)`` detail.
+        Direct edits of ``plan.plan`` are not reported.
+        """
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(listener)
 
-    def add_meal(self, day: str, meal: Recipe) -> None:
+    def unsubscribe(self, listener: Callable[["MealPlan", str, object], None]) -> None:
+        """Removes a callback registered with ``subscribe``."""
+        try:
+            self._listeners.remove(listener)
+        except (AttributeError, ValueError):
+            raise ValueError("Listener is not subscribed")
+
+    def _notify(self, change: str, detail: object) -> None:
+        if self._listeners:
+            for listener in list(self._listeners):
+                listener(self, change, detail)
+
+    def _cached_totals(self, day: str) -> Optional[_DayTotals]:
+        """Returns the running totals for a day if they are still up to date."""
+        cached = self._totals.get(day)
+        if cached is not None and cached.is_valid(self.plan[day]):
+            return cached
+        return None
+
+    def _day_totals(self, day: str) -> Dict[str, float]:
+        cached = self._cached_totals(day)
+        if cached is None:
+            cached = self._totals[day] = _DayTotals(self.plan[day])
+        return cached.totals()
+
+    def _meal_list(self, day: str) -> MealList:
+        """Returns the meals of a day, converting a plain list if needed."""
+        meals = self.plan[day]
+        if not isinstance(meals, MealList):
+            cached = self._cached_totals(day)
+            meals = self.plan[day] = MealList(meals)
+            if cached is not None:
+                cached.meals = meals
+                cached.mutations = meals.mutations
+        return meals
+
+    def add_meal(self, day: str, meal: Recipe) -> MealHandle:
+        """Adds a meal to a day and returns a handle for removing it."""
         if not isinstance(meal, Recipe):
             raise TypeError("meal must be an instance of Recipe")
 
         if day not in self.plan:
             raise ValueError("Invalid day")
 
-        self.plan[day].append(meal)
+        meals = self._meal_list(day)
+        cached = self._cached_totals(day)
+        handle = meals.add(meal)
+        if cached is not None:
+            cached.add(meal)
+        self._notify("add", (day, meal))
+        return handle
 
     def remove_meal(self, day: str, meal: Recipe) -> None:
         """Removes a meal from a specific day."""
         if day not in self.plan:
             raise ValueError("Invalid day")
 
-        try:
-            self.plan[day].remove(meal)
-        except ValueError:
+        meals = self._meal_list(day)
+        handle = meals.handle_of(meal)
+        if handle is None:
             raise ValueError("Meal not found on the specified day")
+        self._remove_handle(day, handle)
 
-    def daily_summary(self, day: str) -> Dict[str, int]:
-        if day not in self.plan:
-            raise ValueError("Invalid day")
+    def remove_meal_by_handle(self, handle: MealHandle) -> Recipe:
+        """Removes the meal a handle refers to and returns its recipe.
 
-        total: Dict[str, int] = {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+        Unlike ``remove_meal`` this does not scan the day or compare recipes.
+        """
+        for day, meals in self.plan.items():
+            if isinstance(meals, MealList) and meals.has_handle(handle):
+                return self._remove_handle(day, handle)
+        raise ValueError("Meal handle not found in the plan")
 
-        for recipe in self.plan[day]:
-            nutrients = recipe.total_nutrients()
+    def _remove_handle(self, day: str, handle: MealHandle) -> Recipe:
+        cached = self._cached_totals(day)
+        meal = self.plan[day].pop_handle(handle)
+        if cached is not None:
+            cached.subtract(meal)
+        self._notify("remove", (day, meal))
+        return meal
 
-            for key in total:
-                total[key] += nutrients.get(key, 0)
+    def daily_summary(self, day: str) -> Dict[str, int]:
+        if day not in self.plan:
+            raise ValueError("Invalid day")
 
-        return total
+        return dict(self._day_totals(day))
 
-    def get_meals(self, day: str) -> List[Recipe]:
+    def get_meals(self, day: str) -> Sequence[Recipe]:
         """Returns all meals for a given day."""
         return self.plan.get(day, [])
 
     def clear_day(self, day: str) -> None:
         """Clears all meals from a specific day."""
-        self.plan[day] = []
+        removed = list(self.plan[day])
+        self.plan[day] = MealList()
+        self._totals[day] = _DayTotals(self.plan[day])
+        self._notify("clear", (day, removed))
 
     def weekly_summary(self) -> Dict[str, Dict[str, int]]:
         """Returns a summary of nutrients for the entire week."""
-        weekly_total: Dict[str, Dict[str, int]] = {
-            "Monday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Tuesday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Wednesday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Thursday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Friday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Saturday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-            "Sunday": {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0},
-        }
-
-        for day, meals in self.plan.items():
-            for recipe in meals:
-                nutrients = recipe.total_nutrients()
-                for key in weekly_total[day]:
-                    weekly_total[day][key] += nutrients.get(key, 0)
-
-        return weekly_total
+        return {day: dict(self._day_totals(day)) for day in self.plan}
@@ -0,0 +1,250 @@
+import heapq
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS
+
+
+class PlanOptimizer:
+    """Fills a weekly ``MealPlan`` so that daily nutrients approach targets.
+
+    Each day is solved with a depth-first branch-and-bound search over the
+    recipes closest to a single-meal share of the targets, and over all
+    allowed recipes if none of those combinations fits the bounds. Partial sums
+    above an upper bound or already worse than the best plan are pruned,
+    and partial states already explored are skipped. Recipes eaten in the
+    previous ``no_repeat_days`` days are not offered again, and a recipe is
+    used at most once per day.
+    """
+
+    def __init__(
+        self,
+        recipes: Sequence[Recipe],
+        targets: Dict[str, float],
+        bounds: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        min_meals: int = 1,
+        max_meals: int = 3,
+        no_repeat_days: int = 0,
+        weights: Optional[Dict[str, float]] = None,
+        candidates: int = 40,
+    ) -> None:
+        if not recipes:
+            raise ValueError("At least one recipe is required")
+        if not 0 < min_meals <= max_meals:
+            raise ValueError("Meal counts must satisfy 0 < min_meals <= max_meals")
+        if no_repeat_days < 0:
+            raise ValueError("no_repeat_days cannot be negative")
+        if candidates <= 0:
+            raise ValueError("candidates must be positive")
+        for nutrient in list(targets) + list(bounds or {}) + list(weights or {}):
+            if nutrient not in NUTRIENTS:
+                raise ValueError(f"Unknown nutrient: {nutrient}")
+
+        self.recipes = list(recipes)
+        self.min_meals = min_meals
+        self.max_meals = max_meals
+        self.no_repeat_days = no_repeat_days
+        self.candidates = candidates
+
+        self._values = [
+            (recipe.kcal, recipe.protein, recipe.fat, recipe.carbs)
+            for recipe in self.recipes
+        ]
+        self._targets = [targets.get(nutrient) for nutrient in NUTRIENTS]
+        self._scale = [
+            0.0
+            if target is None
+            else (weights or {}).get(nutrient, 1.0) / max(target, 1.0)
+            for nutrient, target in zip(NUTRIENTS, self._targets)
+        ]
+        bounds = bounds or {}
+        self._low = [(bounds.get(n) or (None, None))[0] for n in NUTRIENTS]
+        self._high = [(bounds.get(n) or (None, None))[1] for n in NUTRIENTS]
+
+    def cost(self, totals: Sequence[float]) -> float:
+        """Weighted relative distance of daily totals from the targets."""
+        return sum(
+            scale * abs(total - target)
+            for scale, total, target in zip(self._scale, totals, self._targets)
+            if target is not None
+        )
+
+    def optimize(
+        self, days: Optional[Sequence[str]] = None, time_budget: float = 1.0
+    ) -> MealPlan:
+        """Builds a plan for the given days (the whole week by default).
+
+        The search takes at most about ``time_budget`` seconds; when it runs
+        out, the best combination found so far is used for each day. Raises
+        ``ValueError`` if a day has no combination within the bounds and
+        ``TimeoutError`` if the budget ran out before one was found.
+        """
+        deadline = time.perf_counter() + time_budget
+        plan = MealPlan()
+        if days is None:
+            days = list(plan.plan)
+        history: List[Set[int]] = []
+        for position, day in enumerate(days):
+            recent = history[-self.no_repeat_days :] if self.no_repeat_days else []
+            excluded = set().union(*recent)
+            remaining = max(deadline - time.perf_counter(), 0.0)
+            day_deadline = time.perf_counter() + remaining / (len(days) - position)
+            try:
+                chosen = self.best_day(excluded, day_deadline)
+            except TimeoutError:
+                raise TimeoutError(f"Time budget ran out before planning {day}")
+            if chosen is None:
+                raise ValueError(f"No meals satisfy the bounds for {day}")
+            for index in chosen:
+                plan.add_meal(day, self.recipes[index])
+            history.append(set(chosen))
+        return plan
+
+    def best_day(
+        self, excluded: Set[int] = frozenset(), deadline: Optional[float] = None
+    ) -> Optional[Tuple[int, ...]]:
+        """Returns indexes of the best recipe combination for one day.
+
+        Returns ``None`` if no combination fits the bounds and raises
+        ``TimeoutError`` if ``deadline`` passes before any is found.
+        """
+        allowed = [i for i in range(len(self.recipes)) if i not in excluded]
+        pool = self._pool(allowed, self.candidates, deadline)
+        best = self._search(pool, deadline)
+        if best is None and len(pool) < len(allowed):
+            # The closest recipes can miss bounds far from the targets.
+            pool = self._pool(allowed, len(allowed), deadline)
+            best = self._search(pool, deadline)
+        return best
+
+    def _search(
+        self, pool: List[int], deadline: Optional[float]
+    ) -> Optional[Tuple[int, ...]]:
+        """Branch-and-bound search for the best combination from ``pool``."""
+        values = self._values
+        reach = self._reach(pool, deadline)
+        best_cost = float("inf")
+        best: Optional[Tuple[int, ...]] = None
+        seen: Set[tuple] = set()
+        nodes = 0
+        out_of_time = False
+
+        def search(start: int, chosen: List[int], totals: Tuple[float, ...]) -> None:
+            nonlocal best_cost, best, nodes, out_of_time
+            nodes += 1
+            if nodes % 256 == 0:
+                out_of_time = _expired(deadline)
+            if out_of_time:
+                return
+
+            if len(chosen) >= self.min_meals and self._within_low(totals):
+                current = self.cost(totals)
+                if current < best_cost:
+                    best_cost, best = current, tuple(chosen)
+            if len(chosen) == self.max_meals:
+                return
+
+            slots = self.max_meals - len(chosen) - 1
+            for position in range(start, len(pool)):
+                index = pool[position]
+                candidate = tuple(
+                    total + value for total, value in zip(totals, values[index])
+                )
+                if not self._within_high(candidate):
+                    continue
+                bound = self._lower_bound(candidate, reach[position + 1][slots])
+                if bound >= best_cost:
+                    continue
+                state = (position, len(chosen), candidate)
+                if state in seen:
+                    continue
+                seen.add(state)
+                chosen.append(index)
+                search(position + 1, chosen, candidate)
+                chosen.pop()
+
+        search(0, [], (0.0,) * len(NUTRIENTS))
+        if best is None and out_of_time:
+            raise TimeoutError("Deadline passed before a combination was found")
+        return best
+
+    def _reach(
+        self, pool: List[int], deadline: Optional[float] = None
+    ) -> List[List[Tuple[float, ...]]]:
+        """Most each nutrient can still grow from every pool position.
+
+        ``reach[start][slots]`` sums, per nutrient, the ``slots`` largest
+        values among ``pool[start:]``.
+        """
+        largest: List[List[float]] = [[] for _ in NUTRIENTS]
+        reach = [[(0.0,) * len(NUTRIENTS)] * self.max_meals]
+        for count, index in enumerate(reversed(pool)):
+            if count % 1024 == 1023 and _expired(deadline):
+                raise TimeoutError("Deadline passed before a combination was found")
+            for column, value in zip(largest, self._values[index]):
+                column.append(value)
+                column.sort(reverse=True)
+                del column[self.max_meals :]
+            reach.append(
+                [
+                    tuple(sum(column[:slots]) for column in largest)
+                    for slots in range(self.max_meals)
+                ]
+            )
+        reach.reverse()
+        return reach
+
+    def _lower_bound(self, totals: Sequence[float], reach: Sequence[float]) -> float:
+        """Cost no completion of a partial day can beat.
+
+        Totals only grow, so overshooting a target is final, and a target
+        further away than the remaining slots can reach stays undershot.
+        """
+        bound = 0.0
+        rows = zip(self._scale, totals, self._targets, reach)
+        for scale, total, target, extra in rows:
+            if target is None:
+                continue
+            if total > target:
+                bound += scale * (total - target)
+            elif total + extra < target:
+                bound += scale * (target - total - extra)
+        return bound
+
+    def _pool(
+        self, allowed: List[int], size: int, deadline: Optional[float] = None
+    ) -> List[int]:
+        """The ``size`` allowed recipes closest to a single-meal target."""
+        meals = (self.min_meals + self.max_meals) / 2
+        share = [None if t is None else t / meals for t in self._targets]
+        terms = [
+            (column, scale, target)
+            for column, (scale, target) in enumerate(zip(self._scale, share))
+            if target is not None
+        ]
+
+        ranked = []
+        for count, index in enumerate(allowed):
+            if count % 1024 == 1023 and _expired(deadline):
+                raise TimeoutError("Deadline passed before a combination was found")
+            values = self._values[index]
+            distance = sum(
+                scale * abs(values[column] - target)
+                for column, scale, target in terms
+            )
+            ranked.append((distance, index))
+        return [index for _, index in heapq.nsmallest(size, ranked)]
+
+    def _within_low(self, totals: Sequence[float]) -> bool:
+        return all(low is None or total >= low for low, total in zip(self._low, totals))
+
+    def _within_high(self, totals: Sequence[float]) -> bool:
+        return all(
+            high is None or total <= high for high, total in zip(self._high, totals)
+        )
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.perf_counter() > deadline
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, TypeVar
+
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+
+T = TypeVar("T")
+
+
+def _partition(items: Sequence[T], chunks: int) -> List[Sequence[T]]:
+    """Splits items into at most ``chunks`` contiguous slices of similar size."""
+    chunks = max(1, min(chunks, len(items)))
+    size, extra = divmod(len(items), chunks)
+    slices = []
+    start = 0
+    for index in range(chunks):
+        end = start + size + (1 if index < extra else 0)
+        slices.append(items[start:end])
+        start = end
+    return slices
+
+
+def _list_from_recipes(recipes: Sequence[Recipe]) -> ShoppingList:
+    shopping_list = ShoppingList()
+    for recipe in recipes:
+        shopping_list.add_from_recipe(recipe)
+    return shopping_list
+
+
+def _list_from_mealplans(plans: Sequence[MealPlan]) -> ShoppingList:
+    shopping_list = ShoppingList()
+    for plan in plans:
+        shopping_list.add_from_mealplan(plan)
+    return shopping_list
+
+
+def tree_reduce(lists: Iterable[ShoppingList]) -> ShoppingList:
+    """Combines shopping lists pairwise, level by level, merging in place.
+
+    Each level halves the number of lists, so no list is copied and the
+    largest merges happen only once at the top of the tree.
+    """
+    level = list(lists)
+    if not level:
+        return ShoppingList()
+    while len(level) > 1:
+        merged = [
+            level[index].merge_in_place(level[index + 1])
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
+
+
+def _map_reduce(
+    worker, items: Sequence, max_workers: Optional[int], executor: Optional[Executor]
+) -> ShoppingList:
+    if max_workers is not None and max_workers <= 0:
+        raise ValueError("max_workers must be positive")
+    if not items:
+        return ShoppingList()
+    chunks = _partition(items, (max_workers or os.cpu_count() or 1) * 4)
+    if executor is not None:
+        return tree_reduce(executor.map(worker, chunks))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return tree_reduce(pool.map(worker, chunks))
+
+
+def parallel_shopping_list(
+    recipes: Sequence[Recipe],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> ShoppingList:
+    """Builds a shopping list from recipes using a pool of worker processes.
+
+    Recipes are split into chunks, each worker builds a partial list and the
+    partial lists are combined with ``tree_reduce``. An existing executor
+    can be passed in to avoid starting a new pool for every call.
+    """
+    return _map_reduce(_list_from_recipes, recipes, max_workers, executor)
+
+
+def parallel_mealplans_shopping_list(
+    plans: Sequence[MealPlan],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> ShoppingList:
+    """Builds one shopping list covering many meal plans in parallel."""
+    return _map_reduce(_list_from_mealplans, plans, max_workers, executor)
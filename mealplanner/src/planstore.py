@@ -0,0 +1,200 @@
+from numbers import Integral
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from src.mealplan import DAYS, MealPlan
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS, RecipeBook
+
+_DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+
+
+def _is_recipe_id(meal: object) -> bool:
+    # NumPy integers, as found in the book's id arrays, are ids as well.
+    return isinstance(meal, Integral) and not isinstance(meal, bool)
+
+
+class MealPlanStore:
+    """Weekly meal plans of many households in one shared array layout.
+
+    Every planned meal is a slot ``(household, day, recipe id)`` stored in
+    three parallel arrays; recipe nutrients come from a shared
+    ``RecipeBook``. Summaries for all households are computed in a single
+    vectorized pass. Each household keeps the list of its own slots, so
+    editing or reading one household costs time proportional to its own
+    meals, not to the whole store. Planned recipes modified in place since
+    they were stored are reloaded, by their ``version``, before summarizing.
+    """
+
+    def __init__(
+        self, book: Optional[RecipeBook] = None, capacity: int = 1024
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.book = book if book is not None else RecipeBook()
+        self._households = 0
+        self._size = 0
+        self._household = np.zeros(capacity, dtype=np.int64)
+        self._day = np.zeros(capacity, dtype=np.int8)
+        self._recipe = np.zeros(capacity, dtype=np.int64)
+        # Position of each slot within its household's entry of _slots.
+        self._position = np.zeros(capacity, dtype=np.int64)
+        self._slots: List[List[int]] = []
+
+    def __len__(self) -> int:
+        """Returns the number of households in the store."""
+        return self._households
+
+    @property
+    def meal_count(self) -> int:
+        return self._size
+
+    def add_household(self) -> int:
+        """Registers a household with an empty week and returns its id."""
+        self._households += 1
+        self._slots.append([])
+        return self._households - 1
+
+    def add_plan(self, plan: MealPlan) -> int:
+        """Copies a ``MealPlan`` into the store as a new household."""
+        household = self.add_household()
+        for day, meals in plan.plan.items():
+            for meal in meals:
+                self.add_meal(household, day, meal)
+        return household
+
+    def add_meal(self, household: int, day: str, meal: Union[Recipe, int]) -> None:
+        """Adds a meal, given as a ``Recipe`` or a recipe id of the book."""
+        self._check_household(household)
+        day_index = self._day_index(day)
+        recipe_id = self._recipe_id(meal)
+
+        if self._size == len(self._household):
+            self._grow()
+        self._household[self._size] = household
+        self._day[self._size] = day_index
+        self._recipe[self._size] = recipe_id
+        slots = self._slots[household]
+        self._position[self._size] = len(slots)
+        slots.append(self._size)
+        self._size += 1
+
+    def remove_meal(
+        self, household: int, day: str, meal: Union[Recipe, int]
+    ) -> None:
+        """Removes one occurrence of a meal from a household's day.
+
+        Meals are matched by recipe identity, not equality. The last slot
+        is moved into the freed one, so the order of meals within a day is
+        not preserved.
+        """
+        self._check_household(household)
+        day_index = self._day_index(day)
+        if isinstance(meal, Recipe) and meal not in self.book:
+            raise ValueError("Meal not found on the specified day")
+        recipe_id = int(meal) if _is_recipe_id(meal) else self.book.id_of(meal)
+
+        slots = self._day_slots(household, day_index)
+        matches = slots[self._recipe[slots] == recipe_id]
+        if not len(matches):
+            raise ValueError("Meal not found on the specified day")
+        self._remove_slot(int(matches[0]))
+
+    def clear_day(self, household: int, day: str) -> None:
+        """Removes all meals from a household's day."""
+        self._check_household(household)
+        slots = self._day_slots(household, self._day_index(day))
+        # Highest first, so the last slot moved into a freed one is never
+        # one still waiting to be removed.
+        for slot in sorted(slots.tolist(), reverse=True):
+            self._remove_slot(slot)
+
+    def get_meals(self, household: int, day: str) -> List[Recipe]:
+        """Returns the recipes planned for a household's day."""
+        self._check_household(household)
+        slots = self._day_slots(household, self._day_index(day))
+        recipe_ids = self._recipe[slots].tolist()
+        return [self.book.get(recipe_id) for recipe_id in recipe_ids]
+
+    def weekly_summaries(self) -> np.ndarray:
+        """Returns nutrient totals for every household and day.
+
+        The result has shape ``(households, 7, 4)``; days follow ``DAYS``
+        and nutrients follow ``NUTRIENTS``.
+        """
+        recipe_ids = self._recipe[: self._size]
+        self.book._reload_changed(np.unique(recipe_ids).tolist())
+        # One bin per (household, day, nutrient) cell, so one bincount sums all.
+        width = len(NUTRIENTS)
+        shape = (self._households, len(DAYS), width)
+        days = self._household[: self._size] * len(DAYS) + self._day[: self._size]
+        cells = ((days * width)[:, None] + np.arange(width)).ravel()
+        totals = np.bincount(
+            cells,
+            weights=self.book.nutrients()[recipe_ids].ravel(),
+            minlength=int(np.prod(shape)),
+        )
+        return totals.reshape(shape)
+
+    def weekly_summary(self, household: int) -> Dict[str, Dict[str, float]]:
+        """Returns one household's summary in the ``MealPlan`` format."""
+        self._check_household(household)
+        slots = np.asarray(self._slots[household], dtype=np.int64)
+        days = self._day[slots]
+        recipe_ids = self._recipe[slots]
+        self.book._reload_changed(np.unique(recipe_ids).tolist())
+        nutrients = self.book.nutrients()[recipe_ids]
+        totals = np.zeros((len(DAYS), len(NUTRIENTS)), dtype=np.float64)
+        np.add.at(totals, days, nutrients)
+        return {
+            day: dict(zip(NUTRIENTS, row)) for day, row in zip(DAYS, totals.tolist())
+        }
+
+    def _day_slots(self, household: int, day_index: int) -> np.ndarray:
+        """Returns a household's slots for one day in slot order."""
+        slots = np.asarray(self._slots[household], dtype=np.int64)
+        return np.sort(slots[self._day[slots] == day_index])
+
+    def _remove_slot(self, slot: int) -> None:
+        # Swap-remove from the household's slot list ...
+        slots = self._slots[int(self._household[slot])]
+        position = int(self._position[slot])
+        moved = slots.pop()
+        if moved != slot:
+            slots[position] = moved
+            self._position[moved] = position
+        # ... and move the last slot of the store into the freed one.
+        last = self._size - 1
+        if last != slot:
+            for column in (self._household, self._day, self._recipe, self._position):
+                column[slot] = column[last]
+            self._slots[int(self._household[slot])][int(self._position[slot])] = slot
+        self._size = last
+
+    def _recipe_id(self, meal: Union[Recipe, int]) -> int:
+        if isinstance(meal, Recipe):
+            return self.book.add(meal)
+        if _is_recipe_id(meal):
+            self.book.get(meal)
+            return int(meal)
+        raise TypeError("meal must be an instance of Recipe or a recipe id")
+
+    def _check_household(self, household: int) -> None:
+        if not 0 <= household < self._households:
+            raise ValueError(f"Invalid household id: {household}")
+
+    @staticmethod
+    def _day_index(day: str) -> int:
+        try:
+            return _DAY_INDEX[day]
+        except (KeyError, TypeError):
+            raise ValueError("Invalid day")
+
+    def _grow(self) -> None:
+        capacity = len(self._household) * 2
+        for name in ("_household", "_day", "_recipe", "_position"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
@@ -1,6 +1,9 @@
+import json
 from unittest.mock import patch
 import pytest
-from typing import Dict
+from typing import Callable, Dict, Iterator, List, Optional
+from src.ingredients import IngredientMap, ScaledIngredients
+from src.units import unit_registry
 
 
 class Recipe:
@@ -20,18 +23,61 @@ class Recipe:
         if ingredients is None:
             raise TypeError("Ingredients cannot be None")
 
+        normalized = None
         for ingredient, quantity in ingredients.items():
+            if type(quantity) is not float and type(quantity) is not int:
+                # Quantities with units are converted once, on the way in.
+                if normalized is None:
+                    normalized = dict(ingredients)
+                quantity = unit_registry.to_canonical(ingredient, quantity)
+                normalized[ingredient] = quantity
             if quantity < 0:
                 raise ValueError(
                     f"Ingredient quantity for '{ingredient}' cannot be negative"
                 )
 
         self.name = name
-        self.ingredients = ingredients
+        self.ingredients = IngredientMap(
+            ingredients if normalized is None else normalized
+        )
         self.kcal = kcal
         self.protein = protein
         self.fat = fat
         self.carbs = carbs
+        self.version = 0
+        self._listeners: Optional[List[Callable]] = None
+
+    def _touch(self, change: str, detail: object = None) -> None:
+        """Records an in-place modification of this recipe.
+
+        Subscribed listeners are called as ``listener(recipe, change,
+        detail)`` where ``change`` is ``"ingredient"`` with a ``(name,
+        old_quantity, new_quantity)`` detail (``None`` for a missing side),
+        ``"nutrients"`` or ``"scale"`` with the scaling factor.
+        """
+        self.version += 1
+        if self._listeners:
+            for listener in list(self._listeners):
+                listener(self, change, detail)
+
+    def subscribe(self, listener: Callable[["Recipe", str, object], None]) -> None:
+        """Registers a callback notified about in-place modifications."""
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[["Recipe", str, object], None]) -> None:
+        """Removes a callback registered with ``subscribe``."""
+        try:
+            self._listeners.remove(listener)
+        except (AttributeError, ValueError):
+            raise ValueError("Listener is not subscribed")
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Listeners belong to live in-process observers, not to the recipe.
+        state = self.__dict__.copy()
+        state["_listeners"] = None
+        return state
 
     def total_nutrients(self) -> Dict[str, float]:
         return {
@@ -51,20 +97,27 @@ class Recipe:
     # 1. Methods to modify ingredients:
 
     def add_ingredient(self, name: str, quantity: float) -> None:
+        quantity = unit_registry.to_canonical(name, quantity)
         if quantity < 0:
             raise ValueError("Ingredient quantity cannot be negative")
+        old_quantity = self.ingredients.get(name)
         self.ingredients[name] = quantity
+        self._touch("ingredient", (name, old_quantity, quantity))
 
     def remove_ingredient(self, name: str) -> None:
         if name in self.ingredients:
-            del self.ingredients[name]
+            old_quantity = self.ingredients.pop(name)
+            self._touch("ingredient", (name, old_quantity, None))
 
     def update_ingredient_quantity(self, name: str, new_quantity: float) -> None:
         if name not in self.ingredients:
             raise ValueError(f"Ingredient '{name}' not found")
+        new_quantity = unit_registry.to_canonical(name, new_quantity)
         if new_quantity < 0:
             raise ValueError("Quantity cannot be negative")
+        old_quantity = self.ingredients[name]
         self.ingredients[name] = new_quantity
+        self._touch("ingredient", (name, old_quantity, new_quantity))
 
     # 2. Methods to update nutritional values:
 
@@ -72,21 +125,25 @@ class Recipe:
         if new_kcal < 0:
             raise ValueError("kcal cannot be negative")
         self.kcal = new_kcal
+        self._touch("nutrients")
 
     def update_protein(self, new_protein: float) -> None:
         if new_protein < 0:
             raise ValueError("Protein cannot be negative")
         self.protein = new_protein
+        self._touch("nutrients")
 
     def update_fat(self, new_fat: float) -> None:
         if new_fat < 0:
             raise ValueError("Fat cannot be negative")
         self.fat = new_fat
+        self._touch("nutrients")
 
     def update_carbs(self, new_carbs: float) -> None:
         if new_carbs < 0:
             raise ValueError("Carbs cannot be negative")
         self.carbs = new_carbs
+        self._touch("nutrients")
 
     # 3. Helper methods:
 
@@ -97,14 +154,23 @@ class Recipe:
         return sum(self.ingredients.values())
 
     def scale_recipe(self, factor: float) -> None:
-        if factor <= 0:
+        # Written so that NaN is rejected too.
+        if not factor > 0:
             raise ValueError("Scaling factor must be positive")
-        for ingredient in self.ingredients:
-            self.ingredients[ingredient] *= factor
+        if isinstance(self.ingredients, IngredientMap):
+            self.ingredients.scale(factor)
+        else:
+            for ingredient in self.ingredients:
+                self.ingredients[ingredient] *= factor
         self.kcal *= factor
         self.protein *= factor
         self.fat *= factor
         self.carbs *= factor
+        self._touch("scale", factor)
+
+    def scaled(self, factor: float) -> "ScaledRecipe":
+        """Returns a scaled view of this recipe without copying it."""
+        return ScaledRecipe(self, factor)
 
     # 4. Methods to compare recipes:
 
@@ -124,7 +190,8 @@ class Recipe:
 
     def detailed_str(self) -> str:
         ingredients = "\n".join(
-            f"- {name}: {quantity}g" for name, quantity in self.ingredients.items()
+            f"- {name}: {unit_registry.format(name, quantity)}"
+            for name, quantity in self.ingredients.items()
         )
         nutrients = self.total_nutrients()
         return (
@@ -140,6 +207,7 @@ class Recipe:
     # 6. Method to split the recipe into portions:
 
     def split_into_portions(self, portions: int) -> "Recipe":
+        """Returns one portion as an independent copy of the recipe."""
         if portions <= 0:
             raise ValueError("Number of portions must be positive")
         factor = 1 / portions
@@ -153,7 +221,172 @@ class Recipe:
             carbs=self.carbs * factor,
         )
 
-    # 7. Mock
+    def portion_view(self, portions: int) -> "ScaledRecipe":
+        """Returns one portion as a view that follows later recipe changes."""
+        if portions <= 0:
+            raise ValueError("Number of portions must be positive")
+        return ScaledRecipe(
+            self, 1 / portions, name=f"{self.name} (1/{portions} portion)"
+        )
+
+    # 7. Methods for serialization:
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "ingredients": dict(self.ingredients.items()),
+            "kcal": self.kcal,
+            "protein": self.protein,
+            "fat": self.fat,
+            "carbs": self.carbs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Recipe":
+        try:
+            return cls(
+                name=data["name"],
+                ingredients=data["ingredients"],
+                kcal=data["kcal"],
+                protein=data["protein"],
+                fat=data["fat"],
+                carbs=data["carbs"],
+            )
+        except KeyError as error:
+            raise ValueError(f"Missing recipe field: {error.args[0]}")
+
+    @classmethod
+    def _from_validated(
+        cls,
+        name: str,
+        ingredients: IngredientMap,
+        kcal: float,
+        protein: float,
+        fat: float,
+        carbs: float,
+    ) -> "Recipe":
+        """Builds a recipe from values already checked, skipping ``__init__``."""
+        recipe = cls.__new__(cls)
+        recipe.name = name
+        recipe.ingredients = ingredients
+        recipe.kcal = kcal
+        recipe.protein = protein
+        recipe.fat = fat
+        recipe.carbs = carbs
+        recipe.version = 0
+        recipe._listeners = None
+        return recipe
+
+
+def iter_recipes_jsonl(path: str) -> Iterator[Recipe]:
+    """Lazily yields recipes from a JSON Lines file, one recipe per line."""
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield Recipe.from_dict(json.loads(line))
+            except (ValueError, TypeError) as error:
+                raise ValueError(f"Invalid recipe on line {line_number}: {error}")
+
+
+class ScaledRecipe(Recipe):
+    """Read-only view of a recipe with quantities and nutrients scaled.
+
+    The view keeps a reference to its base recipe and a factor, and
+    computes values when they are read, so later changes to the base show
+    through. Scaling a view again composes the factors instead of nesting
+    views. ``scale_recipe`` changes the view's own factor; every other
+    mutator raises ``TypeError``. Listeners of a view are also told about
+    changes to its base, with quantities scaled.
+    """
+
+    def __init__(
+        self, base: Recipe, factor: float, name: Optional[str] = None
+    ) -> None:
+        if not isinstance(base, Recipe):
+            raise TypeError("base must be an instance of Recipe")
+        if not factor > 0:
+            raise ValueError("Scaling factor must be positive")
+        if isinstance(base, ScaledRecipe):
+            if name is None:
+                name = base._name
+            factor *= base.factor
+            base = base.base
+        self.base = base
+        self.factor = factor
+        self._name = name
+        self._own_version = 0
+        self._listeners: Optional[List[Callable]] = None
+
+    @property
+    def version(self) -> int:
+        # Also changes with the base, so version checks see edits through it.
+        return self._own_version + self.base.version
+
+    @version.setter
+    def version(self, value: int) -> None:
+        self._own_version = value - self.base.version
+
+    @property
+    def name(self) -> str:
+        return self.base.name if self._name is None else self._name
+
+    @property
+    def ingredients(self) -> ScaledIngredients:
+        return ScaledIngredients(self.base.ingredients, self.factor)
+
+    @property
+    def kcal(self) -> float:
+        return self.base.kcal * self.factor
+
+    @property
+    def protein(self) -> float:
+        return self.base.protein * self.factor
+
+    @property
+    def fat(self) -> float:
+        return self.base.fat * self.factor
+
+    @property
+    def carbs(self) -> float:
+        return self.base.carbs * self.factor
+
+    def subscribe(self, listener: Callable[["Recipe", str, object], None]) -> None:
+        if not self._listeners:
+            self.base.subscribe(self._on_base_change)
+        super().subscribe(listener)
+
+    def unsubscribe(self, listener: Callable[["Recipe", str, object], None]) -> None:
+        super().unsubscribe(listener)
+        if not self._listeners:
+            self.base.unsubscribe(self._on_base_change)
+
+    def _on_base_change(self, base: Recipe, change: str, detail: object) -> None:
+        if change == "ingredient":
+            name, old_quantity, new_quantity = detail
+            detail = (
+                name,
+                None if old_quantity is None else old_quantity * self.factor,
+                None if new_quantity is None else new_quantity * self.factor,
+            )
+        self._touch(change, detail)
+
+    def scale_recipe(self, factor: float) -> None:
+        if not factor > 0:
+            raise ValueError("Scaling factor must be positive")
+        self.factor *= factor
+        self._touch("scale", factor)
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError("ScaledRecipe is a read-only view of its base recipe")
+
+    add_ingredient = remove_ingredient = update_ingredient_quantity = _read_only
+    update_kcal = update_protein = update_fat = update_carbs = _read_only
+
+
+# 8. Mock
+
 
 def test_daily_summary_with_mocked_nutrients():
     """Test sprawdza, czy daily_summary poprawnie sumuje wartości odżywcze (z mockiem)."""
@@ -171,4 +404,4 @@ def test_daily_summary_with_mocked_nutrients():
         # Sprawdzamy, czy metoda została wywołana
         mock_nutrients.assert_called_once()
         # Sprawdzamy, czy podsumowanie jest zgodne z mockiem
-        assert summary == {"kcal": 100, "protein": 10, "fat": 5, "carbs": 20}
\ No newline at end of file
+        assert summary == {"kcal": 100, "protein": 10, "fat": 5, "carbs": 20}
@@ -0,0 +1,166 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+
+NUTRIENTS = ("kcal", "protein", "fat", "carbs")
+
+
+class RecipeBook:
+    """Columnar store of recipe nutrients addressed by integer recipe ids.
+
+    Nutrients of all recipes live in a single ``(n, 4)`` float array, so a
+    summary over any subset of recipes is one gather followed by one sum.
+    Plan summaries reload recipes whose ``version`` changed since they were
+    stored; summaries by id need ``refresh`` after in-place edits.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self._nutrients = np.zeros((capacity, len(NUTRIENTS)), dtype=np.float64)
+        self._recipes: List[Recipe] = []
+        self._versions: List[int] = []
+        self._ids: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    def __contains__(self, recipe: object) -> bool:
+        return id(recipe) in self._ids
+
+    def add(self, recipe: Recipe) -> int:
+        """Adds a recipe to the book and returns its id.
+
+        Adding the same recipe object twice returns the id it already has.
+        """
+        if not isinstance(recipe, Recipe):
+            raise TypeError("recipe must be an instance of Recipe")
+
+        recipe_id = self._ids.get(id(recipe))
+        if recipe_id is not None:
+            return recipe_id
+
+        recipe_id = len(self._recipes)
+        if recipe_id == self._nutrients.shape[0]:
+            grown = np.zeros((recipe_id * 2, len(NUTRIENTS)), dtype=np.float64)
+            grown[:recipe_id] = self._nutrients[:recipe_id]
+            self._nutrients = grown
+
+        self._recipes.append(recipe)
+        self._versions.append(recipe.version)
+        self._ids[id(recipe)] = recipe_id
+        self._store(recipe_id, recipe)
+        return recipe_id
+
+    def _current_id(self, recipe: Recipe) -> int:
+        """Returns the id of a recipe, adding or reloading it as needed."""
+        recipe_id = self._ids.get(id(recipe))
+        if recipe_id is None:
+            return self.add(recipe)
+        if self._versions[recipe_id] != recipe.version:
+            self._store(recipe_id, recipe)
+        return recipe_id
+
+    def _reload_changed(self, recipe_ids: Iterable[int]) -> None:
+        """Reloads the given recipes whose ``version`` changed since stored."""
+        for recipe_id in recipe_ids:
+            recipe = self._recipes[recipe_id]
+            if self._versions[recipe_id] != recipe.version:
+                self._store(recipe_id, recipe)
+
+    def add_many(self, recipes: Iterable[Recipe]) -> List[int]:
+        """Adds several recipes and returns their ids in the same order."""
+        return [self.add(recipe) for recipe in recipes]
+
+    def id_of(self, recipe: Recipe) -> int:
+        """Returns the id of a recipe stored in the book."""
+        try:
+            return self._ids[id(recipe)]
+        except KeyError:
+            raise ValueError("Recipe not found in the book")
+
+    def get(self, recipe_id: int) -> Recipe:
+        """Returns the recipe stored under the given id."""
+        if not 0 <= recipe_id < len(self._recipes):
+            raise ValueError(f"Invalid recipe id: {recipe_id}")
+        return self._recipes[recipe_id]
+
+    def refresh(self, recipe_id: Optional[int] = None) -> None:
+        """Reloads nutrient values after recipes were modified in place.
+
+        Refreshes a single recipe when ``recipe_id`` is given, otherwise the
+        whole book.
+        """
+        if recipe_id is None:
+            for rid, recipe in enumerate(self._recipes):
+                self._store(rid, recipe)
+        else:
+            self._store(recipe_id, self.get(recipe_id))
+
+    def nutrients(self) -> np.ndarray:
+        """Returns a read-only ``(n, 4)`` view of the nutrient columns."""
+        view = self._nutrients[: len(self._recipes)]
+        view.flags.writeable = False
+        return view
+
+    def summary(self, recipe_ids: Sequence[int]) -> Dict[str, float]:
+        """Sums nutrients over the given recipe ids (repeats count each time)."""
+        totals = self._gather(recipe_ids).sum(axis=0)
+        return dict(zip(NUTRIENTS, totals.tolist()))
+
+    def summaries(self, groups: Sequence[Sequence[int]]) -> np.ndarray:
+        """Sums nutrients for each group of recipe ids.
+
+        Returns a ``(len(groups), 4)`` array whose columns follow
+        ``NUTRIENTS``.
+        """
+        lengths = np.fromiter((len(group) for group in groups), dtype=np.intp)
+        result = np.zeros((len(lengths), len(NUTRIENTS)), dtype=np.float64)
+        if lengths.sum() == 0:
+            return result
+
+        flat = np.fromiter(
+            (recipe_id for group in groups for recipe_id in group), dtype=np.intp
+        )
+        # One bin per (group, nutrient) cell, so a single bincount sums all.
+        width = len(NUTRIENTS)
+        labels = np.repeat(np.arange(len(lengths)) * width, lengths)
+        cells = (labels[:, None] + np.arange(width)).ravel()
+        totals = np.bincount(
+            cells, weights=self._gather(flat).ravel(), minlength=result.size
+        )
+        return totals.reshape(result.shape)
+
+    def daily_summary(self, plan: MealPlan, day: str) -> Dict[str, float]:
+        """Vectorized equivalent of ``MealPlan.daily_summary``."""
+        if day not in plan.plan:
+            raise ValueError("Invalid day")
+        return self.summary([self._current_id(meal) for meal in plan.plan[day]])
+
+    def weekly_summary(self, plan: MealPlan) -> Dict[str, Dict[str, float]]:
+        """Vectorized equivalent of ``MealPlan.weekly_summary``."""
+        days = list(plan.plan)
+        totals = self.summaries(
+            [[self._current_id(meal) for meal in plan.plan[day]] for day in days]
+        )
+        return {
+            day: dict(zip(NUTRIENTS, row)) for day, row in zip(days, totals.tolist())
+        }
+
+    def _gather(self, recipe_ids: Sequence[int]) -> np.ndarray:
+        ids = np.asarray(recipe_ids, dtype=np.intp)
+        if ids.size and (ids.min() < 0 or ids.max() >= len(self._recipes)):
+            raise ValueError("Invalid recipe id")
+        return self._nutrients[ids]
+
+    def _store(self, recipe_id: int, recipe: Recipe) -> None:
+        self._versions[recipe_id] = recipe.version
+        self._nutrients[recipe_id] = (
+            recipe.kcal,
+            recipe.protein,
+            recipe.fat,
+            recipe.carbs,
+        )
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import json
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.mealplan import MealHandle, MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import stream_shopping_list
+
+
+class SummaryService:
+    """Meal plans and recipes served over a JSON Lines protocol.
+
+    Every request is one JSON object per line with an ``op`` field and an
+    optional ``id`` echoed back in the response, e.g.::
+
+        {"id": 1, "op": "add_meal", "plan": "home", "day": "Monday",
+         "recipe": "Pasta"}
+
+    Responses are ``{"id": ..., "ok": true, "result": ...}`` or
+    ``{"id": ..., "ok": false, "error": "..."}``. Requests on one connection
+    may be pipelined; responses can then arrive out of order.
+
+    Summary and shopping list requests are not computed right away. All of
+    them issued within the same event loop iteration are collected and
+    every distinct plan is computed once for the whole batch, so the
+    results reflect the plans as they are when the batch runs.
+    """
+
+    def __init__(self) -> None:
+        self.recipes: Dict[str, Recipe] = {}
+        self.plans: Dict[str, MealPlan] = {}
+        self._meals: Dict[int, MealHandle] = {}
+        self._meal_ids: Dict[MealHandle, int] = {}
+        self._next_meal = 0
+        self._pending: Dict[Tuple[str, str], List[asyncio.Future]] = {}
+        self.batches = 0
+        self.computations = 0
+        self._operations: Dict[str, Callable] = {
+            "add_recipe": self._add_recipe,
+            "create_plan": self._create_plan,
+            "add_meal": self._add_meal,
+            "remove_meal": self._remove_meal,
+            "clear_day": self._clear_day,
+        }
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Starts listening; port 0 picks a free port."""
+        return await asyncio.start_server(self._client, host, port)
+
+    async def handle(self, request: Dict[str, object]) -> Dict[str, object]:
+        """Executes one request and returns its response."""
+        response: Dict[str, object] = {"id": request.get("id")}
+        try:
+            op = request.get("op")
+            if op in ("daily_summary", "weekly_summary", "shopping_list"):
+                result = await self._batched(op, request)
+            elif op in self._operations:
+                result = self._operations[op](request)
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+        except (KeyError, TypeError, ValueError) as error:
+            response.update(ok=False, error=str(error))
+        except Exception as error:
+            # Anything else is still answered, so the client is never left
+            # waiting and the connection keeps serving other requests.
+            response.update(ok=False, error=f"{type(error).__name__}: {error}")
+        else:
+            response.update(ok=True, result=result)
+        return response
+
+    async def _client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        tasks: Set[asyncio.Task] = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+            except ValueError as error:
+                response = {"id": None, "ok": False, "error": str(error)}
+            else:
+                response = await self.handle(request)
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as error:
+                    # The last line may lack its newline.
+                    if not error.partial:
+                        break
+                    line = error.partial
+                except asyncio.LimitOverrunError:
+                    # Only this line is rejected; requests before and after
+                    # it on the connection are still answered.
+                    await _discard_line(reader)
+                    response = {"id": None, "ok": False, "error": "Request too long"}
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    continue
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    # Batched requests
+
+    def _batched(self, op: str, request: Dict[str, object]) -> asyncio.Future:
+        name = self._plan_name(request)
+        if op == "daily_summary":
+            day = request.get("day")
+            if day not in self.plans[name].plan:
+                raise ValueError("Invalid day")
+        kind = "shopping_list" if op == "shopping_list" else "summary"
+
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            loop.call_soon(self._flush)
+        future = loop.create_future()
+        self._pending.setdefault((kind, name), []).append(future)
+        if op != "daily_summary":
+            return future
+        return asyncio.ensure_future(self._pick_day(future, day))
+
+    @staticmethod
+    async def _pick_day(future: asyncio.Future, day: str) -> Dict[str, float]:
+        return (await future)[day]
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        self.batches += 1
+        for (kind, name), futures in pending.items():
+            try:
+                result = self._compute(kind, self.plans[name])
+            except Exception as error:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.computations += 1
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def _compute(kind: str, plan: MealPlan) -> Dict[str, object]:
+        if kind == "summary":
+            return plan.weekly_summary()
+        return stream_shopping_list(
+            meal for meals in plan.plan.values() for meal in meals
+        )
+
+    # Plan mutations
+
+    def _add_recipe(self, request: Dict[str, object]) -> str:
+        recipe = Recipe.from_dict(_recipe_data(request.get("recipe")))
+        if recipe.name in self.recipes:
+            raise ValueError(f"Recipe already exists: {recipe.name}")
+        self.recipes[recipe.name] = recipe
+        return recipe.name
+
+    def _create_plan(self, request: Dict[str, object]) -> str:
+        name = request.get("plan")
+        if not isinstance(name, str) or not name:
+            raise ValueError("Plan name must be a non-empty string")
+        if name in self.plans:
+            raise ValueError(f"Plan already exists: {name}")
+        self.plans[name] = MealPlan()
+        return name
+
+    def _add_meal(self, request: Dict[str, object]) -> int:
+        plan = self.plans[self._plan_name(request)]
+        recipe_name = request.get("recipe")
+        if recipe_name not in self.recipes:
+            raise ValueError(f"Unknown recipe: {recipe_name}")
+        handle = plan.add_meal(request.get("day"), self.recipes[recipe_name])
+        meal_id = self._next_meal
+        self._next_meal += 1
+        self._meals[meal_id] = handle
+        self._meal_ids[handle] = meal_id
+        return meal_id
+
+    def _remove_meal(self, request: Dict[str, object]) -> str:
+        plan = self.plans[self._plan_name(request)]
+        meal_id = request.get("meal")
+        handle = self._meals.get(meal_id)
+        if handle is None:
+            raise ValueError(f"Unknown meal: {meal_id}")
+        recipe = plan.remove_meal_by_handle(handle)
+        del self._meals[meal_id]
+        del self._meal_ids[handle]
+        return recipe.name
+
+    def _clear_day(self, request: Dict[str, object]) -> None:
+        plan = self.plans[self._plan_name(request)]
+        day = request.get("day")
+        if day not in plan.plan:
+            raise ValueError("Invalid day")
+        for handle in plan.plan[day].handles():
+            meal_id = self._meal_ids.pop(handle, None)
+            if meal_id is not None:
+                del self._meals[meal_id]
+        plan.clear_day(day)
+
+    def _plan_name(self, request: Dict[str, object]) -> str:
+        name = request.get("plan")
+        if name not in self.plans:
+            raise ValueError(f"Unknown plan: {name}")
+        return name
+
+
+async def _discard_line(reader: asyncio.StreamReader) -> None:
+    """Skips the rest of a line longer than the reader's buffer limit."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+def _recipe_data(data: object) -> Dict[str, object]:
+    """Checks the JSON shape of a recipe before it reaches ``Recipe``."""
+    if not isinstance(data, dict):
+        raise ValueError("Recipe must be a JSON object")
+    if not isinstance(data.get("name"), str):
+        raise ValueError("Recipe name must be a string")
+    ingredients = data.get("ingredients")
+    if not isinstance(ingredients, dict):
+        raise ValueError("Recipe ingredients must be a JSON object")
+    for quantity in ingredients.values():
+        if isinstance(quantity, bool) or not isinstance(
+            quantity, (int, float, str, list)
+        ):
+            raise ValueError(f"Invalid ingredient quantity: {quantity!r}")
+    for field in ("kcal", "protein", "fat", "carbs"):
+        value = data.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Recipe {field} must be a number")
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local meal plan summary service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    arguments = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = await SummaryService().serve(arguments.host, arguments.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
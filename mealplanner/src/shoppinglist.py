@@ -1,27 +1,119 @@
+import weakref
 from collections import defaultdict
 from unittest.mock import patch
-from typing import Dict, Union
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from src.categories import Categorizer, default_categorizer
+from src.ingredients import IngredientMap, ScaledIngredients, ingredient_registry
 from src.recipe import Recipe
 from src.mealplan import MealPlan
+from src.units import QuantityLike, unit_registry
 
 
 def generate_shopping_list(recipes: list[Recipe]) -> Dict[str, float]:
     """Generates a shopping list from a list of recipes."""
-    shopping_list = defaultdict(float)
+    return stream_shopping_list(recipes)
+
+
+def stream_shopping_list(
+    recipes: Iterable[Recipe],
+    progress: Optional[Callable[[int], None]] = None,
+    progress_every: int = 10000,
+) -> Dict[str, float]:
+    """Generates a shopping list from any iterable of recipes.
+
+    Recipes are consumed one at a time, so memory use depends only on the
+    number of distinct ingredients. ``progress`` is called with the number
+    of recipes processed so far every ``progress_every`` recipes and once
+    more at the end.
+    """
+    if progress_every <= 0:
+        raise ValueError("progress_every must be positive")
+
+    totals: defaultdict[int, float] = defaultdict(float)
+    count = 0
     for recipe in recipes:
-        for ingredient, quantity in recipe.ingredients.items():
-            shopping_list[ingredient] += quantity
-    return dict(shopping_list)
+        ingredients = recipe.ingredients
+        if isinstance(ingredients, IngredientMap):
+            for ingredient_id, quantity in zip(
+                ingredients.ids, ingredients.quantities
+            ):
+                totals[ingredient_id] += quantity
+        elif isinstance(ingredients, ScaledIngredients) and isinstance(
+            ingredients.base, IngredientMap
+        ):
+            factor = ingredients.factor
+            base = ingredients.base
+            for ingredient_id, quantity in zip(base.ids, base.quantities):
+                totals[ingredient_id] += quantity * factor
+        else:
+            for ingredient, quantity in ingredients.items():
+                totals[ingredient_registry.intern(ingredient)] += quantity
+        count += 1
+        if progress is not None and count % progress_every == 0:
+            progress(count)
+    if progress is not None and (count == 0 or count % progress_every != 0):
+        progress(count)
+
+    names = ingredient_registry.names()
+    return {
+        names[ingredient_id]: quantity for ingredient_id, quantity in totals.items()
+    }
+
+
+class _WeakListener:
+    """Plan or recipe listener calling a method without keeping its owner alive."""
+
+    __slots__ = ("_method",)
+
+    def __init__(self, method: Callable[[object, str, object], None]) -> None:
+        self._method = weakref.WeakMethod(method)
+
+    def __call__(self, source, change: str, detail: object) -> None:
+        method = self._method()
+        if method is None:
+            source.unsubscribe(self)
+        else:
+            method(source, change, detail)
 
 
 class ShoppingList:
     def __init__(self) -> None:
         """Initializes an empty shopping list."""
         self.items: defaultdict[str, float] = defaultdict(float)
+        self._mealplan: Optional[MealPlan] = None
+        # id(recipe) -> [recipe, number of times it is planned]
+        self._tracked: Dict[int, List] = {}
+        # Quantities added by tracking, as opposed to by hand.
+        self._contributed: Dict[str, float] = {}
+        self._plan_listener: Optional[_WeakListener] = None
+        self._recipe_listener: Optional[_WeakListener] = None
+
+    def __getstate__(self) -> Dict[str, object]:
+        # A copy no longer follows the tracked meal plan.
+        state = self.__dict__.copy()
+        state["_mealplan"] = None
+        state["_tracked"] = {}
+        state["_contributed"] = {}
+        state["_plan_listener"] = state["_recipe_listener"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self._mealplan = None
+        self._tracked = {}
+        self._contributed = {}
+        self._plan_listener = self._recipe_listener = None
+        self.__dict__.update(state)
+
+    def __del__(self) -> None:
+        if getattr(self, "_mealplan", None) is not None:
+            self.untrack_mealplan()
 
-    def add_item(self, ingredient: str, quantity: float) -> None:
+    def add_item(self, ingredient: str, quantity: QuantityLike) -> None:
         """Adds a specified quantity of an ingredient to the shopping list."""
+        quantity = unit_registry.to_canonical(ingredient, quantity)
         if quantity > 0:
+            if ingredient not in self.items:
+                unit_registry.mark_stored(ingredient)
             self.items[ingredient] += quantity
 
     def get_items(self) -> Dict[str, float]:
@@ -45,6 +137,100 @@ class ShoppingList:
                 for ingredient, quantity in meal.ingredients.items():
                     self.add_item(ingredient, quantity)
 
+    def track_mealplan(self, mealplan: MealPlan) -> None:
+        """Adds a meal plan's ingredients and keeps the list in sync with it.
+
+        Meals added, removed or cleared through the plan's methods, and
+        ingredient changes or scaling of planned recipes, are applied as
+        deltas instead of rebuilding the list. Direct edits of
+        ``mealplan.plan`` are not followed. Items added by hand are kept
+        when the meals that also need them go away. The plan and its
+        recipes do not keep the list alive.
+        """
+        if self._mealplan is not None:
+            raise ValueError("Shopping list is already tracking a meal plan")
+        for meals in mealplan.plan.values():
+            for meal in meals:
+                if not isinstance(meal, Recipe):
+                    raise TypeError(
+                        f"meal must be an instance of Recipe, but got {type(meal)}"
+                    )
+        self._mealplan = mealplan
+        self._plan_listener = _WeakListener(self._on_plan_change)
+        self._recipe_listener = _WeakListener(self._on_recipe_change)
+        mealplan.subscribe(self._plan_listener)
+        for meals in mealplan.plan.values():
+            for meal in meals:
+                self._apply_recipe(meal, 1)
+                self._track_recipe(meal)
+
+    def untrack_mealplan(self) -> None:
+        """Stops following the tracked meal plan, keeping the current items."""
+        if self._mealplan is None:
+            raise ValueError("Shopping list is not tracking a meal plan")
+        self._mealplan.unsubscribe(self._plan_listener)
+        for recipe, _ in self._tracked.values():
+            recipe.unsubscribe(self._recipe_listener)
+        self._mealplan = None
+        self._tracked = {}
+        self._contributed = {}
+        self._plan_listener = self._recipe_listener = None
+
+    def _on_plan_change(self, mealplan: MealPlan, change: str, detail: object) -> None:
+        day, meal = detail
+        if change == "add":
+            self._apply_recipe(meal, 1)
+            self._track_recipe(meal)
+        else:
+            removed = meal if change == "clear" else [meal]
+            for meal in removed:
+                self._apply_recipe(meal, -1)
+                self._untrack_recipe(meal)
+
+    def _on_recipe_change(self, recipe: Recipe, change: str, detail: object) -> None:
+        count = self._tracked[id(recipe)][1]
+        if change == "ingredient":
+            name, old_quantity, new_quantity = detail
+            self._apply(name, ((new_quantity or 0) - (old_quantity or 0)) * count)
+        elif change == "scale":
+            for name, quantity in recipe.ingredients.items():
+                self._apply(name, (quantity - quantity / detail) * count)
+
+    def _track_recipe(self, recipe: Recipe) -> None:
+        entry = self._tracked.get(id(recipe))
+        if entry is None:
+            self._tracked[id(recipe)] = [recipe, 1]
+            recipe.subscribe(self._recipe_listener)
+        else:
+            entry[1] += 1
+
+    def _untrack_recipe(self, recipe: Recipe) -> None:
+        entry = self._tracked[id(recipe)]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._tracked[id(recipe)]
+            recipe.unsubscribe(self._recipe_listener)
+
+    def _apply_recipe(self, recipe: Recipe, sign: int) -> None:
+        for ingredient, quantity in recipe.ingredients.items():
+            self._apply(ingredient, sign * quantity)
+
+    def _apply(self, ingredient: str, delta: float) -> None:
+        """Applies a change coming from the tracked plan to one item."""
+        quantity = self.items.get(ingredient, 0) + delta
+        contributed = self._contributed.get(ingredient, 0) + delta
+        if contributed > 1e-9:
+            self._contributed[ingredient] = contributed
+        else:
+            # No planned meal needs it any more: keep what was added by
+            # hand, without the float error left over from tracking.
+            self._contributed.pop(ingredient, None)
+            quantity -= contributed
+        if quantity > 1e-9:
+            self.items[ingredient] = quantity
+        else:
+            self.items.pop(ingredient, None)
+
     def filter_by_threshold(self, threshold: float) -> "ShoppingList":
         """Filters the shopping list to only include items with quantity above a certain threshold."""
         filtered = ShoppingList()
@@ -55,15 +241,19 @@ class ShoppingList:
 
     def remove_item(self, ingredient: str) -> None:
         """Removes an ingredient from the shopping list."""
+        # Removed by hand, so tracking no longer accounts for any of it.
+        self._contributed.pop(ingredient, None)
         if ingredient in self.items:
             del self.items[ingredient]
 
     def clear(self) -> None:
         """Clears all items from the shopping list."""
+        self._contributed = {}
         self.items.clear()
 
-    def update_item_quantity(self, ingredient: str, quantity: float) -> None:
+    def update_item_quantity(self, ingredient: str, quantity: QuantityLike) -> None:
         """Updates the quantity of a specific ingredient."""
+        quantity = unit_registry.to_canonical(ingredient, quantity)
         if ingredient in self.items and quantity > 0:
             self.items[ingredient] = quantity
 
@@ -75,23 +265,31 @@ class ShoppingList:
         """Returns the total quantity of all items in the shopping list."""
         return sum(self.items.values())
 
-    def get_categorized_items(self) -> Dict[str, Dict[str, float]]:
-        """Returns the shopping list categorized by ingredients' category."""
-        categories: defaultdict[str, Dict[str, float]] = defaultdict(dict)
-        for ingredient, quantity in self.items.items():
-            category = (
-                "uncategorized"  # Add your logic to categorize ingredients if necessary
-            )
-            categories[category][ingredient] = quantity
-        return dict(categories)
+    def get_categorized_items(
+        self, categorizer: Optional[Categorizer] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Returns the shopping list categorized by ingredients' category.
+
+        Uses ``default_categorizer`` unless another ``Categorizer`` is given.
+        """
+        return (categorizer or default_categorizer).group(self.items)
 
     def has_item(self, ingredient: str) -> bool:
         """Checks if a particular ingredient is in the shopping list."""
         return ingredient in self.items
 
-    def get_item_quantity(self, ingredient: str) -> float:
-        """Returns the quantity of a specific ingredient."""
-        return self.items.get(ingredient, 0)
+    def get_item_quantity(self, ingredient: str, unit: Optional[str] = None) -> float:
+        """Returns the quantity of a specific ingredient.
+
+        Quantities are in the ingredient's canonical unit unless another
+        ``unit`` is requested.
+        """
+        quantity = self.items.get(ingredient, 0)
+        if unit is None:
+            return quantity
+        return unit_registry.convert(
+            ingredient, quantity, unit_registry.unit_of(ingredient), unit
+        )
 
     def export(self) -> Dict[str, float]:
         """Exports the shopping list as a dictionary."""
@@ -99,6 +297,9 @@ class ShoppingList:
 
     def import_list(self, data: Dict[str, float]) -> None:
         """Imports a shopping list from a dictionary."""
+        for ingredient in data:
+            unit_registry.mark_stored(ingredient)
+        self._contributed = {}
         self.items = defaultdict(float, data)
 
     def merge(self, other: "ShoppingList") -> "ShoppingList":
@@ -109,6 +310,14 @@ class ShoppingList:
             merged.add_item(ingredient, quantity)
         return merged
 
+    def merge_in_place(self, other: "ShoppingList") -> "ShoppingList":
+        """Adds another shopping list's items to this one and returns self."""
+        items = self.items
+        for ingredient, quantity in other.items.items():
+            if quantity > 0:
+                items[ingredient] += quantity
+        return self
+
     def scale_quantities(self, factor: float) -> None:
         """Scales the quantities of all ingredients in the shopping list by a factor."""
         if factor < 0:
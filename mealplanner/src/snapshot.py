@@ -0,0 +1,164 @@
+import weakref
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from src.recipe import Recipe
+
+# Canonical snapshots by content hash. Values are weak, so a snapshot is
+# only shared while something else still refers to it.
+_interned: "weakref.WeakValueDictionary[int, RecipeSnapshot]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class RecipeSnapshot:
+    """Immutable, hashable copy of a recipe's content.
+
+    The hash over name, ingredients and nutrients is computed once, and
+    equality compares it before anything else, so snapshots work well as
+    dict keys and set members. Like ``Recipe.__eq__``, ingredient order
+    does not matter.
+    """
+
+    __slots__ = (
+        "name",
+        "ingredients",
+        "kcal",
+        "protein",
+        "fat",
+        "carbs",
+        "_hash",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        ingredients: Mapping[str, float],
+        kcal: float,
+        protein: float,
+        fat: float,
+        carbs: float,
+    ) -> None:
+        if not name:
+            raise ValueError("Recipe name cannot be empty")
+        if kcal < 0 or protein < 0 or fat < 0 or carbs < 0:
+            raise ValueError("Nutritional values cannot be negative")
+        if ingredients is None:
+            raise TypeError("Ingredients cannot be None")
+        items = frozenset(ingredients.items())
+
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "ingredients", items)
+        set_field(self, "kcal", kcal)
+        set_field(self, "protein", protein)
+        set_field(self, "fat", fat)
+        set_field(self, "carbs", carbs)
+        set_field(self, "_hash", hash((name, items, kcal, protein, fat, carbs)))
+
+    @classmethod
+    def from_recipe(cls, recipe: Recipe) -> "RecipeSnapshot":
+        """Captures the current content of a recipe."""
+        if not isinstance(recipe, Recipe):
+            raise TypeError("recipe must be an instance of Recipe")
+        return cls(
+            recipe.name,
+            recipe.ingredients,
+            recipe.kcal,
+            recipe.protein,
+            recipe.fat,
+            recipe.carbs,
+        )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("RecipeSnapshot is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("RecipeSnapshot is immutable")
+
+    def __reduce__(self) -> Tuple:
+        # String hashes differ between processes, so the hash is recomputed.
+        return (
+            RecipeSnapshot,
+            (
+                self.name,
+                dict(self.ingredients),
+                self.kcal,
+                self.protein,
+                self.fat,
+                self.carbs,
+            ),
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, RecipeSnapshot):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.name == other.name
+            and self.kcal == other.kcal
+            and self.protein == other.protein
+            and self.fat == other.fat
+            and self.carbs == other.carbs
+            and self.ingredients == other.ingredients
+        )
+
+    def __repr__(self) -> str:
+        return f"RecipeSnapshot({self.name!r}, kcal={self.kcal})"
+
+    def total_nutrients(self) -> Dict[str, float]:
+        return {
+            "kcal": self.kcal,
+            "protein": self.protein,
+            "fat": self.fat,
+            "carbs": self.carbs,
+        }
+
+    def to_recipe(self) -> Recipe:
+        """Returns a new mutable ``Recipe`` with this content."""
+        return Recipe(
+            self.name,
+            dict(self.ingredients),
+            self.kcal,
+            self.protein,
+            self.fat,
+            self.carbs,
+        )
+
+
+def intern_snapshot(snapshot: RecipeSnapshot) -> RecipeSnapshot:
+    """Returns the shared snapshot equal to the given one.
+
+    The first snapshot interned with some content becomes the canonical
+    object for it, for as long as it is referenced elsewhere.
+    """
+    canonical = _interned.get(snapshot._hash)
+    if canonical is None:
+        _interned[snapshot._hash] = snapshot
+        return snapshot
+    if canonical == snapshot:
+        return canonical
+    # A different recipe with the same hash keeps its own object.
+    return snapshot
+
+
+def snapshot(recipe: Recipe) -> RecipeSnapshot:
+    """Returns the interned snapshot of a recipe's current content."""
+    return intern_snapshot(RecipeSnapshot.from_recipe(recipe))
+
+
+def unique_snapshots(recipes: Iterable[Recipe]) -> List[RecipeSnapshot]:
+    """Returns interned snapshots of distinct recipes in first-seen order.
+
+    Duplicates are found through a hash set, so this is linear in the
+    number of recipes.
+    """
+    seen: Dict[RecipeSnapshot, None] = {}
+    for recipe in recipes:
+        seen.setdefault(snapshot(recipe), None)
+    return list(seen)
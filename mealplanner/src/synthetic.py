@@ -0,0 +1,75 @@
+import random
+from typing import Iterator, List, Sequence, Tuple
+
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+
+
+def ingredient_names(count: int) -> List[str]:
+    """Returns ``count`` distinct synthetic ingredient names."""
+    return [f"ingredient-{index}" for index in range(count)]
+
+
+def iter_recipes(
+    count: int,
+    seed: int = 0,
+    ingredients: int = 1000,
+    per_recipe: Tuple[int, int] = (2, 8),
+) -> Iterator[Recipe]:
+    """Lazily yields ``count`` random recipes, the same ones for a seed.
+
+    Each recipe uses between ``per_recipe[0]`` and ``per_recipe[1]``
+    ingredients drawn from a pool of ``ingredients`` names.
+    """
+    if count < 0:
+        raise ValueError("count cannot be negative")
+    low, high = per_recipe
+    if not 0 < low <= high <= ingredients:
+        raise ValueError("per_recipe must satisfy 0 < low <= high <= ingredients")
+    rng = random.Random(seed)
+    names = ingredient_names(ingredients)
+    for index in range(count):
+        chosen = rng.sample(names, rng.randint(low, high))
+        yield Recipe(
+            f"recipe-{index}",
+            {name: rng.randint(1, 500) for name in chosen},
+            kcal=rng.randint(50, 1200),
+            protein=rng.randint(0, 80),
+            fat=rng.randint(0, 60),
+            carbs=rng.randint(0, 150),
+        )
+
+
+def make_recipes(count: int, seed: int = 0, **options) -> List[Recipe]:
+    """Returns a list of ``count`` random recipes; see ``iter_recipes``."""
+    return list(iter_recipes(count, seed, **options))
+
+
+def sample_meals(recipes: Sequence[Recipe], count: int, seed: int = 0) -> List[Recipe]:
+    """Draws ``count`` meals from ``recipes`` with repetition.
+
+    Large workloads can reference a modest catalog many times instead of
+    building millions of distinct recipes.
+    """
+    if not recipes:
+        raise ValueError("At least one recipe is required")
+    return random.Random(seed).choices(recipes, k=count)
+
+
+def make_mealplan(recipes: Sequence[Recipe], meals: int, seed: int = 0) -> MealPlan:
+    """Builds a plan with ``meals`` meals spread evenly over the week."""
+    plan = MealPlan()
+    days = list(plan.plan)
+    for index, meal in enumerate(sample_meals(recipes, meals, seed)):
+        plan.add_meal(days[index % len(days)], meal)
+    return plan
+
+
+def make_shopping_list(count: int, seed: int = 0) -> ShoppingList:
+    """Returns a shopping list with ``count`` distinct random items."""
+    rng = random.Random(seed)
+    shopping_list = ShoppingList()
+    for name in ingredient_names(count):
+        shopping_list.add_item(name, rng.uniform(1, 1000))
+    return shopping_list
@@ -0,0 +1,426 @@
+import math
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from src.categories import Categorizer, default_categorizer
+from src.mealplan import DAYS, MealHandle, MealPlan, _RecipeWatcher
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+from src.units import QuantityLike, unit_registry
+
+
+def _zero() -> Dict[str, float]:
+    return {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+
+
+def _sum_meals(meals: Sequence[Recipe]) -> Dict[str, float]:
+    # Exact sums, so the totals do not depend on the order meals were added.
+    nutrients = [meal.total_nutrients() for meal in meals]
+    return {key: math.fsum(n.get(key, 0) for n in nutrients) for key in _zero()}
+
+
+# Meals per chunk of a published day; an edit copies one chunk.
+_CHUNK = 64
+
+Chunk = Tuple[Tuple[MealHandle, Recipe], ...]
+
+
+class _PublishedDay:
+    """Meals and totals of one day as seen by readers.
+
+    Meals are kept as ``(handle, recipe)`` pairs in chunks of at most
+    ``_CHUNK`` under stable keys, so an edit copies one chunk and the small
+    chunk directory instead of the whole day. The chunks are never
+    modified; only the cached meal tuple and totals are filled in later,
+    each by replacing a single attribute. Totals are tagged with the day's
+    epoch they were computed in and are only used while it is current.
+    """
+
+    __slots__ = ("chunks", "count", "_meals", "_totals")
+
+    def __init__(
+        self,
+        chunks: Dict[int, Chunk],
+        count: int,
+        totals: Tuple[object, Optional[Dict[str, float]]],
+    ) -> None:
+        self.chunks = chunks
+        self.count = count
+        self._meals: Optional[Tuple[Recipe, ...]] = None
+        self._totals = totals
+
+    @property
+    def meals(self) -> Tuple[Recipe, ...]:
+        meals = self._meals
+        if meals is None:
+            meals = self._meals = tuple(
+                meal for chunk in self.chunks.values() for _, meal in chunk
+            )
+        return meals
+
+    def current_totals(self, epoch: object) -> Dict[str, float]:
+        """Returns the day's totals, recomputing and caching them if stale.
+
+        ``epoch`` must be read before the meals' values, so an edit made
+        while summing leaves the result stale.
+        """
+        cached, totals = self._totals
+        if totals is None or cached is not epoch:
+            totals = _sum_meals(self.meals)
+            self._totals = (epoch, totals)
+        return dict(totals)
+
+    def changed(
+        self, chunks: Dict[int, Chunk], sign: int, epoch: object
+    ) -> "_PublishedDay":
+        """Returns the state after adding (``sign=1``) or removing a meal."""
+        count = self.count + sign
+        # Left for the next reader to sum from scratch.
+        totals = _zero() if count == 0 else None
+        return _PublishedDay(chunks, count, (epoch, totals))
+
+
+def _empty_day(epoch: object) -> _PublishedDay:
+    return _PublishedDay({}, 0, (epoch, _zero()))
+
+
+class ConcurrentMealPlan(MealPlan):
+    """``MealPlan`` that can be shared by threads.
+
+    Writers lock only the day they edit and publish a new immutable state
+    of that day, so edits of different days run in parallel. Adding or
+    removing a meal copies one chunk of the day rather than all of it,
+    and handles map to their chunk, so removal by handle does not scan
+    the day. The whole week is published as a single dict reference, so
+    readers (``weekly_summary``, ``plan``, ``snapshot``) take no lock and
+    always see a consistent week. Planned recipes report nutrient changes
+    through a listener, which replaces the epoch of only the days they are
+    planned on, so their cached totals are recomputed on the next read.
+    Recipes themselves are shared, so modifying a planned recipe while
+    other threads summarize is not protected.
+    """
+
+    def __init__(self) -> None:
+        self._listeners = None
+        self._locks = {day: threading.Lock() for day in DAYS}
+        self._publish_lock = threading.Lock()
+        # handle -> (day, chunk key); chunk keys are only issued under the
+        # day's lock.
+        self._where: Dict[MealHandle, Tuple[str, int]] = {}
+        self._next_chunk = dict.fromkeys(DAYS, 0)
+        # A fresh object per change; replacing it is a single store.
+        self._epochs: Dict[str, object] = {day: object() for day in DAYS}
+        self._week: Dict[str, _PublishedDay] = {
+            day: _empty_day(self._epochs[day]) for day in DAYS
+        }
+        self._watcher = _RecipeWatcher(self)
+        self._watch_lock = threading.Lock()
+        # id(recipe) -> (recipe, {day: times planned on it})
+        self._watched: Dict[int, Tuple[Recipe, Dict[str, int]]] = {}
+
+    def __del__(self) -> None:
+        for recipe, _ in getattr(self, "_watched", {}).values():
+            recipe.unsubscribe(self._watcher)
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {"plan": {day: list(meals) for day, meals in self.plan.items()}}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__init__()
+        for day, meals in state["plan"].items():
+            for meal in meals:
+                self.add_meal(day, meal)
+
+    @property
+    def plan(self) -> Dict[str, Tuple[Recipe, ...]]:
+        """A consistent copy of the week's meals."""
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Tuple[Recipe, ...]]:
+        """Returns the meals of every day as published at one moment."""
+        return {day: state.meals for day, state in self._week.items()}
+
+    def _lock(self, day: str) -> threading.Lock:
+        lock = self._locks.get(day)
+        if lock is None:
+            raise ValueError("Invalid day")
+        return lock
+
+    def _watch(self, day: str, meal: Recipe) -> None:
+        with self._watch_lock:
+            entry = self._watched.get(id(meal))
+            if entry is None:
+                entry = self._watched[id(meal)] = (meal, {})
+                meal.subscribe(self._watcher)
+            entry[1][day] = entry[1].get(day, 0) + 1
+
+    def _unwatch(self, day: str, meal: Recipe) -> None:
+        with self._watch_lock:
+            days = self._watched[id(meal)][1]
+            days[day] -= 1
+            if not days[day]:
+                del days[day]
+                if not days:
+                    del self._watched[id(meal)]
+                    meal.unsubscribe(self._watcher)
+
+    def _recipe_changed(self, recipe: Recipe) -> None:
+        with self._watch_lock:
+            entry = self._watched.get(id(recipe))
+            days = list(entry[1]) if entry is not None else []
+        for day in days:
+            self._epochs[day] = object()
+
+    def _publish(self, day: str, state: _PublishedDay) -> None:
+        # Callers hold the day's lock; this lock only orders whole-week swaps.
+        with self._publish_lock:
+            week = dict(self._week)
+            week[day] = state
+            self._week = week
+
+    def add_meal(self, day: str, meal: Recipe) -> MealHandle:
+        """Adds a meal to a day and returns a handle for removing it."""
+        if not isinstance(meal, Recipe):
+            raise TypeError("meal must be an instance of Recipe")
+        handle = MealHandle()
+        with self._lock(day):
+            self._watch(day, meal)
+            current = self._week[day]
+            chunks = dict(current.chunks)
+            key = next(reversed(chunks), None)
+            if key is None or len(chunks[key]) >= _CHUNK:
+                key = self._next_chunk[day]
+                self._next_chunk[day] = key + 1
+                chunks[key] = ((handle, meal),)
+            else:
+                chunks[key] = chunks[key] + ((handle, meal),)
+            self._where[handle] = (day, key)
+            self._publish(day, current.changed(chunks, 1, self._epochs[day]))
+            self._notify("add", (day, meal))
+        return handle
+
+    def remove_meal(self, day: str, meal: Recipe) -> None:
+        """Removes a meal from a specific day."""
+        with self._lock(day):
+            chunks = self._week[day].chunks
+            # The same recipe object is looked for before comparing recipes.
+            for matches in (
+                lambda planned: planned is meal,
+                lambda planned: planned == meal,
+            ):
+                for key, chunk in chunks.items():
+                    for handle, planned in chunk:
+                        if matches(planned):
+                            self._remove(day, key, handle)
+                            return
+            raise ValueError("Meal not found on the specified day")
+
+    def remove_meal_by_handle(self, handle: MealHandle) -> Recipe:
+        """Removes the meal a handle refers to and returns its recipe."""
+        where = self._where.get(handle)
+        if where is None:
+            raise ValueError("Meal handle not found in the plan")
+        day, key = where
+        with self._lock(day):
+            if handle not in self._where:
+                # Another thread removed it first.
+                raise ValueError("Meal handle not found in the plan")
+            return self._remove(day, key, handle)
+
+    def _remove(self, day: str, key: int, handle: MealHandle) -> Recipe:
+        epoch = self._epochs[day]
+        current = self._week[day]
+        chunks = dict(current.chunks)
+        chunk = chunks[key]
+        index = next(i for i, (planned, _) in enumerate(chunk) if planned is handle)
+        meal = chunk[index][1]
+        remaining = chunk[:index] + chunk[index + 1 :]
+        if remaining:
+            chunks[key] = remaining
+        else:
+            del chunks[key]
+        del self._where[handle]
+        self._publish(day, current.changed(chunks, -1, epoch))
+        self._unwatch(day, meal)
+        self._notify("remove", (day, meal))
+        return meal
+
+    def clear_day(self, day: str) -> None:
+        """Clears all meals from a specific day."""
+        with self._lock(day):
+            current = self._week[day]
+            self._publish(day, _empty_day(self._epochs[day]))
+            for chunk in current.chunks.values():
+                for handle, meal in chunk:
+                    del self._where[handle]
+                    self._unwatch(day, meal)
+            self._notify("clear", (day, list(current.meals)))
+
+    def daily_summary(self, day: str) -> Dict[str, int]:
+        epoch = self._epochs.get(day)
+        if epoch is None:
+            raise ValueError("Invalid day")
+        return self._week[day].current_totals(epoch)
+
+    def get_meals(self, day: str) -> Sequence[Recipe]:
+        """Returns all meals for a given day."""
+        state = self._week.get(day)
+        return state.meals if state is not None else ()
+
+    def weekly_summary(self) -> Dict[str, Dict[str, int]]:
+        """Returns a summary of nutrients for the entire week."""
+        epochs = dict(self._epochs)
+        return {
+            day: state.current_totals(epochs[day])
+            for day, state in self._week.items()
+        }
+
+
+class ConcurrentShoppingList(ShoppingList):
+    """``ShoppingList`` that can be shared by threads.
+
+    Updates of single ingredients lock one of ``stripes`` locks chosen by
+    the ingredient's hash, so writers of different ingredients rarely
+    contend. Operations touching every item (``scale_quantities``,
+    ``merge_in_place``, ``clear``, ``import_list``) take all stripes and
+    swap in a new dict, so they become visible at once. Readers copy the
+    current dict without locking and never see a half-applied update.
+    """
+
+    def __init__(self, stripes: int = 16) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+        super().__init__()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._tracking_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = super().__getstate__()
+        state["items"] = defaultdict(float, self.snapshot())
+        state["_stripes"] = len(self._stripes)
+        del state["_tracking_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        stripes = state.pop("_stripes")
+        super().__setstate__(state)
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._tracking_lock = threading.Lock()
+
+    def _stripe(self, ingredient: str) -> threading.Lock:
+        return self._stripes[hash(ingredient) % len(self._stripes)]
+
+    @contextmanager
+    def _all_stripes(self) -> Iterator[None]:
+        # Always acquired in the same order, so bulk operations cannot deadlock.
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns a consistent copy of the items without locking."""
+        return dict(self.items)
+
+    def _copy(self) -> "ConcurrentShoppingList":
+        return ConcurrentShoppingList(len(self._stripes))
+
+    def add_item(self, ingredient: str, quantity: QuantityLike) -> None:
+        """Adds a specified quantity of an ingredient to the shopping list."""
+        with self._stripe(ingredient):
+            super().add_item(ingredient, quantity)
+
+    def update_item_quantity(self, ingredient: str, quantity: QuantityLike) -> None:
+        """Updates the quantity of a specific ingredient."""
+        with self._stripe(ingredient):
+            super().update_item_quantity(ingredient, quantity)
+
+    def remove_item(self, ingredient: str) -> None:
+        """Removes an ingredient from the shopping list."""
+        with self._stripe(ingredient):
+            self._contributed.pop(ingredient, None)
+            self.items.pop(ingredient, None)
+
+    def _apply(self, ingredient: str, delta: float) -> None:
+        with self._stripe(ingredient):
+            super()._apply(ingredient, delta)
+
+    def _on_plan_change(self, mealplan: MealPlan, change: str, detail: object) -> None:
+        with self._tracking_lock:
+            super()._on_plan_change(mealplan, change, detail)
+
+    def _on_recipe_change(self, recipe: Recipe, change: str, detail: object) -> None:
+        with self._tracking_lock:
+            super()._on_recipe_change(recipe, change, detail)
+
+    def clear(self) -> None:
+        """Clears all items from the shopping list."""
+        with self._all_stripes():
+            self._contributed = {}
+            self.items = defaultdict(float)
+
+    def import_list(self, data: Dict[str, float]) -> None:
+        """Imports a shopping list from a dictionary."""
+        with self._all_stripes():
+            for ingredient in data:
+                unit_registry.mark_stored(ingredient)
+            self._contributed = {}
+            self.items = defaultdict(float, data)
+
+    def scale_quantities(self, factor: float) -> None:
+        """Scales the quantities of all ingredients in the shopping list by a factor."""
+        if factor < 0:
+            raise ValueError("Scale factor must be non-negative.")
+        with self._all_stripes():
+            self.items = defaultdict(
+                float,
+                {name: quantity * factor for name, quantity in self.items.items()},
+            )
+
+    def merge_in_place(self, other: ShoppingList) -> "ConcurrentShoppingList":
+        """Adds another shopping list's items to this one and returns self."""
+        additions = _items_of(other)
+        with self._all_stripes():
+            items = defaultdict(float, self.items)
+            for ingredient, quantity in additions.items():
+                if quantity > 0:
+                    items[ingredient] += quantity
+            self.items = items
+        return self
+
+    def merge(self, other: ShoppingList) -> "ConcurrentShoppingList":
+        """Merges another shopping list into the current one."""
+        merged = self._copy()
+        merged.items.update(self.snapshot())
+        for ingredient, quantity in _items_of(other).items():
+            merged.add_item(ingredient, quantity)
+        return merged
+
+    def filter_by_threshold(self, threshold: float) -> "ConcurrentShoppingList":
+        """Returns a new list with the items whose quantity reaches a threshold."""
+        filtered = self._copy()
+        for ingredient, quantity in self.snapshot().items():
+            if quantity >= threshold:
+                filtered.add_item(ingredient, quantity)
+        return filtered
+
+    def get_total_quantity(self) -> float:
+        """Returns the total quantity of all items in the shopping list."""
+        return sum(self.snapshot().values())
+
+    def get_categorized_items(
+        self, categorizer: Optional[Categorizer] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Returns the shopping list categorized by ingredients' category."""
+        return (categorizer or default_categorizer).group(self.snapshot())
+
+
+def _items_of(shopping_list: ShoppingList) -> Dict[str, float]:
+    if isinstance(shopping_list, ConcurrentShoppingList):
+        return shopping_list.snapshot()
+    return dict(shopping_list.items)
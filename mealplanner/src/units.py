@@ -0,0 +1,249 @@
+import re
+from numbers import Real
+from typing import Dict, Hashable, NamedTuple, Set, Tuple, Union
+from src.ingredients import ingredient_registry
+
+# Every unit maps to its canonical unit (g, ml or pcs) and a factor.
+_UNITS: Dict[str, Tuple[str, float]] = {
+    "g": ("g", 1.0),
+    "mg": ("g", 0.001),
+    "kg": ("g", 1000.0),
+    "oz": ("g", 28.349523125),
+    "lb": ("g", 453.59237),
+    "ml": ("ml", 1.0),
+    "cl": ("ml", 10.0),
+    "dl": ("ml", 100.0),
+    "l": ("ml", 1000.0),
+    "tsp": ("ml", 4.92892159375),
+    "tbsp": ("ml", 14.78676478125),
+    "cup": ("ml", 236.5882365),
+    "fl oz": ("ml", 29.5735295625),
+    "pcs": ("pcs", 1.0),
+    "dozen": ("pcs", 12.0),
+}
+
+_ALIASES = {
+    "gram": "g",
+    "grams": "g",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "ounce": "oz",
+    "ounces": "oz",
+    "pound": "lb",
+    "pounds": "lb",
+    "lbs": "lb",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "millilitre": "ml",
+    "millilitres": "ml",
+    "liter": "l",
+    "liters": "l",
+    "litre": "l",
+    "litres": "l",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "cups": "cup",
+    "pc": "pcs",
+    "piece": "pcs",
+    "pieces": "pcs",
+}
+
+# Factors between any two units of the same dimension, computed once.
+_CONVERSIONS: Dict[Tuple[str, str], float] = {
+    (source, target): source_factor / target_factor
+    for source, (source_base, source_factor) in _UNITS.items()
+    for target, (target_base, target_factor) in _UNITS.items()
+    if source_base == target_base
+}
+
+# Densities in g/ml used to convert between volume and mass.
+_DEFAULT_DENSITIES = {
+    "water": 1.0,
+    "milk": 1.03,
+    "cream": 1.01,
+    "oil": 0.92,
+    "olive oil": 0.92,
+    "butter": 0.91,
+    "honey": 1.42,
+    "flour": 0.53,
+    "sugar": 0.85,
+    "salt": 1.2,
+    "rice": 0.85,
+    "stock": 1.0,
+    "broth": 1.0,
+}
+
+# Ingredients measured in a base unit other than grams unless declared.
+_DEFAULT_UNITS = {
+    "water": "ml",
+    "milk": "ml",
+    "cream": "ml",
+    "oil": "ml",
+    "olive oil": "ml",
+    "stock": "ml",
+    "broth": "ml",
+    "egg": "pcs",
+    "eggs": "pcs",
+}
+
+# Weights in g of one piece, used to convert counts to mass or volume.
+_DEFAULT_PIECE_WEIGHTS = {
+    "egg": 50.0,
+    "eggs": 50.0,
+}
+
+# Plain numbers of these exact types skip parsing and the ``Real`` ABC check.
+_PLAIN = (int, float)
+
+_QUANTITY = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$")
+
+
+class Quantity(NamedTuple):
+    amount: float
+    unit: str
+
+
+QuantityLike = Union[Real, Quantity, Tuple[float, str], str]
+
+
+def unit_name(unit: str) -> str:
+    """Returns the standard name of a unit or alias, e.g. ``"kg"``."""
+    key = unit.strip().lower() if isinstance(unit, str) else unit
+    key = _ALIASES.get(key, key)
+    if key not in _UNITS:
+        raise ValueError(f"Unknown unit: {unit}")
+    return key
+
+
+def parse_quantity(value: QuantityLike) -> Union[Real, Quantity]:
+    """Splits a quantity such as ``"1.5 kg"`` or ``(2, "tbsp")``.
+
+    Plain numbers, and strings without a unit, are returned as numbers.
+    """
+    if isinstance(value, Real):
+        return value
+    if isinstance(value, str):
+        match = _QUANTITY.match(value)
+        if match is None:
+            raise ValueError(f"Invalid quantity: {value!r}")
+        amount, unit = float(match.group(1)), match.group(2)
+        return Quantity(amount, unit_name(unit)) if unit else amount
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        amount, unit = value
+        if not isinstance(amount, Real):
+            raise TypeError(f"Invalid quantity amount: {amount!r}")
+        return Quantity(amount, unit_name(unit))
+    raise TypeError(f"Invalid quantity: {value!r}")
+
+
+class UnitRegistry:
+    """Canonical units, densities and piece weights of ingredients.
+
+    Every ingredient has one fixed canonical unit (g, ml or pcs): the one
+    declared with ``set_unit``, a built-in default such as ml for milk or
+    pcs for eggs, and grams otherwise. It never depends on the quantities
+    seen so far, so plain numbers, which are taken to be in the canonical
+    unit, mean the same regardless of the order recipes are loaded in.
+    Quantities with a unit are converted to it once, when they enter a
+    recipe or shopping list, through densities and piece weights where
+    the dimensions differ.
+    """
+
+    def __init__(self) -> None:
+        self._units: Dict[Hashable, str] = dict(_DEFAULT_UNITS)
+        self._densities: Dict[Hashable, float] = dict(_DEFAULT_DENSITIES)
+        self._piece_weights: Dict[Hashable, float] = dict(_DEFAULT_PIECE_WEIGHTS)
+        self._stored: Set[Hashable] = set()
+
+    def unit_of(self, ingredient: Hashable) -> str:
+        """Returns the canonical unit of an ingredient."""
+        return self._units.get(ingredient, "g")
+
+    def set_unit(self, ingredient: Hashable, unit: str) -> None:
+        """Declares the canonical unit of an ingredient as a base unit.
+
+        The unit cannot change once quantities of the ingredient are stored,
+        since they would change their meaning: recipe ingredients are
+        interned in ``ingredient_registry``, other stores call ``mark_stored``.
+        """
+        unit = _UNITS[unit_name(unit)][0]
+        if unit != self.unit_of(ingredient) and (
+            ingredient in self._stored or ingredient in ingredient_registry
+        ):
+            raise ValueError(
+                f"'{ingredient}' is already measured in {self.unit_of(ingredient)}"
+            )
+        self._units[ingredient] = unit
+
+    def mark_stored(self, ingredient: Hashable) -> None:
+        """Fixes the unit of an ingredient kept outside any recipe."""
+        self._stored.add(ingredient)
+
+    def density(self, ingredient: Hashable) -> float:
+        """Returns an ingredient's density in g/ml, if known."""
+        try:
+            return self._densities[ingredient]
+        except KeyError:
+            raise ValueError(f"No density known for '{ingredient}'")
+
+    def set_density(self, ingredient: Hashable, grams_per_ml: float) -> None:
+        if grams_per_ml <= 0:
+            raise ValueError("Density must be positive")
+        self._densities[ingredient] = grams_per_ml
+
+    def piece_weight(self, ingredient: Hashable) -> float:
+        """Returns the weight in g of one piece of an ingredient, if known."""
+        try:
+            return self._piece_weights[ingredient]
+        except KeyError:
+            raise ValueError(f"No piece weight known for '{ingredient}'")
+
+    def set_piece_weight(self, ingredient: Hashable, grams: float) -> None:
+        if grams <= 0:
+            raise ValueError("Piece weight must be positive")
+        self._piece_weights[ingredient] = grams
+
+    def _grams_per_base(self, ingredient: Hashable, base: str) -> float:
+        if base == "g":
+            return 1.0
+        if base == "ml":
+            return self.density(ingredient)
+        return self.piece_weight(ingredient)
+
+    def factor(self, ingredient: Hashable, source: str, target: str) -> float:
+        """Returns the factor converting ``source`` units to ``target`` units."""
+        source, target = unit_name(source), unit_name(target)
+        factor = _CONVERSIONS.get((source, target))
+        if factor is not None:
+            return factor
+        source_base, source_factor = _UNITS[source]
+        target_base, target_factor = _UNITS[target]
+        # Different dimensions are converted through grams.
+        grams = source_factor * self._grams_per_base(ingredient, source_base)
+        return grams / self._grams_per_base(ingredient, target_base) / target_factor
+
+    def convert(
+        self, ingredient: Hashable, amount: float, source: str, target: str
+    ) -> float:
+        return amount * self.factor(ingredient, source, target)
+
+    def to_canonical(self, ingredient: Hashable, quantity: QuantityLike) -> float:
+        """Converts a quantity to the ingredient's canonical unit."""
+        if type(quantity) in _PLAIN:
+            return quantity
+        parsed = parse_quantity(quantity)
+        if not isinstance(parsed, Quantity):
+            return parsed
+        return parsed.amount * self.factor(
+            ingredient, parsed.unit, self.unit_of(ingredient)
+        )
+
+    def format(self, ingredient: Hashable, quantity: float) -> str:
+        """Formats a canonical quantity with its unit, e.g. ``"200g"``."""
+        unit = self.unit_of(ingredient)
+        return f"{quantity} {unit}" if unit == "pcs" else f"{quantity}{unit}"
+
+
+unit_registry = UnitRegistry()
@@ -0,0 +1,213 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from src.mealplan import DAYS, MealPlan
+from src.recipe import Recipe
+from src.snapshot import RecipeSnapshot, snapshot
+
+_DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+
+Meals = Tuple[RecipeSnapshot, ...]
+
+
+def _day_index(day: str) -> int:
+    index = _DAY_INDEX.get(day)
+    if index is None:
+        raise ValueError("Invalid day")
+    return index
+
+
+def _frozen(meal: Union[Recipe, RecipeSnapshot]) -> RecipeSnapshot:
+    if isinstance(meal, RecipeSnapshot):
+        return meal
+    if isinstance(meal, Recipe):
+        return snapshot(meal)
+    raise TypeError("meal must be a Recipe or RecipeSnapshot")
+
+
+class PlanVersion:
+    """Immutable state of a weekly meal plan.
+
+    Every day is a tuple of interned ``RecipeSnapshot`` objects. Versions
+    derived from one another share the tuples of all days that were not
+    edited, and equal recipes are stored once across all versions.
+    """
+
+    __slots__ = ("_days",)
+
+    def __init__(self, days: Tuple[Meals, ...] = ((),) * len(DAYS)) -> None:
+        if len(days) != len(DAYS):
+            raise ValueError(f"A plan version needs {len(DAYS)} days")
+        object.__setattr__(self, "_days", tuple(days))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("PlanVersion is immutable")
+
+    @classmethod
+    def from_mealplan(cls, plan: MealPlan) -> "PlanVersion":
+        """Captures the current content of a ``MealPlan``."""
+        return cls(tuple(tuple(map(snapshot, plan.plan[day])) for day in DAYS))
+
+    def to_mealplan(self) -> MealPlan:
+        """Returns a new ``MealPlan`` holding fresh copies of the recipes."""
+        plan = MealPlan()
+        for day, meals in zip(DAYS, self._days):
+            for meal in meals:
+                plan.add_meal(day, meal.to_recipe())
+        return plan
+
+    def get_meals(self, day: str) -> Meals:
+        """Returns the meals of a day."""
+        return self._days[_day_index(day)]
+
+    def with_meals(self, day: str, meals: Meals) -> "PlanVersion":
+        """Returns a version with one day replaced; other days are shared."""
+        days = list(self._days)
+        days[_day_index(day)] = tuple(map(_frozen, meals))
+        return PlanVersion(tuple(days))
+
+    def daily_summary(self, day: str) -> Dict[str, float]:
+        totals = {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+        for meal in self.get_meals(day):
+            totals["kcal"] += meal.kcal
+            totals["protein"] += meal.protein
+            totals["fat"] += meal.fat
+            totals["carbs"] += meal.carbs
+        return totals
+
+    def weekly_summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns a summary of nutrients for the entire week."""
+        return {day: self.daily_summary(day) for day in DAYS}
+
+    def diff(self, other: "PlanVersion") -> Dict[str, Tuple[Meals, Meals]]:
+        """Returns ``{day: (added, removed)}`` for days that differ in ``other``.
+
+        Days whose tuples are shared are skipped without comparing meals,
+        so diffing closely related versions costs only the edited days.
+        Meal order within a day is ignored.
+        """
+        changes = {}
+        for day, old, new in zip(DAYS, self._days, other._days):
+            if old is new:
+                continue
+            remaining: Dict[RecipeSnapshot, int] = {}
+            for meal in old:
+                remaining[meal] = remaining.get(meal, 0) + 1
+            added = []
+            for meal in new:
+                if remaining.get(meal, 0) > 0:
+                    remaining[meal] -= 1
+                else:
+                    added.append(meal)
+            removed = [
+                meal for meal, count in remaining.items() for _ in range(count)
+            ]
+            if added or removed:
+                changes[day] = (tuple(added), tuple(removed))
+        return changes
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlanVersion):
+            return NotImplemented
+        return self._days == other._days
+
+    def __hash__(self) -> int:
+        return hash(self._days)
+
+    def __repr__(self) -> str:
+        meals = sum(len(day) for day in self._days)
+        return f"PlanVersion({meals} meals)"
+
+
+class VersionedMealPlan:
+    """Weekly meal plan with constant-time snapshots and bounded undo.
+
+    Edits never modify a ``PlanVersion``: they build a new one that copies
+    only the edited day's tuple, so ``snapshot`` just returns the current
+    version. Recipes are stored as interned snapshots, so later changes
+    to a ``Recipe`` object do not leak into earlier versions. At most
+    ``history`` versions are kept for ``undo``.
+    """
+
+    def __init__(
+        self, version: Optional[PlanVersion] = None, history: int = 50
+    ) -> None:
+        if history <= 0:
+            raise ValueError("history must be positive")
+        self.current = version if version is not None else PlanVersion()
+        self._undo: Deque[PlanVersion] = deque(maxlen=history)
+        self._redo: List[PlanVersion] = []
+
+    @classmethod
+    def from_mealplan(cls, plan: MealPlan, history: int = 50) -> "VersionedMealPlan":
+        """Starts a versioned plan from the content of a ``MealPlan``."""
+        return cls(PlanVersion.from_mealplan(plan), history)
+
+    def snapshot(self) -> PlanVersion:
+        """Returns the current version in constant time."""
+        return self.current
+
+    def _commit(self, version: PlanVersion) -> None:
+        self._undo.append(self.current)
+        self._redo.clear()
+        self.current = version
+
+    def add_meal(self, day: str, meal: Union[Recipe, RecipeSnapshot]) -> None:
+        """Adds a meal to a day."""
+        meals = self.current.get_meals(day)
+        self._commit(self.current.with_meals(day, meals + (_frozen(meal),)))
+
+    def remove_meal(self, day: str, meal: Union[Recipe, RecipeSnapshot]) -> None:
+        """Removes one occurrence of a meal from a day."""
+        meals = self.current.get_meals(day)
+        frozen = _frozen(meal)
+        for index, planned in enumerate(meals):
+            if planned is frozen or planned == frozen:
+                break
+        else:
+            raise ValueError("Meal not found on the specified day")
+        remaining = meals[:index] + meals[index + 1 :]
+        self._commit(self.current.with_meals(day, remaining))
+
+    def clear_day(self, day: str) -> None:
+        """Clears all meals from a day."""
+        self._commit(self.current.with_meals(day, ()))
+
+    def restore(self, version: PlanVersion) -> None:
+        """Makes an earlier snapshot current; this can itself be undone."""
+        if not isinstance(version, PlanVersion):
+            raise TypeError("version must be a PlanVersion")
+        self._commit(version)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> PlanVersion:
+        """Goes back to the previous version and returns it."""
+        if not self._undo:
+            raise ValueError("Nothing to undo")
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self) -> PlanVersion:
+        """Reapplies the last undone edit and returns the new version."""
+        if not self._redo:
+            raise ValueError("Nothing to redo")
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
+
+    def get_meals(self, day: str) -> Meals:
+        """Returns the meals of a day in the current version."""
+        return self.current.get_meals(day)
+
+    def daily_summary(self, day: str) -> Dict[str, float]:
+        return self.current.daily_summary(day)
+
+    def weekly_summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns a summary of nutrients for the entire week."""
+        return self.current.weekly_summary()
@@ -0,0 +1,92 @@
+import random
+import numpy as np
+import pytest
+from src.aggregation import RecipeMatrix, aggregate_shopping_list
+from src.ingredients import ingredient_registry
+from src.recipe import Recipe
+from src.shoppinglist import generate_shopping_list
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Pasta", {"pasta": 100, "tomato_sauce": 50, "cheese": 20}, 450, 15, 10, 60),
+        Recipe("Salad", {"lettuce": 100, "tomato": 2, "cucumber": 1}, 120, 3, 2, 15),
+        Recipe("Omelette", {"eggs": 3, "cheese": 30, "pepper": 1}, 320, 22, 18, 4),
+        Recipe("Water", {"water": 0}, 0, 0, 0, 0),
+    ]
+
+#############################################
+# Testy macierzy RecipeMatrix #
+#############################################
+
+def test_matrix_layout(recipes):
+    """Test the CSR arrays built from recipes"""
+    matrix = RecipeMatrix(recipes)
+    assert len(matrix) == 4
+    assert matrix.indptr.tolist() == [0, 3, 6, 9, 10]
+    assert matrix.indices[:3].tolist() == list(recipes[0].ingredients.ids)
+    assert matrix.data[:3].tolist() == [100, 50, 20]
+    assert matrix.shape == (4, len(ingredient_registry))
+
+def test_matrix_totals_vector(recipes):
+    """Test the dense ingredient totals vector"""
+    totals = RecipeMatrix(recipes).totals([1, 0, 2, 1])
+    cheese = ingredient_registry.lookup("cheese")
+    lettuce = ingredient_registry.lookup("lettuce")
+    assert totals[cheese] == 20 + 2 * 30
+    assert totals[lettuce] == 0
+
+def test_matrix_matches_generate_shopping_list(recipes):
+    """Test that unweighted aggregation matches the reference loop"""
+    assert RecipeMatrix(recipes).to_shopping_list() == generate_shopping_list(recipes)
+
+def test_matrix_multipliers(recipes):
+    """Test per-recipe multipliers, including skipped recipes"""
+    result = RecipeMatrix(recipes).to_shopping_list([2, 0, 0.5, 1])
+    assert result == {
+        "pasta": 200, "tomato_sauce": 100, "cheese": 55,
+        "eggs": 1.5, "pepper": 0.5, "water": 0,
+    }
+
+@pytest.mark.parametrize("multipliers", [[1, 1], [1, -1, 1, 1], [1, float("nan"), 1, 1]])
+def test_matrix_invalid_multipliers(recipes, multipliers):
+    """Test rejection of malformed multipliers"""
+    with pytest.raises(ValueError):
+        RecipeMatrix(recipes).totals(multipliers)
+
+def test_matrix_empty():
+    """Test an empty matrix"""
+    matrix = RecipeMatrix([])
+    assert matrix.to_shopping_list() == {}
+    assert not np.any(matrix.totals())
+
+#############################################
+# Testy aggregate_shopping_list #
+#############################################
+
+def test_aggregate_collapses_repeated_recipes(recipes):
+    """Test that repeated instances give the same result as the loop"""
+    rng = random.Random(7)
+    order = [rng.choice(recipes) for _ in range(2000)]
+    expected = generate_shopping_list(order)
+    result = aggregate_shopping_list(order)
+    assert result.keys() == expected.keys()
+    for ingredient, quantity in expected.items():
+        assert result[ingredient] == pytest.approx(quantity)
+
+def test_aggregate_with_multipliers(recipes):
+    """Test weighted aggregation of repeated recipe instances"""
+    order = [recipes[0], recipes[0], recipes[2]]
+    assert aggregate_shopping_list(order, [1, 3, 2]) == {
+        "pasta": 400, "tomato_sauce": 200, "cheese": 140, "eggs": 6, "pepper": 2,
+    }
+    with pytest.raises(ValueError):
+        aggregate_shopping_list(order, [1, 2])
+
+def test_aggregate_empty():
+    """Test aggregation of an empty order"""
+    assert aggregate_shopping_list([]) == {}
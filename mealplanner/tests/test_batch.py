@@ -0,0 +1,122 @@
+import math
+import numpy as np
+import pytest
+from src.batch import RecipeBatch, RecipeValidationError
+from src.ingredients import ingredient_registry
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def ids():
+    return [ingredient_registry.intern(name) for name in ("flour", "milk", "eggs")]
+
+#############################################
+# Testy budowania przepisów z tablic #
+#############################################
+
+def test_batch_builds_equivalent_recipes(ids):
+    """Test that batch recipes equal recipes built one by one"""
+    flour, milk, eggs = ids
+    batch = RecipeBatch.from_arrays(
+        ["Pancakes", "Omelette"],
+        kcal=[800, 300], protein=[30, 20], fat=[20, 22], carbs=[100, 2],
+        indptr=[0, 3, 4], ingredient_ids=[flour, milk, eggs, eggs], quantities=[250, 500, 2, 3],
+    )
+    expected = [
+        Recipe("Pancakes", {"flour": 250, "milk": 500, "eggs": 2}, 800, 30, 20, 100),
+        Recipe("Omelette", {"eggs": 3}, 300, 20, 22, 2),
+    ]
+    assert len(batch) == 2
+    assert batch.recipes() == expected
+    assert batch.recipe(1) == expected[1]
+    with pytest.raises(IndexError):
+        batch.recipe(2)
+
+def test_batch_recipes_are_ordinary_recipes(ids):
+    """Test that batch recipes support mutation and notifications"""
+    recipe = RecipeBatch(["Soup"], [[100, 1, 1, 1]], [0, 1], [ids[1]], [200]).recipe(0)
+    changes = []
+    recipe.subscribe(lambda *args: changes.append(args[1]))
+    recipe.add_ingredient("salt", 1)
+    recipe.scale_recipe(2)
+    assert recipe.version == 2 and changes == ["ingredient", "scale"]
+    assert dict(recipe.ingredients) == {"milk": 400, "salt": 2}
+
+def test_empty_batch():
+    """Test a batch without recipes"""
+    batch = RecipeBatch.from_arrays([], [], [], [], [], [0], [], [])
+    assert batch.recipes() == []
+
+#############################################
+# Testy walidacji wsadowej #
+#############################################
+
+def test_every_invalid_row_is_reported(ids):
+    """Test that validation collects all bad rows at once"""
+    flour, milk, _ = ids
+    with pytest.raises(RecipeValidationError) as error:
+        RecipeBatch.from_arrays(
+            ["Good", "", "Negative", "Nan", "Bad ingredients", "Also good"],
+            kcal=[1, 1, -5, math.nan, 1, 1], protein=[1] * 6, fat=[1] * 6, carbs=[1] * 6,
+            indptr=[0, 1, 2, 3, 4, 7, 8],
+            ingredient_ids=[flour, flour, flour, flour, milk, milk, 10**9, flour],
+            quantities=[1, 1, 1, math.nan, -1, 2, 1, 1],
+        )
+    assert isinstance(error.value, ValueError)
+    assert error.value.errors == {
+        1: ["empty name"],
+        2: ["negative nutrient"],
+        3: ["NaN nutrient", "NaN quantity"],
+        4: ["negative quantity", "unknown ingredient", "repeated ingredient"],
+    }
+    assert "4 invalid recipes" in str(error.value)
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (["A"], [[1, 1, 1]], [0, 0], [], []),
+        (["A"], [[1, 1, 1, 1]], [0], [], []),
+        (["A"], [[1, 1, 1, 1]], [0, 1], [0], []),
+        (["A", "B"], [[1, 1, 1, 1]] * 2, [0, 2, 1], [0], [1]),
+    ],
+)
+def test_malformed_arrays(args):
+    """Test rejection of inconsistent array shapes"""
+    with pytest.raises(ValueError):
+        RecipeBatch(*args)
+
+def test_float_ingredient_ids_are_rejected(ids):
+    """Test that ingredient ids must have an integer dtype"""
+    with pytest.raises(TypeError):
+        RecipeBatch(["A"], [[1, 1, 1, 1]], [0, 1], [ids[0] + 0.5], [1.0])
+    batch = RecipeBatch(["A"], [[1, 1, 1, 1]], [0, 1], np.array([ids[0]], dtype=np.int64), [1.0])
+    assert batch.recipe(0).ingredients == {"flour": 1.0}
+
+def test_wide_ingredient_ids_are_not_wrapped(ids):
+    """Test that ids beyond the intc range are reported instead of narrowed"""
+    flour = ids[0]
+    wide = np.array([flour, 2**32 + flour, -(2**32) + flour], dtype=np.int64)
+    with pytest.raises(RecipeValidationError) as error:
+        RecipeBatch(["A", "B", "C"], [[1, 1, 1, 1]] * 3, [0, 1, 2, 3], wide, [1.0] * 3)
+    assert error.value.errors == {1: ["unknown ingredient"], 2: ["unknown ingredient"]}
+
+def test_large_batch(ids):
+    """Test validating and building 100k recipes"""
+    count = 100_000
+    rng = np.random.default_rng(0)
+    per_recipe = 3
+    quantities = rng.uniform(0, 100, count * per_recipe)
+    batch = RecipeBatch(
+        [f"R{i}" for i in range(count)],
+        rng.uniform(0, 100, (count, 4)),
+        np.arange(0, count * per_recipe + 1, per_recipe),
+        np.tile(np.array(ids), count),
+        quantities,
+    )
+    recipes = batch.recipes()
+    assert len(recipes) == count and recipes[-1].name == f"R{count - 1}"
+    assert list(recipes[-1].ingredients) == ["flour", "milk", "eggs"]
+    assert list(recipes[-1].ingredients.values()) == quantities[-3:].tolist()
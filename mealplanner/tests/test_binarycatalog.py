@@ -0,0 +1,102 @@
+import struct
+import pytest
+from src.binarycatalog import MappedCatalog, write_catalog
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Pasta", {"pasta": 100, "tomato_sauce": 50, "cheese": 20}, 450, 15, 10, 60),
+        Recipe("Sałatka", {"sałata": 100, "tomato": 2.5}, 120, 3, 2, 15),
+        Recipe("Omelette", {"eggs": 3, "cheese": 30}, 320, 22, 18, 4),
+        Recipe("Empty", {}, 0, 0, 0, 0),
+        Recipe("Pasta", {"pasta": 120}, 400, 12, 4, 70),
+    ]
+
+@pytest.fixture
+def catalog_path(tmp_path, recipes):
+    path = str(tmp_path / "catalog.bin")
+    assert write_catalog(path, recipes) == 5
+    return path
+
+#############################################
+# Testy zapisu i odczytu #
+#############################################
+
+def test_round_trip(catalog_path, recipes):
+    """Test that every recipe is materialized unchanged"""
+    with MappedCatalog(catalog_path) as catalog:
+        assert len(catalog) == 5
+        for index, recipe in enumerate(recipes):
+            assert catalog.recipe(index) == recipe
+            assert catalog[index].name == recipe.name
+        assert catalog.ingredients(1) == {"sałata": 100, "tomato": 2.5}
+        assert catalog.nutrients(2) == {"kcal": 320, "protein": 22, "fat": 18, "carbs": 4}
+
+def test_nutrient_columns_are_mapped(catalog_path):
+    """Test zero-copy, read-only nutrient columns"""
+    with MappedCatalog(catalog_path) as catalog:
+        columns = catalog.nutrient_columns
+        assert columns.shape == (5, 4)
+        assert columns[:, 0].tolist() == [450, 120, 320, 0, 400]
+        assert not columns.flags.writeable
+        assert not columns.flags.owndata
+        del columns
+
+def test_search(catalog_path):
+    """Test lookups by recipe name and by ingredient"""
+    with MappedCatalog(catalog_path) as catalog:
+        assert catalog.find_by_name("Pasta") == [0, 4]
+        assert catalog.find_by_name("Pizza") == []
+        assert catalog.find_by_ingredient("cheese") == [0, 2]
+        assert catalog.find_by_ingredient("pasta") == [0, 4]
+        assert catalog.find_by_ingredient("saffron") == []
+
+def test_index_out_of_range(catalog_path):
+    """Test access beyond the catalog"""
+    with MappedCatalog(catalog_path) as catalog:
+        with pytest.raises(IndexError):
+            catalog.recipe(5)
+        with pytest.raises(IndexError):
+            catalog.name(-1)
+
+def test_sections_are_aligned(catalog_path):
+    """Test that every section starts on an 8-byte boundary"""
+    with open(catalog_path, "rb") as file:
+        header = file.read(88)
+    offsets = struct.unpack("<8s3Q7Q", header)[4:]
+    assert all(offset % 8 == 0 for offset in offsets)
+
+def test_empty_catalog(tmp_path):
+    """Test writing and opening a catalog without recipes"""
+    path = str(tmp_path / "empty.bin")
+    assert write_catalog(path, []) == 0
+    with MappedCatalog(path) as catalog:
+        assert len(catalog) == 0
+        assert catalog.find_by_ingredient("x") == []
+
+def test_invalid_files(tmp_path):
+    """Test rejection of files that are not catalogs"""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(ValueError):
+        MappedCatalog(str(path))
+    path.write_bytes(b"short")
+    with pytest.raises(ValueError):
+        MappedCatalog(str(path))
+
+def test_non_string_names(tmp_path):
+    """Test that only string names can be stored"""
+    with pytest.raises(TypeError):
+        write_catalog(str(tmp_path / "bad.bin"), [Recipe("A", {1: 2}, 1, 1, 1, 1)])
+
+def test_close_with_outstanding_views(catalog_path):
+    """Test that closing tolerates views still held by the caller"""
+    catalog = MappedCatalog(catalog_path)
+    columns = catalog.nutrient_columns
+    catalog.close()
+    assert columns[0, 0] == 450
@@ -0,0 +1,152 @@
+import gc
+import pickle
+import random
+from datetime import date, datetime, timedelta
+import pytest
+from src.calendarplan import CalendarPlan
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def plan():
+    return CalendarPlan(date(2024, 1, 1), date(2025, 12, 31))
+
+@pytest.fixture
+def recipes():
+    return [Recipe(f"R{i}", {"x": 1}, 100 * (i + 1), i, 2 * i, 3 * i) for i in range(5)]
+
+def brute_force(plan, first, last):
+    totals = {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+    day = first
+    while day <= last:
+        for meal in plan.get_meals(day):
+            for key, value in meal.total_nutrients().items():
+                totals[key] += value
+        day += timedelta(days=1)
+    return totals
+
+#############################################
+# Testy podstawowych operacji #
+#############################################
+
+def test_plan_covers_date_range(plan):
+    """Test the number of days and their order"""
+    assert len(plan) == 731
+    days = list(plan.days())
+    assert days[0] == date(2024, 1, 1) and days[-1] == date(2025, 12, 31)
+
+def test_add_remove_and_clear(plan, recipes):
+    """Test meal edits reflected in daily summaries"""
+    day = date(2024, 2, 29)
+    handle = plan.add_meal(day, recipes[0])
+    plan.add_meal(day, recipes[1])
+    assert plan.daily_summary(day)["kcal"] == 300
+    assert plan.remove_meal_by_handle(handle) is recipes[0]
+    assert plan.daily_summary(day)["kcal"] == 200
+    plan.remove_meal(day, recipes[1])
+    assert plan.get_meals(day) == []
+    plan.add_meal(day, recipes[2])
+    plan.clear_day(day)
+    assert plan.daily_summary(day) == {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+    with pytest.raises(ValueError):
+        plan.remove_meal(day, recipes[2])
+    with pytest.raises(ValueError):
+        plan.remove_meal_by_handle(handle)
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda plan, recipe: plan.add_meal(date(2023, 12, 31), recipe),
+        lambda plan, recipe: plan.range_summary(date(2024, 5, 2), date(2024, 5, 1)),
+        lambda plan, recipe: plan.monthly_summary(2030, 1),
+        lambda plan, recipe: CalendarPlan(date(2024, 1, 2), date(2024, 1, 1)),
+    ],
+)
+def test_invalid_dates(plan, recipes, call):
+    """Test rejection of dates outside the plan and inverted ranges"""
+    with pytest.raises(ValueError):
+        call(plan, recipes[0])
+
+def test_invalid_types(plan, recipes):
+    """Test rejection of non-date days and non-recipe meals"""
+    with pytest.raises(TypeError):
+        plan.add_meal("2024-01-01", recipes[0])
+    with pytest.raises(TypeError):
+        plan.add_meal(date(2024, 1, 1), "soup")
+    assert plan.add_meal(datetime(2024, 1, 1, 12), recipes[0]) is not None
+
+#############################################
+# Testy sum w zakresach dat #
+#############################################
+
+def test_range_summaries_match_brute_force(plan, recipes):
+    """Test random edits against a linear rescan"""
+    rng = random.Random(5)
+    handles = []
+    for _ in range(2000):
+        day = date(2024, 1, 1) + timedelta(days=rng.randrange(731))
+        if handles and rng.random() < 0.3:
+            plan.remove_meal_by_handle(handles.pop(rng.randrange(len(handles))))
+        else:
+            handles.append(plan.add_meal(day, rng.choice(recipes)))
+        if rng.random() < 0.05:
+            first = date(2024, 1, 1) + timedelta(days=rng.randrange(731))
+            last = min(first + timedelta(days=rng.randrange(120)), date(2025, 12, 31))
+            assert plan.range_summary(first, last) == pytest.approx(brute_force(plan, first, last))
+
+def test_monthly_summary(plan, recipes):
+    """Test calendar month totals, including December"""
+    plan.add_meal(date(2024, 12, 1), recipes[0])
+    plan.add_meal(date(2024, 12, 31), recipes[1])
+    plan.add_meal(date(2025, 1, 1), recipes[2])
+    assert plan.monthly_summary(2024, 12)["kcal"] == 300
+    assert plan.monthly_summary(2025, 1)["kcal"] == 300
+    assert plan.monthly_summary(2024, 11)["kcal"] == 0
+
+def test_summaries_follow_recipe_changes(plan, recipes):
+    """Test that modifying a planned recipe rebuilds the totals"""
+    plan.add_meal(date(2024, 3, 1), recipes[0])
+    plan.add_meal(date(2024, 3, 2), recipes[0])
+    assert plan.monthly_summary(2024, 3)["kcal"] == 200
+    recipes[0].update_kcal(50)
+    assert plan.monthly_summary(2024, 3)["kcal"] == 100
+    plan.add_meal(date(2024, 3, 3), recipes[0])
+    assert plan.range_summary(date(2024, 3, 2), date(2024, 3, 3))["kcal"] == 100
+
+def test_recipe_changes_update_only_their_dates(plan, recipes):
+    """Test that unrelated recipe edits leave the trees and copies untouched"""
+    plan.add_meal(date(2024, 4, 1), recipes[1])
+    plan.add_meal(date(2024, 4, 1), recipes[1])
+    trees = [list(tree) for tree in plan._trees]
+    Recipe("Other", {"x": 1}, 1, 1, 1, 1).update_kcal(5)
+    assert plan._trees == trees
+    recipes[1].scale_recipe(2)
+    assert plan.daily_summary(date(2024, 4, 1))["kcal"] == 800
+    meals = plan.get_meals(date(2024, 4, 1))
+    meals.clear()
+    assert len(plan.get_meals(date(2024, 4, 1))) == 2
+    copy = pickle.loads(pickle.dumps(plan))
+    assert copy.monthly_summary(2024, 4) == plan.monthly_summary(2024, 4)
+
+def test_summaries_have_no_float_residue(plan):
+    """Test that removing meals leaves exact totals behind"""
+    day = date(2024, 6, 1)
+    for value in (0.1, 0.2, 0.7):
+        plan.add_meal(day, Recipe("Snack", {"x": 1}, value, value, value, value))
+    handle = plan.add_meal(day + timedelta(days=1), Recipe("Tea", {"x": 1}, 0.3, 0, 0, 0))
+    plan.remove_meal_by_handle(handle)
+    plan.remove_meal(day, Recipe("Snack", {"x": 1}, 0.7, 0.7, 0.7, 0.7))
+    assert plan.daily_summary(day)["kcal"] == 0.3
+    assert plan.daily_summary(day + timedelta(days=1))["kcal"] == 0
+
+def test_plan_releases_recipe_listeners(recipes):
+    """Test that a dropped plan does not stay subscribed to its recipes"""
+    plan = CalendarPlan(date(2024, 1, 1), date(2024, 1, 31))
+    plan.add_meal(date(2024, 1, 5), recipes[0])
+    assert recipes[0]._listeners
+    del plan
+    gc.collect()
+    assert not recipes[0]._listeners
@@ -0,0 +1,111 @@
+import gc
+import pytest
+from src.catalog import RecipeCatalog
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Pasta", {"pasta": 100, "tomato_sauce": 50, "cheese": 20}, 450, 15, 10, 60),
+        Recipe("Salad", {"lettuce": 100, "tomato": 2.5}, 120, 3, 2, 15),
+        Recipe("Omelette", {"eggs": 3, "cheese": 30}, 320, 22, 18, 4),
+        Recipe("Pasta", {"pasta": 120}, 400, 12, 4, 70),
+    ]
+
+@pytest.fixture
+def catalog(recipes):
+    catalog = RecipeCatalog()
+    catalog.add_many(recipes)
+    yield catalog
+    catalog.close()
+
+#############################################
+# Testy zapisu i odczytu #
+#############################################
+
+def test_round_trip(catalog, recipes):
+    """Test that stored recipes are materialized unchanged"""
+    assert len(catalog) == 4
+    assert list(catalog.ids()) == [1, 2, 3, 4]
+    for recipe_id, recipe in zip(catalog.ids(), recipes):
+        loaded = catalog.get(recipe_id)
+        assert loaded == recipe
+        assert list(loaded.ingredients) == list(recipe.ingredients)
+    assert catalog[2].ingredients["tomato"] == 2.5
+    assert list(catalog) == recipes
+
+def test_lazy_materialization_is_cached(catalog):
+    """Test that a recipe in use is loaded only once"""
+    first = catalog.get(1)
+    assert catalog.get(1) is first
+    del first
+    gc.collect()
+    assert catalog.get(1).name == "Pasta"
+    assert 1 in catalog and 99 not in catalog
+    with pytest.raises(KeyError):
+        catalog.get(99)
+
+def test_persistence_across_connections(tmp_path, recipes):
+    """Test reopening a catalog stored in a file"""
+    path = str(tmp_path / "catalog.db")
+    with RecipeCatalog(path) as catalog:
+        catalog.add_many(recipes[:2])
+    with RecipeCatalog(path) as catalog:
+        assert len(catalog) == 2
+        assert catalog.add(recipes[2]) == 3
+        assert catalog.find_by_ingredient("cheese") == [1, 3]
+
+def test_add_many_is_atomic(catalog, recipes):
+    """Test that a failing bulk insert stores nothing"""
+    bad = Recipe("Bad", {("tuple", "name"): 1}, 1, 1, 1, 1)
+    with pytest.raises(TypeError):
+        catalog.add_many([recipes[0], bad])
+    with pytest.raises(TypeError):
+        catalog.add_many([recipes[0], "not_a_recipe"])
+    assert len(catalog) == 4
+    assert catalog.add(Recipe("New", {"saffron": 1}, 1, 1, 1, 1)) == 5
+    assert catalog.find_by_ingredient("saffron") == [5]
+
+def test_remove(catalog):
+    """Test removing recipes together with their ingredient rows"""
+    catalog.remove(1)
+    assert len(catalog) == 3
+    assert catalog.find_by_ingredient("cheese") == [3]
+    with pytest.raises(KeyError):
+        catalog.remove(1)
+    with pytest.raises(KeyError):
+        catalog.get(1)
+
+#############################################
+# Testy wyszukiwania #
+#############################################
+
+def test_find_by_name(catalog):
+    """Test exact name lookups"""
+    assert catalog.find_by_name("Pasta") == [1, 4]
+    assert catalog.find_by_name("Pizza") == []
+
+def test_find_by_ingredient(catalog):
+    """Test ingredient lookups"""
+    assert catalog.find_by_ingredient("pasta") == [1, 4]
+    assert catalog.find_by_ingredient("saffron") == []
+
+@pytest.mark.parametrize(
+    "query,parameters,index",
+    [
+        ("SELECT id FROM recipes WHERE name = ?", ("Pasta",), "idx_recipes_name"),
+        (
+            "SELECT recipe_id FROM recipe_ingredients WHERE ingredient_id = ?",
+            (1,),
+            "idx_recipe_ingredients_ingredient",
+        ),
+    ],
+)
+def test_lookups_use_indexes(catalog, query, parameters, index):
+    """Test that lookups are planned as index searches"""
+    plan = catalog._connection.execute("EXPLAIN QUERY PLAN " + query, parameters).fetchall()
+    assert any(index in row[-1] for row in plan)
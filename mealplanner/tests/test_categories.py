@@ -0,0 +1,68 @@
+import pytest
+from src.categories import UNCATEGORIZED, Categorizer, default_categorizer
+
+#############################################
+# Testy klasyfikacji nazw #
+#############################################
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("flour", "pantry"),
+        ("Tomatoes", "produce"),
+        ("cherry tomatoes", "produce"),
+        ("extra virgin olive oil", "pantry"),
+        ("black pepper", "spices"),
+        ("red bell peppers", "produce"),
+        ("crunchy peanut butter", "pantry"),
+        ("unsalted butter", "dairy"),
+        ("chicken breast", "meat"),
+        ("Fresh Strawberries!", "produce"),
+        ("catfish", "seafood"),
+        ("unobtainium", UNCATEGORIZED),
+        ("", UNCATEGORIZED),
+        (42, UNCATEGORIZED),
+    ],
+)
+def test_default_classification(name, expected):
+    """Test exact matches, suffix matches and fallbacks"""
+    assert default_categorizer.classify(name) == expected
+
+def test_custom_categories_and_overrides():
+    """Test a categorizer built from custom keywords"""
+    categorizer = Categorizer({"baking": ["flour", "baking powder"]})
+    assert categorizer.classify("rye flour") == "baking"
+    assert categorizer.classify("tomato") == UNCATEGORIZED
+    categorizer.add("produce", "tomato")
+    assert categorizer.classify("tomato") == "produce"
+    categorizer.add("gluten free", "rye flour")
+    assert categorizer.classify("rye flour") == "gluten free"
+    assert categorizer.classify("wheat flour") == "baking"
+    with pytest.raises(ValueError):
+        categorizer.add("empty", "!!!")
+    with pytest.raises(ValueError):
+        Categorizer(cache_size=0)
+
+#############################################
+# Testy przetwarzania wsadowego #
+#############################################
+
+def test_classify_many_and_group():
+    """Test batch classification and grouping of shopping list items"""
+    names = ["milk", "salmon fillets", "milk", "sparkling water"]
+    assert default_categorizer.classify_many(names) == ["dairy", "seafood", "dairy", "pantry"]
+    grouped = default_categorizer.group({"milk": 1, "salmon fillets": 2, "rocks": 3})
+    assert grouped == {"dairy": {"milk": 1}, "seafood": {"salmon fillets": 2}, UNCATEGORIZED: {"rocks": 3}}
+
+def test_memoization_is_bounded():
+    """Test that the per-name cache is cleared instead of growing unbounded"""
+    categorizer = Categorizer(cache_size=10)
+    categorizer.classify_many(f"item {i}" for i in range(25))
+    assert len(categorizer._cache) <= 10
+    assert categorizer.classify("apple") == "produce"
+
+def test_large_list():
+    """Test categorizing a 50k-line list"""
+    names = [f"organic {word} {i % 500}" for i, word in zip(range(50_000), ["apples", "rice", "cod"] * 20_000)]
+    categories = Categorizer().classify_many(names)
+    assert categories == (["produce", "pantry", "seafood"] * 20_000)[:50_000]
@@ -0,0 +1,261 @@
+import random
+import pytest
+from src.index import IngredientIndex, NutrientIndex, _RecipeIndex, _difference, _intersect, _union
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Chicken rice", {"chicken": 200, "rice": 100}, 500, 40, 10, 60),
+        Recipe("Fried rice", {"rice": 150, "eggs": 2, "peas": 50}, 450, 15, 12, 70),
+        Recipe("Omelette", {"eggs": 3, "cheese": 30}, 320, 22, 18, 4),
+        Recipe("Chicken salad", {"chicken": 150, "lettuce": 100}, 300, 35, 8, 5),
+    ]
+
+@pytest.fixture
+def index(recipes):
+    index = IngredientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    return index
+
+#############################################
+# Testy operacji na listach postingów #
+#############################################
+
+def test_posting_list_operations_match_sets():
+    """Test intersection, union and difference against set semantics"""
+    rng = random.Random(3)
+    lists = [sorted(rng.sample(range(200), rng.randint(0, 60))) for _ in range(4)]
+    assert _intersect(lists) == sorted(set.intersection(*map(set, lists)))
+    assert _union(lists) == sorted(set.union(*map(set, lists)))
+    assert _difference(lists[0], lists[1]) == sorted(set(lists[0]) - set(lists[1]))
+    assert _intersect([]) == []
+
+#############################################
+# Testy zapytań #
+#############################################
+
+def test_postings(index):
+    """Test the sorted posting list of single ingredients"""
+    assert len(index) == 4
+    assert index.postings("chicken") == [0, 3]
+    assert index.postings("eggs") == [1, 2]
+    assert index.postings("saffron") == []
+
+def test_all_of_and_any_of(index):
+    """Test AND and OR queries"""
+    assert index.all_of("chicken", "rice") == [0]
+    assert index.all_of("chicken", "eggs") == []
+    assert index.any_of("chicken", "eggs") == [0, 1, 2, 3]
+    assert index.any_of("saffron") == []
+
+def test_query_with_exclusions(index):
+    """Test combined AND/OR/NOT queries"""
+    assert index.query(all_of=["rice"], none_of=["chicken"]) == [1]
+    assert index.query(any_of=["eggs", "lettuce"], none_of=["cheese"]) == [1, 3]
+    assert index.query(none_of=["rice", "saffron"]) == [2, 3]
+    assert index.query() == [0, 1, 2, 3]
+
+def test_explicit_ids(recipes):
+    """Test sharing ids with an external catalog"""
+    index = IngredientIndex()
+    index.add(recipes[0], recipe_id=10)
+    index.add(recipes[1], recipe_id=3)
+    assert index.add(recipes[2]) == 11
+    assert index.postings("rice") == [3, 10]
+    with pytest.raises(ValueError):
+        index.add(recipes[3], recipe_id=3)
+    with pytest.raises(ValueError):
+        index.add(recipes[0])
+    with pytest.raises(TypeError):
+        index.add("not_a_recipe")
+
+#############################################
+# Testy utrzymania indeksu #
+#############################################
+
+def test_remove(index, recipes):
+    """Test removing recipes and stopping change tracking"""
+    index.remove(0)
+    assert index.postings("chicken") == [3]
+    assert index.all_of("rice") == [1]
+    recipes[0].add_ingredient("eggs", 1)
+    assert index.postings("eggs") == [1, 2]
+    with pytest.raises(ValueError):
+        index.remove(0)
+
+def test_tracks_ingredient_changes(index, recipes):
+    """Test that postings follow add_ingredient and remove_ingredient"""
+    recipes[2].add_ingredient("rice", 80)
+    recipes[0].remove_ingredient("chicken")
+    recipes[1].update_ingredient_quantity("eggs", 4)
+    recipes[1].add_ingredient("eggs", 5)
+    recipes[3].scale_recipe(2)
+    assert index.postings("rice") == [0, 1, 2]
+    assert index.postings("chicken") == [3]
+    assert index.postings("eggs") == [1, 2]
+    assert index.all_of("chicken", "rice") == []
+
+def test_matches_full_scan_after_random_edits(recipes):
+    """Test index answers against a brute-force scan"""
+    rng = random.Random(11)
+    pool = ["chicken", "rice", "eggs", "peas", "cheese", "lettuce", "tofu"]
+    index = IngredientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    for _ in range(200):
+        recipe = rng.choice(recipes)
+        if rng.random() < 0.5:
+            recipe.add_ingredient(rng.choice(pool), 1)
+        else:
+            recipe.remove_ingredient(rng.choice(pool))
+    for first in pool:
+        for second in pool:
+            expected = [
+                i for i, r in enumerate(recipes)
+                if r.contains_ingredient(first) and not r.contains_ingredient(second)
+            ]
+            assert index.query(all_of=[first], none_of=[second]) == expected
+
+#############################################
+# Testy indeksu wartości odżywczych #
+#############################################
+
+def _random_recipes(count, seed):
+    rng = random.Random(seed)
+    return [
+        Recipe(
+            f"R{i}", {}, rng.randint(100, 900), rng.randint(0, 60),
+            rng.randint(0, 40), rng.randint(0, 120),
+        )
+        for i in range(count)
+    ]
+
+def _brute_range(recipes, **bounds):
+    result = []
+    for i, recipe in enumerate(recipes):
+        nutrients = recipe.total_nutrients()
+        if all(
+            (low is None or nutrients[key] >= low) and (high is None or nutrients[key] <= high)
+            for key, (low, high) in bounds.items()
+        ):
+            result.append(i)
+    return result
+
+@pytest.mark.parametrize(
+    "bounds",
+    [
+        {"kcal": (400, 600), "protein": (30, None)},
+        {"fat": (None, 10)},
+        {"kcal": (500, 500)},
+        {"carbs": (50, 20)},
+        {"kcal": (200, 800), "protein": (10, 50), "fat": (5, 35), "carbs": (0, 100)},
+    ],
+)
+def test_range_matches_scan(bounds):
+    """Test multi-attribute range queries against a full scan"""
+    recipes = _random_recipes(300, seed=5)
+    index = NutrientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    assert index.range(**bounds) == _brute_range(recipes, **bounds)
+
+def test_range_without_bounds_and_invalid_nutrient(recipes):
+    """Test an unconstrained query and an unknown nutrient"""
+    index = NutrientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    assert index.range() == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        index.range(sugar=(0, 1))
+
+@pytest.mark.parametrize(
+    "target,weights,k",
+    [
+        ({"kcal": 500, "protein": 30}, None, 5),
+        ({"kcal": 450}, None, 3),
+        ({"kcal": 600, "protein": 40, "fat": 20, "carbs": 50}, {"kcal": 0.01}, 10),
+        ({"protein": 25}, None, 400),
+    ],
+)
+def test_nearest_matches_scan(target, weights, k):
+    """Test nearest-target queries against brute-force distances"""
+    recipes = _random_recipes(300, seed=9)
+    index = NutrientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+
+    def distance(i):
+        nutrients = recipes[i].total_nutrients()
+        return sum(
+            (1.0 if weights is None else weights.get(key, 1.0)) * (nutrients[key] - value) ** 2
+            for key, value in target.items()
+        )
+
+    expected = sorted(range(len(recipes)), key=lambda i: (distance(i), i))[:k]
+    assert index.nearest(k=k, weights=weights, **target) == expected
+
+def test_nearest_invalid_arguments(recipes):
+    """Test rejection of invalid nearest-target queries"""
+    index = NutrientIndex()
+    index.add(recipes[0])
+    with pytest.raises(ValueError):
+        index.nearest(k=0, kcal=1)
+    with pytest.raises(ValueError):
+        index.nearest()
+    assert NutrientIndex().nearest(kcal=1) == []
+
+def test_nutrient_index_follows_setters(recipes):
+    """Test that update_* and scale_recipe keep the index consistent"""
+    index = NutrientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    assert index.nearest(kcal=320) == [2]
+    recipes[2].update_kcal(1000)
+    recipes[3].scale_recipe(2)
+    recipes[0].update_protein(5)
+    assert index.range(kcal=(900, None)) == [2]
+    assert index.range(kcal=(600, 600)) == [3]
+    assert index.range(protein=(30, None)) == [3]
+    assert index.nearest(kcal=1000) == [2]
+    index.remove(2)
+    assert index.range(kcal=(900, None)) == []
+    assert index.nearest(kcal=1000) == [3]
+
+def test_nearest_after_edits_rebuilds_in_batches():
+    """Test nearest queries between edits against a scan and batched rebuilds"""
+    rng = random.Random(13)
+    recipes = _random_recipes(300, seed=13)
+    index = NutrientIndex()
+    for recipe in recipes:
+        index.add(recipe)
+    index.nearest(kcal=500)
+    tree = index._tree
+    removed = set()
+    for step in range(200):
+        i = rng.randrange(len(recipes))
+        if i in removed:
+            index.add(recipes[i], recipe_id=i)
+            removed.discard(i)
+        elif rng.random() < 0.2:
+            index.remove(i)
+            removed.add(i)
+        else:
+            recipes[i].update_kcal(rng.randint(100, 900))
+        target = rng.randint(100, 900)
+        present = [i for i in range(len(recipes)) if i not in removed]
+        expected = sorted(present, key=lambda i: ((recipes[i].kcal - target) ** 2, i))[:3]
+        assert index.nearest(k=3, kcal=target) == expected
+        if step < 60:
+            assert index._tree is tree
+    assert index._tree is not tree
+
+def test_recipe_index_is_abstract():
+    """Test that the shared base class cannot be instantiated"""
+    with pytest.raises(TypeError):
+        _RecipeIndex()
@@ -0,0 +1,138 @@
+import pickle
+import threading
+from array import array
+import pytest
+from src.ingredients import IngredientMap, IngredientRegistry, ingredient_registry
+from src.recipe import Recipe
+from src.shoppinglist import generate_shopping_list
+
+#############################################
+# Testy rejestru składników #
+#############################################
+
+def test_registry_interns_names_to_dense_ids():
+    """Test that names get consecutive ids and repeated names reuse them"""
+    registry = IngredientRegistry()
+    assert registry.intern("flour") == 0
+    assert registry.intern("milk") == 1
+    assert registry.intern("flour") == 0
+    assert len(registry) == 2
+    assert registry.name(1) == "milk"
+    assert registry.names() == ["flour", "milk"]
+
+def test_registry_lookup_does_not_register():
+    """Test that lookup of an unknown name leaves the registry unchanged"""
+    registry = IngredientRegistry()
+    assert registry.lookup("saffron") is None
+    assert "saffron" not in registry
+    assert len(registry) == 0
+    with pytest.raises(ValueError):
+        registry.name(0)
+
+def test_registry_interns_from_many_threads():
+    """Test that concurrent interning gives every name exactly one id"""
+    registry = IngredientRegistry()
+    seen = []
+
+    def intern():
+        seen.append([registry.intern(f"item{i}") for i in range(500)])
+
+    threads = [threading.Thread(target=intern) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(ids == seen[0] for ids in seen)
+    assert sorted(seen[0]) == list(range(500))
+    assert all(registry.name(registry.intern(f"item{i}")) == f"item{i}" for i in range(500))
+
+#############################################
+# Testy widoku IngredientMap #
+#############################################
+
+def test_map_behaves_like_dict():
+    """Test the dict-style API of the ingredient view"""
+    mapping = IngredientMap({"banana": 1, "milk": 200})
+    assert mapping["milk"] == 200
+    assert list(mapping) == ["banana", "milk"]
+    assert list(mapping.items()) == [("banana", 1), ("milk", 200)]
+    assert list(mapping.values()) == [1, 200]
+    assert "banana" in mapping and "apple" not in mapping
+    assert mapping == {"milk": 200, "banana": 1}
+    assert repr(mapping) == "{'banana': 1, 'milk': 200}"
+
+    mapping["banana"] = 2
+    mapping["sugar"] = 5
+    del mapping["milk"]
+    assert dict(mapping) == {"banana": 2, "sugar": 5}
+    with pytest.raises(KeyError):
+        mapping["milk"]
+    with pytest.raises(KeyError):
+        del mapping["never-seen-ingredient"]
+
+def test_map_stores_interned_ids():
+    """Test that the view keeps registry ids next to quantities"""
+    mapping = IngredientMap({"rice": 100, "chicken": 200})
+    assert list(mapping.ids) == [
+        ingredient_registry.lookup("rice"),
+        ingredient_registry.lookup("chicken"),
+    ]
+    assert mapping.quantities == [100, 200]
+
+def test_map_from_arrays():
+    """Test building a view from parallel id and quantity arrays"""
+    rice = ingredient_registry.intern("rice")
+    beans = ingredient_registry.intern("beans")
+    mapping = IngredientMap.from_arrays([rice, beans], [100, 50])
+    assert dict(mapping) == {"rice": 100, "beans": 50}
+    assert mapping.copy() == mapping
+    with pytest.raises(ValueError):
+        IngredientMap.from_arrays([rice], [1, 2])
+    with pytest.raises(ValueError):
+        IngredientMap.from_arrays([rice, rice], [1, 2])
+    for invalid in (-1, len(ingredient_registry)):
+        with pytest.raises(ValueError):
+            IngredientMap.from_arrays([rice, invalid], [1, 2])
+
+def test_map_lookups_follow_edits():
+    """Test the id-to-position index across inserts, deletes and array swaps"""
+    mapping = IngredientMap({f"spice{i}": i for i in range(50)})
+    assert mapping["spice49"] == 49
+    del mapping["spice10"]
+    mapping["spice10"] = 100
+    assert mapping["spice11"] == 11 and mapping["spice10"] == 100
+    assert list(mapping)[-1] == "spice10"
+    mapping.ids = array("i", [ingredient_registry.lookup("spice3")])
+    mapping.quantities = [7]
+    assert dict(mapping) == {"spice3": 7}
+    assert "spice4" not in mapping
+
+def test_map_is_unhashable():
+    """Test that the mutable view cannot be used as a dict key"""
+    with pytest.raises(TypeError):
+        hash(IngredientMap({"a": 1}))
+
+#############################################
+# Testy integracji z Recipe #
+#############################################
+
+def test_recipe_ingredients_are_interned():
+    """Test that recipes sharing ingredients share registry ids"""
+    r1 = Recipe("A", {"salt": 1, "pepper": 2}, 10, 1, 1, 1)
+    r2 = Recipe("B", {"pepper": 3}, 10, 1, 1, 1)
+    assert isinstance(r1.ingredients, IngredientMap)
+    assert r1.ingredients.ids[1] == r2.ingredients.ids[0]
+
+def test_recipe_pickles_by_name():
+    """Test that pickled recipes are rebuilt from ingredient names"""
+    recipe = Recipe("Soup", {"water": 500, "carrot": 100}, 90, 2, 1, 10)
+    restored = pickle.loads(pickle.dumps(recipe))
+    assert restored == recipe
+    assert isinstance(restored.ingredients, IngredientMap)
+
+def test_generate_shopping_list_with_plain_dict_ingredients():
+    """Test aggregation of recipes whose ingredients are plain dicts"""
+    recipe = Recipe("Plain", {}, 10, 1, 1, 1)
+    recipe.ingredients = {"oats": 40}
+    other = Recipe("Porridge", {"oats": 60, "milk": 200}, 10, 1, 1, 1)
+    assert generate_shopping_list([recipe, other]) == {"oats": 100, "milk": 200}
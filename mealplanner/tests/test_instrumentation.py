@@ -0,0 +1,110 @@
+import pytest
+from src import shoppinglist
+from src.instrumentation import Instrumentation, OperationStats
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+from src.threadsafe import ConcurrentMealPlan
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def probe():
+    probe = Instrumentation(samples=100)
+    yield probe
+    while probe.enabled:
+        probe.disable()
+
+#############################################
+# Testy włączania i wyłączania #
+#############################################
+
+def test_disabled_instrumentation_leaves_code_untouched(probe):
+    """Test that original functions are restored after disabling"""
+    original = MealPlan.weekly_summary, Recipe.__init__, shoppinglist.generate_shopping_list
+    with probe:
+        assert MealPlan.weekly_summary is not original[0]
+        with probe:
+            pass
+        assert probe.enabled
+    assert (MealPlan.weekly_summary, Recipe.__init__, shoppinglist.generate_shopping_list) == original
+    assert not probe.enabled
+    with pytest.raises(ValueError):
+        probe.disable()
+    with pytest.raises(ValueError):
+        Instrumentation(samples=0)
+
+def test_interleaved_instances_restore_originals(probe):
+    """Test that instances enabled and disabled out of order share one install"""
+    original = MealPlan.weekly_summary, Recipe.__init__
+    other = Instrumentation(samples=10)
+    probe.enable()
+    other.enable()
+    MealPlan().weekly_summary()
+    probe.disable()
+    MealPlan().weekly_summary()
+    assert MealPlan.weekly_summary is not original[0]
+    other.disable()
+    assert (MealPlan.weekly_summary, Recipe.__init__) == original
+    assert probe.stats("MealPlan.weekly_summary")["count"] == 1
+    assert other.stats("MealPlan.weekly_summary")["count"] == 2
+
+def test_subclass_overrides_are_instrumented(probe):
+    """Test that an overriding subclass method is recorded under its own name"""
+    original = ConcurrentMealPlan.weekly_summary
+    with probe:
+        ConcurrentMealPlan().weekly_summary()
+    assert ConcurrentMealPlan.weekly_summary is original
+    assert probe.stats("ConcurrentMealPlan.weekly_summary")["count"] == 1
+
+def test_nothing_is_recorded_while_disabled(probe):
+    """Test that calls outside the context are not counted"""
+    with probe:
+        pass
+    Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    assert probe.stats() == {}
+    assert probe.stats("Recipe.__init__")["count"] == 0
+
+#############################################
+# Testy zbierania statystyk #
+#############################################
+
+def test_operations_are_counted(probe):
+    """Test counts, latencies and allocations of instrumented operations"""
+    with probe:
+        recipes = [Recipe(f"R{i}", {"x": i + 1}, 100, 1, 1, 1) for i in range(20)]
+        plan = MealPlan()
+        for recipe in recipes:
+            plan.add_meal("Monday", recipe)
+        plan.weekly_summary()
+        plan.daily_summary("Monday")
+        shoppinglist.generate_shopping_list(recipes)
+        first, second = ShoppingList(), ShoppingList()
+        first.add_from_mealplan(plan)
+        first.merge(second)
+
+    stats = probe.stats()
+    assert stats["Recipe.__init__"]["count"] == 20
+    assert stats["MealPlan.weekly_summary"]["count"] == 1
+    assert stats["shoppinglist.generate_shopping_list"]["count"] == 1
+    assert stats["shoppinglist.stream_shopping_list"]["count"] == 1
+    assert stats["ShoppingList.merge"]["count"] == 1
+    summary = stats["Recipe.__init__"]
+    assert 0 < summary["p50"] <= summary["p90"] <= summary["p99"] <= summary["max"]
+    assert summary["total"] == pytest.approx(summary["mean"] * 20)
+    assert summary["net_blocks"] > 0
+
+    probe.reset()
+    assert probe.stats() == {}
+
+def test_percentiles_use_recent_samples():
+    """Test nearest-rank percentiles over a bounded sample window"""
+    stats = OperationStats(samples=10)
+    for value in range(1, 21):
+        stats.latencies.append(float(value))
+    assert list(stats.latencies) == [float(v) for v in range(11, 21)]
+    assert stats.percentile(50) == 15
+    assert stats.percentile(100) == 20
+    assert OperationStats(5).percentile(50) == 0.0
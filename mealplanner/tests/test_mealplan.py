@@ -1,3 +1,5 @@
+import pickle
+from unittest.mock import patch
 import pytest
 from src.mealplan import MealPlan
 from src.recipe import Recipe
@@ -345,4 +347,275 @@ def test_full_week_plan():
         assert len(mp.plan[day]) == 3
 
     summary = mp.daily_summary("Sunday")
-    assert summary["kcal"] == 630
\ No newline at end of file
+    assert summary["kcal"] == 630
+
+#############################################
+# Testy przyrostowych podsumowań #
+#############################################
+
+def test_summary_does_not_recompute_unchanged_day():
+    """Test sprawdzający, że podsumowanie niezmienionego dnia nie przelicza przepisów"""
+    plan = MealPlan()
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan.add_meal("Monday", recipe)
+    plan.weekly_summary()
+
+    with patch.object(Recipe, "total_nutrients", autospec=True) as mock_nutrients:
+        for _ in range(5):
+            assert plan.daily_summary("Monday")["kcal"] == 150
+            assert plan.weekly_summary()["Monday"]["kcal"] == 150
+        mock_nutrients.assert_not_called()
+
+
+def test_summary_after_remove_and_clear():
+    """Test sprawdzający aktualizację sum po usunięciu posiłku i wyczyszczeniu dnia"""
+    plan = MealPlan()
+    toast = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    salad = Recipe("Salad", {"lettuce": 50}, 100.5, 3, 1, 15)
+    plan.add_meal("Monday", toast)
+    plan.add_meal("Monday", salad)
+    plan.remove_meal("Monday", toast)
+    assert plan.daily_summary("Monday") == {
+        "kcal": 100.5, "protein": 3, "fat": 1, "carbs": 15,
+    }
+    plan.remove_meal("Monday", salad)
+    assert plan.daily_summary("Monday") == {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+    plan.add_meal("Monday", toast)
+    plan.clear_day("Monday")
+    assert plan.daily_summary("Monday")["kcal"] == 0
+
+
+@pytest.mark.parametrize(
+    "removed,kept,expected",
+    [
+        ([0.1], [0.2], 0.2),
+        ([1e17], [1], 1),
+        ([0.1, 1e17], [0.2, 0.7], 0.2 + 0.7),
+    ],
+)
+def test_summary_does_not_depend_on_edit_history(removed, kept, expected):
+    """Test sprawdzający, że sumy po usunięciu posiłków są takie jak bez nich"""
+    plan = MealPlan()
+    for kcal in removed + kept:
+        plan.add_meal("Monday", Recipe(f"R{kcal}", {}, kcal, 0, 0, 0))
+    for meal in list(plan.get_meals("Monday"))[: len(removed)]:
+        plan.remove_meal("Monday", meal)
+    assert plan.daily_summary("Monday")["kcal"] == expected
+@pytest.mark.parametrize(
+    "method,args,expected_kcal",
+    [
+        ("update_kcal", (500,), 1000),
+        ("scale_recipe", (2,), 600),
+        ("update_protein", (50,), 300),
+    ],
+)
+def test_summary_invalidated_by_recipe_update(method, args, expected_kcal):
+    """Test sprawdzający, że modyfikacja przepisu w planie unieważnia zapamiętane sumy"""
+    plan = MealPlan()
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan.add_meal("Monday", recipe)
+    plan.add_meal("Monday", recipe)
+    assert plan.daily_summary("Monday")["kcal"] == 300
+
+    getattr(recipe, method)(*args)
+    assert plan.daily_summary("Monday")["kcal"] == expected_kcal
+    assert plan.weekly_summary()["Monday"]["kcal"] == expected_kcal
+
+    plan.remove_meal("Monday", recipe)
+    assert plan.daily_summary("Monday")["kcal"] == expected_kcal / 2
+
+
+def test_summary_ignores_unrelated_recipe_updates():
+    """Test sprawdzający, że zmiana przepisu spoza planu nie unieważnia sum"""
+    plan = MealPlan()
+    planned = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    other = Recipe("Soup", {"water": 500}, 200, 10, 5, 30)
+    plan.add_meal("Monday", planned)
+    plan.daily_summary("Monday")
+    cached = plan._totals["Monday"]
+    other.update_kcal(999)
+    planned.add_ingredient("butter", 5)
+    assert plan.daily_summary("Monday")["kcal"] == 150
+    assert plan._totals["Monday"] is cached
+
+
+def test_summary_listeners_are_released():
+    """Test sprawdzający, że sumy dnia nie pozostają subskrybentami przepisów"""
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan = MealPlan()
+    handle = plan.add_meal("Monday", recipe)
+    assert len(recipe._listeners) == 1
+    plan.remove_meal_by_handle(handle)
+    assert recipe._listeners == []
+    plan.add_meal("Tuesday", recipe)
+    del plan
+    assert recipe._listeners == []
+
+
+def test_summary_after_direct_list_changes():
+    """Test sprawdzający podsumowanie po bezpośredniej modyfikacji plan.plan"""
+    plan = MealPlan()
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan.add_meal("Monday", recipe)
+    plan.plan["Monday"].append(recipe)
+    assert plan.daily_summary("Monday")["kcal"] == 300
+    plan.plan["Monday"] = [recipe]
+    assert plan.daily_summary("Monday")["kcal"] == 150
+
+
+def test_summary_returns_independent_copies():
+    """Test sprawdzający, że zwrócone podsumowanie nie współdzieli stanu z planem"""
+    plan = MealPlan()
+    plan.add_meal("Monday", Recipe("Toast", {"bread": 2}, 150, 5, 2, 20))
+    plan.daily_summary("Monday")["kcal"] = 0
+    plan.weekly_summary()["Monday"]["kcal"] = 0
+    assert plan.daily_summary("Monday")["kcal"] == 150
+
+
+#############################################
+# Testy usuwania posiłków przez uchwyty #
+#############################################
+
+def test_remove_meal_by_handle():
+    """Test sprawdzający usuwanie konkretnego wystąpienia posiłku przez uchwyt"""
+    plan = MealPlan()
+    toast = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    soup = Recipe("Soup", {"water": 500}, 200, 10, 5, 30)
+    first = plan.add_meal("Monday", toast)
+    plan.add_meal("Monday", soup)
+    second = plan.add_meal("Monday", toast)
+
+    assert plan.remove_meal_by_handle(second) is toast
+    assert plan.get_meals("Monday") == [toast, soup]
+    assert plan.daily_summary("Monday")["kcal"] == 350
+    plan.remove_meal_by_handle(first)
+    assert plan.get_meals("Monday") == [soup]
+    assert plan.daily_summary("Monday")["kcal"] == 200
+
+
+def test_remove_meal_by_handle_does_not_compare_recipes():
+    """Test sprawdzający, że usuwanie przez uchwyt nie wywołuje Recipe.__eq__"""
+    plan = MealPlan()
+    handles = [
+        plan.add_meal("Monday", Recipe(f"R{i}", {"x": i}, i, 0, 0, 0))
+        for i in range(100)
+    ]
+    with patch.object(Recipe, "__eq__", side_effect=AssertionError):
+        for handle in reversed(handles):
+            plan.remove_meal_by_handle(handle)
+    assert plan.get_meals("Monday") == []
+    assert plan.daily_summary("Monday")["kcal"] == 0
+
+
+def test_remove_meal_by_invalid_handle():
+    """Test sprawdzający błąd dla uchwytu już usuniętego lub wyczyszczonego"""
+    plan = MealPlan()
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    handle = plan.add_meal("Monday", recipe)
+    plan.remove_meal_by_handle(handle)
+    with pytest.raises(ValueError):
+        plan.remove_meal_by_handle(handle)
+
+    handle = plan.add_meal("Tuesday", recipe)
+    plan.clear_day("Tuesday")
+    with pytest.raises(ValueError):
+        plan.remove_meal_by_handle(handle)
+
+
+def test_remove_meal_prefers_identical_recipe():
+    """Test sprawdzający, że remove_meal usuwa najpierw ten sam obiekt przepisu"""
+    plan = MealPlan()
+    first = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    second = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan.add_meal("Monday", first)
+    plan.add_meal("Monday", second)
+    plan.remove_meal("Monday", second)
+    assert plan.get_meals("Monday")[0] is first
+
+
+def test_handles_after_direct_list_assignment():
+    """Test sprawdzający uchwyty po przypisaniu zwykłej listy do dnia"""
+    plan = MealPlan()
+    recipe = Recipe("Toast", {"bread": 2}, 150, 5, 2, 20)
+    plan.plan["Monday"] = [recipe]
+    handle = plan.add_meal("Monday", recipe)
+    assert plan.daily_summary("Monday")["kcal"] == 300
+    plan.remove_meal_by_handle(handle)
+    assert plan.get_meals("Monday") == [recipe]
+    assert plan.daily_summary("Monday")["kcal"] == 150
+
+
+def test_meal_list_behaves_like_list():
+    """Test sprawdzający operacje listowe na posiłkach dnia"""
+    plan = MealPlan()
+    a, b, c = (Recipe(name, {"x": 1}, 100, 0, 0, 0) for name in "abc")
+    plan.add_meal("Monday", a)
+    meals = plan.plan["Monday"]
+    meals.append(c)
+    meals.insert(1, b)
+    assert meals == [a, b, c]
+    assert meals[-1] is c and meals[1:] == [b, c]
+    handles = meals.handles()
+    meals[0] = c
+    assert meals.handles() == handles
+    del meals[0]
+    assert list(meals) == [b, c]
+    assert plan.daily_summary("Monday")["kcal"] == 200
+    assert pickle.loads(pickle.dumps(plan)).get_meals("Monday") == [b, c]
+
+
+def test_summary_after_same_length_list_changes():
+    """Test sprawdzający podsumowanie po zmianach listy, które nie zmieniają jej długości"""
+    plan = MealPlan()
+    small = Recipe("Small", {"x": 1}, 100, 0, 0, 0)
+    large = Recipe("Large", {"x": 1}, 500, 0, 0, 0)
+    plan.add_meal("Monday", small)
+    assert plan.daily_summary("Monday")["kcal"] == 100
+    plan.plan["Monday"][0] = large
+    assert plan.daily_summary("Monday")["kcal"] == 500
+    del plan.plan["Monday"][0]
+    plan.plan["Monday"].append(small)
+    assert plan.daily_summary("Monday")["kcal"] == 100
+
+
+def test_meal_list_indexing_after_removals():
+    """Test sprawdzający indeksowanie po usuwaniu i wstawianiu posiłków"""
+    plan = MealPlan()
+    recipes = [Recipe(f"R{i}", {"x": 1}, i, 0, 0, 0) for i in range(5)]
+    handles = [plan.add_meal("Monday", recipe) for recipe in recipes]
+    meals = plan.plan["Monday"]
+    assert [meals[i] for i in range(5)] == recipes
+    plan.remove_meal_by_handle(handles[1])
+    assert meals[1] is recipes[2]
+    meals.insert(0, recipes[1])
+    assert meals[0] is recipes[1] and meals[-1] is recipes[4]
+    with pytest.raises(IndexError):
+        meals[5]
+
+
+#############################################
+# Testy powiadomień o zmianach planu #
+#############################################
+
+def test_plan_listeners_receive_changes(basic_recipe):
+    """Test sprawdzający zdarzenia add, remove i clear oraz wyrejestrowanie"""
+    plan = MealPlan()
+    events = []
+    listener = lambda source, change, detail: events.append((source, change, detail))
+    plan.subscribe(listener)
+    handle = plan.add_meal("Monday", basic_recipe)
+    plan.remove_meal_by_handle(handle)
+    plan.add_meal("Tuesday", basic_recipe)
+    plan.clear_day("Tuesday")
+    assert events == [
+        (plan, "add", ("Monday", basic_recipe)),
+        (plan, "remove", ("Monday", basic_recipe)),
+        (plan, "add", ("Tuesday", basic_recipe)),
+        (plan, "clear", ("Tuesday", [basic_recipe])),
+    ]
+    plan.unsubscribe(listener)
+    plan.add_meal("Monday", basic_recipe)
+    assert len(events) == 4
+    with pytest.raises(ValueError):
+        plan.unsubscribe(listener)
+    assert pickle.loads(pickle.dumps(plan))._listeners is None
@@ -0,0 +1,116 @@
+import itertools
+import random
+import pytest
+from src.optimizer import PlanOptimizer
+from src.recipe import Recipe
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def catalog():
+    rng = random.Random(21)
+    return [
+        Recipe(
+            f"R{i}", {"x": 1}, rng.randint(150, 900), rng.randint(5, 50),
+            rng.randint(2, 40), rng.randint(5, 120),
+        )
+        for i in range(60)
+    ]
+
+TARGETS = {"kcal": 2000, "protein": 100, "fat": 70, "carbs": 250}
+
+#############################################
+# Testy optymalizacji pojedynczego dnia #
+#############################################
+
+def test_best_day_matches_exhaustive_search(catalog):
+    """Test that branch-and-bound finds the exhaustive optimum"""
+    recipes = catalog[:15]
+    optimizer = PlanOptimizer(recipes, TARGETS, min_meals=2, max_meals=3, candidates=15)
+    best = optimizer.best_day()
+
+    def totals(combo):
+        return [sum(getattr(recipes[i], key) for i in combo) for key in ("kcal", "protein", "fat", "carbs")]
+
+    expected = min(
+        (combo for size in (2, 3) for combo in itertools.combinations(range(15), size)),
+        key=lambda combo: optimizer.cost(totals(combo)),
+    )
+    assert optimizer.cost(totals(best)) == pytest.approx(optimizer.cost(totals(expected)))
+    assert 2 <= len(best) <= 3
+    assert len(set(best)) == len(best)
+
+def test_best_day_respects_bounds(catalog):
+    """Test hard nutrient bounds on daily totals"""
+    optimizer = PlanOptimizer(
+        catalog, {"kcal": 1800}, bounds={"protein": (90, None), "fat": (None, 60)},
+        min_meals=2, max_meals=4,
+    )
+    best = optimizer.best_day()
+    assert sum(catalog[i].protein for i in best) >= 90
+    assert sum(catalog[i].fat for i in best) <= 60
+
+def test_best_day_infeasible_bounds(catalog):
+    """Test that impossible bounds yield no combination"""
+    optimizer = PlanOptimizer(catalog, TARGETS, bounds={"kcal": (None, 100)})
+    assert optimizer.best_day() is None
+    with pytest.raises(ValueError):
+        optimizer.optimize()
+
+def test_best_day_falls_back_to_all_recipes():
+    """Test bounds met only by a recipe outside the closest candidates"""
+    recipes = [Recipe(f"R{i}", {"x": 1}, 500, 20, 10, 50) for i in range(50)]
+    recipes.append(Recipe("Feast", {"x": 1}, 3000, 90, 120, 300))
+    optimizer = PlanOptimizer(recipes, {"kcal": 2000}, bounds={"kcal": (2900, None)})
+    assert optimizer.best_day() == (50,)
+
+#############################################
+# Testy optymalizacji tygodnia #
+#############################################
+
+def test_optimize_week_without_repeats(catalog):
+    """Test a full week with meal counts and a no-repeat window"""
+    optimizer = PlanOptimizer(catalog, TARGETS, min_meals=3, max_meals=4, no_repeat_days=2)
+    plan = optimizer.optimize()
+    days = list(plan.plan)
+    for day in days:
+        assert 3 <= len(plan.get_meals(day)) <= 4
+    for first, second in zip(days, days[1:]):
+        assert not {id(r) for r in plan.get_meals(first)} & {id(r) for r in plan.get_meals(second)}
+    for first, third in zip(days, days[2:]):
+        assert not {id(r) for r in plan.get_meals(first)} & {id(r) for r in plan.get_meals(third)}
+    assert abs(plan.daily_summary("Monday")["kcal"] - 2000) < 400
+
+def test_optimize_selected_days_within_budget(catalog):
+    """Test that a tight time budget still returns a complete plan"""
+    optimizer = PlanOptimizer(catalog * 5, TARGETS, min_meals=3, max_meals=5, candidates=200)
+    plan = optimizer.optimize(days=["Monday", "Friday"], time_budget=0.2)
+    for day in ("Monday", "Friday"):
+        assert 3 <= len(plan.get_meals(day)) <= 5
+    assert plan.get_meals("Tuesday") == []
+
+def test_optimize_reports_exhausted_budget(catalog):
+    """Test that running out of time is not reported as infeasible bounds"""
+    optimizer = PlanOptimizer(catalog * 300, TARGETS, candidates=200)
+    with pytest.raises(TimeoutError):
+        optimizer.optimize(time_budget=0.0001)
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"recipes": []},
+        {"min_meals": 0},
+        {"min_meals": 3, "max_meals": 2},
+        {"no_repeat_days": -1},
+        {"candidates": 0},
+        {"targets": {"sugar": 10}},
+        {"bounds": {"sugar": (0, 1)}},
+    ],
+)
+def test_invalid_configuration(catalog, kwargs):
+    """Test rejection of invalid optimizer settings"""
+    arguments = {"recipes": catalog, "targets": TARGETS, **kwargs}
+    with pytest.raises(ValueError):
+        PlanOptimizer(**arguments)
@@ -0,0 +1,109 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from src.mealplan import MealPlan
+from src.parallel import (
+    _partition,
+    parallel_mealplans_shopping_list,
+    parallel_shopping_list,
+    tree_reduce,
+)
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe(f"R{i}", {"flour": i + 1, f"spice{i % 3}": 2, "water": 0}, 100, 1, 1, 1)
+        for i in range(20)
+    ]
+
+def _reference(recipes):
+    shopping_list = ShoppingList()
+    for recipe in recipes:
+        shopping_list.add_from_recipe(recipe)
+    return shopping_list.get_items()
+
+#############################################
+# Testy pomocnicze #
+#############################################
+
+@pytest.mark.parametrize("length,chunks", [(10, 3), (3, 8), (1, 1), (16, 4)])
+def test_partition_covers_all_items(length, chunks):
+    """Test that partitioning keeps order and balances chunk sizes"""
+    parts = _partition(list(range(length)), chunks)
+    assert [x for part in parts for x in part] == list(range(length))
+    assert len(parts) == min(length, chunks)
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1
+
+def test_merge_in_place():
+    """Test that merge_in_place mutates and returns the receiving list"""
+    sl1 = ShoppingList()
+    sl1.add_item("flour", 500)
+    sl2 = ShoppingList()
+    sl2.add_item("flour", 300)
+    sl2.add_item("sugar", 100)
+    assert sl1.merge_in_place(sl2) is sl1
+    assert sl1.get_items() == {"flour": 800, "sugar": 100}
+    assert sl2.get_items() == {"flour": 300, "sugar": 100}
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5, 8])
+def test_tree_reduce(count):
+    """Test tree-shaped reduction for even and odd numbers of lists"""
+    lists = []
+    for i in range(count):
+        sl = ShoppingList()
+        sl.add_item("egg", i + 1)
+        lists.append(sl)
+    result = tree_reduce(lists)
+    expected = {"egg": count * (count + 1) / 2} if count else {}
+    assert result.get_items() == expected
+
+def test_mealplan_pickle_rebuilds_totals():
+    """Test that an unpickled plan recomputes its running totals"""
+    plan = MealPlan()
+    plan.add_meal("Monday", Recipe("Toast", {"bread": 2}, 150, 5, 2, 20))
+    restored = pickle.loads(pickle.dumps(plan))
+    assert restored.weekly_summary() == plan.weekly_summary()
+    restored.add_meal("Monday", restored.plan["Monday"][0])
+    assert restored.daily_summary("Monday")["kcal"] == 300
+
+#############################################
+# Testy równoległej agregacji #
+#############################################
+
+def test_parallel_shopping_list_with_process_pool(recipes):
+    """Test aggregation across worker processes"""
+    result = parallel_shopping_list(recipes, max_workers=2)
+    assert result.get_items() == _reference(recipes)
+
+def test_parallel_shopping_list_with_shared_executor(recipes):
+    """Test reusing an existing executor for several aggregations"""
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        first = parallel_shopping_list(recipes, executor=pool)
+        second = parallel_shopping_list(recipes[:5], executor=pool)
+    assert first.get_items() == _reference(recipes)
+    assert second.get_items() == _reference(recipes[:5])
+
+def test_parallel_mealplans_shopping_list(recipes):
+    """Test aggregating many meal plans at once"""
+    plans = []
+    for i in range(6):
+        plan = MealPlan()
+        plan.add_meal("Monday", recipes[i])
+        plan.add_meal("Friday", recipes[i + 1])
+        plans.append(plan)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        result = parallel_mealplans_shopping_list(plans, executor=pool)
+    expected = _reference([r for i in range(6) for r in (recipes[i], recipes[i + 1])])
+    assert result.get_items() == expected
+
+def test_parallel_empty_and_invalid(recipes):
+    """Test empty input and an invalid worker count"""
+    assert parallel_shopping_list([]).get_items() == {}
+    with pytest.raises(ValueError):
+        parallel_shopping_list(recipes, max_workers=0)
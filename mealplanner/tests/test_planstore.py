@@ -0,0 +1,155 @@
+import random
+import numpy as np
+import pytest
+from src.mealplan import MealPlan
+from src.mealplan import DAYS
+from src.planstore import MealPlanStore
+from src.recipe import Recipe
+from src.recipebook import RecipeBook
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Breakfast", {"eggs": 2}, 180, 12, 10, 5),
+        Recipe("Lunch", {"rice": 100}, 150, 3, 1, 30),
+        Recipe("Dinner", {"chicken": 200}, 300, 30, 10, 0),
+    ]
+
+@pytest.fixture
+def plans(recipes):
+    first = MealPlan()
+    first.add_meal("Monday", recipes[0])
+    first.add_meal("Monday", recipes[1])
+    first.add_meal("Sunday", recipes[2])
+    second = MealPlan()
+    second.add_meal("Wednesday", recipes[2])
+    second.add_meal("Wednesday", recipes[2])
+    return [first, second, MealPlan()]
+
+#############################################
+# Testy podstawowych operacji #
+#############################################
+
+def test_add_plans_and_summaries_match(plans):
+    """Test that batch summaries match per-plan weekly summaries"""
+    store = MealPlanStore(capacity=1)
+    households = [store.add_plan(plan) for plan in plans]
+    assert households == [0, 1, 2]
+    assert len(store) == 3
+    assert store.meal_count == 5
+
+    summaries = store.weekly_summaries()
+    assert summaries.shape == (3, 7, 4)
+    for household, plan in zip(households, plans):
+        assert store.weekly_summary(household) == plan.weekly_summary()
+        expected = [
+            [plan.weekly_summary()[day][key] for key in ("kcal", "protein", "fat", "carbs")]
+            for day in DAYS
+        ]
+        assert summaries[household].tolist() == expected
+
+def test_add_meal_by_recipe_id(recipes):
+    """Test adding meals by ids of a shared recipe book"""
+    book = RecipeBook()
+    ids = book.add_many(recipes)
+    store = MealPlanStore(book)
+    household = store.add_household()
+    store.add_meal(household, "Friday", ids[2])
+    store.add_meal(household, "Friday", np.int64(ids[0]))
+    assert store.get_meals(household, "Friday") == [recipes[2], recipes[0]]
+    assert store.weekly_summary(household)["Friday"]["kcal"] == 480
+    store.remove_meal(household, "Friday", np.intp(ids[0]))
+    assert store.get_meals(household, "Friday") == [recipes[2]]
+
+@pytest.mark.parametrize(
+    "household,day,meal,error",
+    [
+        (5, "Monday", 0, ValueError),
+        (0, "Funday", 0, ValueError),
+        (0, None, 0, ValueError),
+        (0, "Monday", 99, ValueError),
+        (0, "Monday", "Toast", TypeError),
+    ],
+)
+def test_add_meal_invalid(recipes, household, day, meal, error):
+    """Test rejection of invalid households, days and meals"""
+    book = RecipeBook()
+    book.add(recipes[0])
+    store = MealPlanStore(book)
+    store.add_household()
+    with pytest.raises(error):
+        store.add_meal(household, day, meal)
+
+def test_remove_meal(plans, recipes):
+    """Test removing a single occurrence of a meal"""
+    store = MealPlanStore()
+    for plan in plans:
+        store.add_plan(plan)
+    store.remove_meal(1, "Wednesday", recipes[2])
+    store.remove_meal(0, "Monday", recipes[0])
+    assert store.get_meals(1, "Wednesday") == [recipes[2]]
+    assert store.get_meals(0, "Monday") == [recipes[1]]
+    assert store.weekly_summaries()[1, 2, 0] == 300
+    with pytest.raises(ValueError):
+        store.remove_meal(0, "Monday", recipes[0])
+    with pytest.raises(ValueError):
+        store.remove_meal(0, "Monday", Recipe("Other", {}, 1, 1, 1, 1))
+
+def test_clear_day(plans):
+    """Test clearing one household's day without touching others"""
+    store = MealPlanStore()
+    for plan in plans:
+        store.add_plan(plan)
+    store.clear_day(0, "Monday")
+    assert store.get_meals(0, "Monday") == []
+    assert store.meal_count == 3
+    assert store.weekly_summaries()[0, 6, 0] == 300
+    assert store.weekly_summaries()[1, 2, 0] == 600
+
+def test_random_edits_match_meal_plans(recipes):
+    """Test per-household slot bookkeeping against plain MealPlans"""
+    rng = random.Random(3)
+    store = MealPlanStore(capacity=2)
+    plans = [MealPlan() for _ in range(5)]
+    for _ in range(5):
+        store.add_household()
+    for _ in range(600):
+        household, day = rng.randrange(5), rng.choice(DAYS)
+        action = rng.random()
+        if action < 0.6:
+            meal = rng.choice(recipes)
+            store.add_meal(household, day, meal)
+            plans[household].add_meal(day, meal)
+        elif action < 0.95 and plans[household].get_meals(day):
+            meal = rng.choice(list(plans[household].get_meals(day)))
+            store.remove_meal(household, day, meal)
+            plans[household].remove_meal(day, meal)
+        else:
+            store.clear_day(household, day)
+            plans[household].clear_day(day)
+    for household, plan in enumerate(plans):
+        assert store.weekly_summary(household) == plan.weekly_summary()
+        for day in DAYS:
+            assert sorted(meal.name for meal in store.get_meals(household, day)) == sorted(meal.name for meal in plan.get_meals(day))
+    assert store.meal_count == sum(len(meals) for plan in plans for meals in plan.plan.values())
+
+def test_empty_store():
+    """Test summaries of a store without meals"""
+    store = MealPlanStore()
+    assert store.weekly_summaries().shape == (0, 7, 4)
+    store.add_household()
+    assert not np.any(store.weekly_summaries())
+
+def test_summaries_follow_recipe_edits(recipes):
+    """Test that recipes edited in place are summarized with their new nutrients"""
+    store = MealPlanStore()
+    household = store.add_household()
+    store.add_meal(household, "Monday", recipes[0])
+    recipes[0].update_kcal(200)
+    assert store.weekly_summaries()[household, 0, 0] == 200
+    recipes[0].scale_recipe(2)
+    assert store.weekly_summary(household)["Monday"]["kcal"] == 400
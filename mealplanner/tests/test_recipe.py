@@ -1,5 +1,10 @@
+import copy
+import json
 import pytest
-from src.recipe import Recipe
+from src.aggregation import aggregate_shopping_list
+from src.mealplan import MealPlan
+from src.recipe import Recipe, iter_recipes_jsonl
+from src.shoppinglist import ShoppingList, generate_shopping_list
 
 
 ################################################################
@@ -228,6 +233,8 @@ def test_recipe_scaling():
     # Test invalid scaling
     with pytest.raises(ValueError):
         r.scale_recipe(0)
+    with pytest.raises(ValueError):
+        r.scale_recipe(float("nan"))
 
 def test_recipe_splitting():
     """Testy sprawdzające dzielenie przepisu na porcje"""
@@ -238,6 +245,13 @@ def test_recipe_splitting():
     assert r_split.kcal == 90
     assert r_split.ingredients["banana"] == 0.5
 
+    # Porcja jest niezależną kopią przepisu
+    assert type(r_split) is Recipe
+    r.update_kcal(400)
+    r_split.update_protein(1)
+    assert r_split.kcal == 90
+    assert r.protein == 5
+
     with pytest.raises(ValueError):
         r.split_into_portions(0)
 
@@ -303,4 +317,221 @@ def test_string_representations():
     assert "Recipe: NiceMeal" in detailed
     assert "- pasta: 200g" in detailed
     assert "- kcal: 300" in detailed
-    assert "- protein: 10g" in detailed
\ No newline at end of file
+    assert "- protein: 10g" in detailed
+
+################################################################
+# 10. TESTY WERSJONOWANIA PRZEPISÓW                           #
+################################################################
+
+@pytest.mark.parametrize(
+    "method,args",
+    [
+        ("add_ingredient", ("strawberry", 50)),
+        ("remove_ingredient", ("banana",)),
+        ("update_ingredient_quantity", ("milk", 100)),
+        ("update_kcal", (200,)),
+        ("update_protein", (7,)),
+        ("update_fat", (4,)),
+        ("update_carbs", (40,)),
+        ("scale_recipe", (2,)),
+    ],
+)
+def test_modifications_bump_version(method, args):
+    """Testy sprawdzające, że każda modyfikacja zwiększa wersję przepisu"""
+    r = Recipe("Smoothie", {"banana": 1, "milk": 200}, 180, 5, 3, 35)
+    getattr(r, method)(*args)
+    assert r.version == 1
+
+def test_noop_removal_keeps_version():
+    """Test sprawdzający, że usunięcie nieistniejącego składnika nie zmienia wersji"""
+    r = Recipe("Smoothie", {"banana": 1}, 180, 5, 3, 35)
+    r.remove_ingredient("apple")
+    assert r.version == 0
+
+
+################################################################
+# 11. TESTY SERIALIZACJI                                      #
+################################################################
+
+def test_dict_round_trip():
+    """Test sprawdzający konwersję przepisu do słownika i z powrotem"""
+    r = Recipe("Smoothie", {"banana": 1, "milk": 200}, 180, 5, 3, 35)
+    data = r.to_dict()
+    assert data == {
+        "name": "Smoothie",
+        "ingredients": {"banana": 1, "milk": 200},
+        "kcal": 180,
+        "protein": 5,
+        "fat": 3,
+        "carbs": 35,
+    }
+    assert Recipe.from_dict(data) == r
+
+def test_from_dict_missing_field():
+    """Test sprawdzający reakcję na brakujące pole w słowniku"""
+    with pytest.raises(ValueError, match="kcal"):
+        Recipe.from_dict({"name": "X", "ingredients": {}, "protein": 1, "fat": 1, "carbs": 1})
+
+def test_iter_recipes_jsonl(tmp_path):
+    """Test sprawdzający leniwe wczytywanie przepisów z pliku JSONL"""
+    path = tmp_path / "recipes.jsonl"
+    path.write_text(
+        json.dumps(Recipe("A", {"x": 1}, 1, 1, 1, 1).to_dict())
+        + "\n\n"
+        + json.dumps(Recipe("B", {"y": 2}, 2, 2, 2, 2).to_dict())
+        + "\n",
+        encoding="utf-8",
+    )
+    recipes = iter_recipes_jsonl(str(path))
+    assert next(recipes).name == "A"
+    assert next(recipes).ingredients["y"] == 2
+    assert list(recipes) == []
+
+@pytest.mark.parametrize(
+    "line",
+    ["not json", "[1, 2]", '{"name": "X"}', '{"name": "", "ingredients": {}, "kcal": 1, "protein": 1, "fat": 1, "carbs": 1}'],
+)
+def test_iter_recipes_jsonl_invalid_line(tmp_path, line):
+    """Test sprawdzający zgłoszenie błędu z numerem niepoprawnej linii"""
+    path = tmp_path / "recipes.jsonl"
+    valid = json.dumps(Recipe("A", {"x": 1}, 1, 1, 1, 1).to_dict())
+    path.write_text(valid + "\n" + line + "\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_recipes_jsonl(str(path)))
+
+
+################################################################
+# 12. TESTY POWIADOMIEŃ O ZMIANACH                            #
+################################################################
+
+def test_listeners_receive_changes():
+    """Test sprawdzający powiadomienia słuchaczy o modyfikacjach przepisu"""
+    r = Recipe("Smoothie", {"banana": 1, "milk": 200}, 180, 5, 3, 35)
+    changes = []
+    listener = lambda recipe, change, detail: changes.append((recipe, change, detail))
+    r.subscribe(listener)
+
+    r.add_ingredient("strawberry", 50)
+    r.update_ingredient_quantity("milk", 100)
+    r.remove_ingredient("banana")
+    r.remove_ingredient("apple")
+    r.update_kcal(200)
+    r.scale_recipe(2)
+    assert changes == [
+        (r, "ingredient", ("strawberry", None, 50)),
+        (r, "ingredient", ("milk", 200, 100)),
+        (r, "ingredient", ("banana", 1, None)),
+        (r, "nutrients", None),
+        (r, "scale", 2),
+    ]
+
+    r.unsubscribe(listener)
+    r.update_fat(1)
+    assert len(changes) == 5
+    with pytest.raises(ValueError):
+        r.unsubscribe(listener)
+
+def test_listeners_are_not_copied():
+    """Test sprawdzający, że kopia przepisu nie dziedziczy słuchaczy"""
+    r = Recipe("Smoothie", {"banana": 1}, 180, 5, 3, 35)
+    changes = []
+    r.subscribe(lambda *args: changes.append(args))
+    clone = copy.deepcopy(r)
+    clone.update_kcal(1)
+    assert changes == []
+    assert clone == Recipe("Smoothie", {"banana": 1}, 1, 5, 3, 35)
+
+
+################################################################
+# 13. TESTY WIDOKÓW SKALOWANYCH PRZEPISÓW                     #
+################################################################
+
+def test_scaled_view_reads_base_lazily():
+    """Test sprawdzający wartości widoku i widoczność zmian przepisu bazowego"""
+    base = Recipe("Soup", {"water": 500, "carrot": 100}, 200, 10, 5, 30)
+    view = base.scaled(3)
+    assert isinstance(view, Recipe)
+    assert view.name == "Soup"
+    assert dict(view.ingredients) == {"water": 1500, "carrot": 300}
+    assert view.total_nutrients() == {"kcal": 600, "protein": 30, "fat": 15, "carbs": 90}
+    assert view == Recipe("Soup", {"carrot": 300, "water": 1500}, 600, 30, 15, 90)
+
+    base.update_ingredient_quantity("carrot", 50)
+    base.update_kcal(100)
+    assert view.ingredients["carrot"] == 150
+    assert view.kcal == 300
+    assert view.total_weight() == 1650
+
+def test_scaled_views_compose():
+    """Test sprawdzający składanie widoków zamiast ich zagnieżdżania"""
+    base = Recipe("Soup", {"water": 500}, 200, 10, 5, 30)
+    portion = base.portion_view(4)
+    double = portion.scaled(2)
+    assert portion.name == "Soup (1/4 portion)"
+    assert double.base is base and double.factor == 0.5
+    assert double.name == "Soup (1/4 portion)"
+    assert double.ingredients["water"] == 250
+    assert base.kcal == 200
+
+def test_scaled_view_is_read_only_except_scaling():
+    """Test sprawdzający, że widok nie modyfikuje przepisu bazowego"""
+    base = Recipe("Soup", {"water": 500}, 200, 10, 5, 30)
+    view = base.scaled(2)
+    for method, args in [
+        ("add_ingredient", ("salt", 1)),
+        ("remove_ingredient", ("water",)),
+        ("update_ingredient_quantity", ("water", 1)),
+        ("update_kcal", (1,)),
+    ]:
+        with pytest.raises(TypeError):
+            getattr(view, method)(*args)
+    with pytest.raises(TypeError):
+        view.ingredients["water"] = 1
+    with pytest.raises(ValueError):
+        base.scaled(0)
+    with pytest.raises(ValueError):
+        base.portion_view(0)
+    with pytest.raises(ValueError):
+        view.scale_recipe(float("nan"))
+
+    view.scale_recipe(1.5)
+    assert view.kcal == 600
+    assert base.kcal == 200
+
+def test_scaled_view_forwards_base_changes():
+    """Test sprawdzający przekazywanie zdarzeń przepisu bazowego słuchaczom widoku"""
+    base = Recipe("Soup", {"water": 500}, 200, 10, 5, 30)
+    view = base.scaled(2)
+    changes = []
+    listener = lambda *args: changes.append(args)
+    view.subscribe(listener)
+    base.add_ingredient("salt", 5)
+    base.update_fat(1)
+    view.scale_recipe(3)
+    assert changes == [
+        (view, "ingredient", ("salt", None, 10)),
+        (view, "nutrients", None),
+        (view, "scale", 3),
+    ]
+    view.unsubscribe(listener)
+    assert not base._listeners
+    restored = copy.deepcopy(view)
+    assert restored == view and restored.base is not base
+
+def test_scaled_view_in_plans_and_lists():
+    """Test sprawdzający użycie widoków w planie posiłków i liście zakupów"""
+    base = Recipe("Soup", {"water": 500, "carrot": 100}, 200, 10, 5, 30)
+    views = [base.scaled(factor) for factor in (0.5, 1, 2)]
+    plan = MealPlan()
+    for view in views:
+        plan.add_meal("Monday", view)
+    assert plan.daily_summary("Monday")["kcal"] == 700
+    base.update_kcal(100)
+    assert plan.daily_summary("Monday")["kcal"] == 350
+
+    expected = {"water": 1750, "carrot": 350}
+    assert generate_shopping_list(views) == expected
+    assert aggregate_shopping_list(views + [base], [1, 1, 1, 2]) == {"water": 2750, "carrot": 550}
+    sl = ShoppingList()
+    sl.add_from_recipe(views[2])
+    assert sl.get_items() == {"water": 1000, "carrot": 200}
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.recipebook import NUTRIENTS, RecipeBook
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [
+        Recipe("Toast", {"bread": 2}, 150, 5, 2, 20),
+        Recipe("Pancake", {"flour": 100}, 200, 6, 8, 30),
+        Recipe("Salad", {"lettuce": 50}, 100, 3, 1, 15),
+    ]
+
+@pytest.fixture
+def book(recipes):
+    book = RecipeBook(capacity=1)
+    book.add_many(recipes)
+    return book
+
+#############################################
+# Testy dodawania przepisów #
+#############################################
+
+def test_add_assigns_dense_ids(book, recipes):
+    """Test that recipes get consecutive ids and can be fetched back"""
+    assert len(book) == 3
+    assert [book.id_of(r) for r in recipes] == [0, 1, 2]
+    assert book.get(1) is recipes[1]
+
+def test_add_same_recipe_returns_existing_id(book, recipes):
+    """Test that adding the same object twice does not duplicate it"""
+    assert book.add(recipes[0]) == 0
+    assert len(book) == 3
+
+def test_add_invalid_type():
+    """Test that only Recipe instances are accepted"""
+    with pytest.raises(TypeError):
+        RecipeBook().add("not_a_recipe")
+
+def test_invalid_ids(book):
+    """Test lookups with unknown ids or recipes"""
+    with pytest.raises(ValueError):
+        book.get(3)
+    with pytest.raises(ValueError):
+        book.id_of(Recipe("Other", {}, 1, 1, 1, 1))
+    with pytest.raises(ValueError):
+        book.summary([0, 5])
+
+def test_nutrients_columns(book):
+    """Test the columnar layout of stored nutrients"""
+    columns = book.nutrients()
+    assert columns.shape == (3, len(NUTRIENTS))
+    assert columns[:, 0].tolist() == [150, 200, 100]
+    assert not columns.flags.writeable
+
+#############################################
+# Testy podsumowań #
+#############################################
+
+def test_summary_counts_repeats(book):
+    """Test summing a subset of recipes including repeated ids"""
+    assert book.summary([0, 0, 2]) == {
+        "kcal": 400, "protein": 13, "fat": 5, "carbs": 55,
+    }
+    assert book.summary([]) == {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0}
+
+def test_summaries_per_group(book):
+    """Test summing several groups at once, including empty ones"""
+    result = book.summaries([[0, 1], [], [2, 2, 2]])
+    assert result.shape == (3, 4)
+    assert result[0].tolist() == [350, 11, 10, 50]
+    assert result[1].tolist() == [0, 0, 0, 0]
+    assert result[2].tolist() == [300, 9, 3, 45]
+    assert np.array_equal(book.summaries([[], []]), np.zeros((2, 4)))
+
+def test_refresh_after_recipe_update(book, recipes):
+    """Test that refresh picks up in-place recipe modifications"""
+    recipes[0].update_kcal(500)
+    assert book.summary([0])["kcal"] == 150
+    book.refresh(0)
+    assert book.summary([0])["kcal"] == 500
+    recipes[1].scale_recipe(2)
+    book.refresh()
+    assert book.summary([1])["kcal"] == 400
+
+#############################################
+# Testy integracji z MealPlan #
+#############################################
+
+def test_plan_summaries_match_mealplan(recipes):
+    """Test that vectorized plan summaries match MealPlan results"""
+    plan = MealPlan()
+    plan.add_meal("Monday", recipes[0])
+    plan.add_meal("Monday", recipes[1])
+    plan.add_meal("Wednesday", recipes[2])
+    plan.add_meal("Sunday", recipes[0])
+
+    book = RecipeBook()
+    assert book.daily_summary(plan, "Monday") == plan.daily_summary("Monday")
+    assert book.weekly_summary(plan) == plan.weekly_summary()
+    assert len(book) == 3
+
+def test_plan_summaries_follow_recipe_changes(recipes):
+    """Test that plan summaries reload recipes modified in place"""
+    plan = MealPlan()
+    plan.add_meal("Monday", recipes[0])
+    plan.add_meal("Tuesday", recipes[1].scaled(2))
+    book = RecipeBook()
+    book.weekly_summary(plan)
+    recipes[0].update_kcal(500)
+    recipes[1].update_protein(7)
+    assert book.daily_summary(plan, "Monday")["kcal"] == 500
+    assert book.weekly_summary(plan) == plan.weekly_summary()
+    assert book.weekly_summary(plan)["Tuesday"]["protein"] == 14
+
+def test_plan_summary_invalid_day():
+    """Test the vectorized daily summary for an unknown day"""
+    with pytest.raises(ValueError):
+        RecipeBook().daily_summary(MealPlan(), "Funday")
@@ -0,0 +1,179 @@
+import asyncio
+import json
+from unittest.mock import patch
+import pytest
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.server import SummaryService
+
+#############################################
+# Fixtures #
+#############################################
+
+PASTA = Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80).to_dict()
+SALAD = Recipe("Salad", {"lettuce": 100, "tomato": 50}, 150, 5, 8, 12).to_dict()
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def prepared_service():
+    service = SummaryService()
+    for request in (
+        {"op": "add_recipe", "recipe": PASTA},
+        {"op": "add_recipe", "recipe": SALAD},
+        {"op": "create_plan", "plan": "home"},
+    ):
+        assert (await service.handle(request))["ok"]
+    return service
+
+#############################################
+# Testy operacji serwisu #
+#############################################
+
+def test_mutations_and_summaries():
+    """Test adding and removing meals followed by summaries"""
+    async def scenario():
+        service = await prepared_service()
+        add = {"op": "add_meal", "plan": "home", "day": "Monday"}
+        pasta = await service.handle({**add, "recipe": "Pasta"})
+        await service.handle({**add, "recipe": "Salad"})
+        daily = await service.handle({"id": 7, "op": "daily_summary", "plan": "home", "day": "Monday"})
+        assert daily == {"id": 7, "ok": True, "result": {"kcal": 650, "protein": 25, "fat": 18, "carbs": 92}}
+
+        removed = await service.handle({"op": "remove_meal", "plan": "home", "meal": pasta["result"]})
+        assert removed["result"] == "Pasta"
+        weekly = await service.handle({"op": "weekly_summary", "plan": "home"})
+        assert weekly["result"]["Monday"]["kcal"] == 150
+        shopping = await service.handle({"op": "shopping_list", "plan": "home"})
+        assert shopping["result"] == {"lettuce": 100, "tomato": 50}
+    run(scenario())
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        {"op": "explode"},
+        {"op": "weekly_summary", "plan": "missing"},
+        {"op": "daily_summary", "plan": "home", "day": "Someday"},
+        {"op": "add_meal", "plan": "home", "day": "Monday", "recipe": "Missing"},
+        {"op": "add_meal", "plan": "home", "day": "Someday", "recipe": "Pasta"},
+        {"op": "remove_meal", "plan": "home", "meal": 99},
+        {"op": "add_recipe", "recipe": {"name": "Broken"}},
+        {"op": "add_recipe", "recipe": {**PASTA, "name": "Odd", "ingredients": [["a", 1]]}},
+        {"op": "add_recipe", "recipe": {**PASTA, "name": "Odd", "kcal": "many"}},
+        {"op": "add_recipe", "recipe": "Pasta"},
+        {"op": "add_recipe", "recipe": PASTA},
+        {"op": "create_plan", "plan": "home"},
+    ],
+)
+def test_invalid_requests(request_):
+    """Test that invalid requests produce error responses"""
+    async def scenario():
+        service = await prepared_service()
+        response = await service.handle({"id": "x", **request_})
+        assert response["id"] == "x"
+        assert response["ok"] is False
+        assert response["error"]
+    run(scenario())
+
+def test_unexpected_errors_are_answered():
+    """Test that an unexpected exception still produces an error response"""
+    async def scenario():
+        service = await prepared_service()
+        with patch.object(MealPlan, "add_meal", side_effect=AttributeError("boom")):
+            response = await service.handle({"id": 3, "op": "add_meal", "plan": "home", "day": "Monday", "recipe": "Pasta"})
+        assert response == {"id": 3, "ok": False, "error": "AttributeError: boom"}
+    run(scenario())
+
+def test_clear_day_forgets_meal_ids():
+    """Test that meal ids of a cleared day are released and no longer valid"""
+    async def scenario():
+        service = await prepared_service()
+        add = {"op": "add_meal", "plan": "home", "recipe": "Pasta"}
+        monday = await service.handle({**add, "day": "Monday"})
+        tuesday = await service.handle({**add, "day": "Tuesday"})
+        await service.handle({"op": "clear_day", "plan": "home", "day": "Monday"})
+        assert list(service._meals) == [tuesday["result"]]
+        assert len(service._meal_ids) == 1
+        response = await service.handle({"op": "remove_meal", "plan": "home", "meal": monday["result"]})
+        assert response["ok"] is False
+    run(scenario())
+
+#############################################
+# Testy łączenia zapytań #
+#############################################
+
+def test_concurrent_summaries_are_coalesced():
+    """Test that summaries requested in one tick are computed once per plan"""
+    async def scenario():
+        service = await prepared_service()
+        await service.handle({"op": "create_plan", "plan": "office"})
+        await service.handle({"op": "add_meal", "plan": "home", "day": "Friday", "recipe": "Pasta"})
+        requests = [
+            {"op": "daily_summary", "plan": "home", "day": "Friday"},
+            {"op": "weekly_summary", "plan": "home"},
+            {"op": "weekly_summary", "plan": "office"},
+        ] * 20
+        with patch.object(MealPlan, "weekly_summary", autospec=True, side_effect=MealPlan.weekly_summary) as summary:
+            responses = await asyncio.gather(*(service.handle(r) for r in requests))
+        assert summary.call_count == 2
+        assert service.batches == 1
+        assert responses[0]["result"]["kcal"] == 500
+        assert responses[1]["result"]["Friday"]["kcal"] == 500
+        assert responses[2]["result"]["Friday"]["kcal"] == 0
+    run(scenario())
+
+#############################################
+# Testy protokołu sieciowego #
+#############################################
+
+def test_json_lines_protocol_over_tcp():
+    """Test pipelined requests from several clients over TCP"""
+    async def client(port, requests):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b"\n")
+        writer.write(b"not json\n")
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        return responses
+
+    async def scenario():
+        service = await prepared_service()
+        server = await service.serve()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            setup = await client(port, [{"id": 1, "op": "add_meal", "plan": "home", "day": "Monday", "recipe": "Pasta"}])
+            assert setup[0] == {"id": 1, "ok": True, "result": 0}
+            assert setup[1]["ok"] is False
+
+            summaries = [{"id": i, "op": "weekly_summary", "plan": "home"} for i in range(10)]
+            results = await asyncio.gather(*(client(port, summaries) for _ in range(5)))
+        for responses in results:
+            ok = [r for r in responses if r["ok"]]
+            assert sorted(r["id"] for r in ok) == list(range(10))
+            assert all(r["result"]["Monday"]["kcal"] == 500 for r in ok)
+        assert service.computations < 50
+    run(scenario())
+
+def test_overlong_request_line_is_answered():
+    """Test that a line over the read limit gets an error and the connection keeps serving"""
+    async def scenario():
+        service = await prepared_service()
+        server = await service.serve()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(json.dumps({"id": 1, "op": "weekly_summary", "plan": "home"}).encode() + b"\n")
+            writer.write(b'{"id": 2, "pad": "' + b"x" * 200_000 + b'"}\n')
+            writer.write(json.dumps({"id": 3, "op": "create_plan", "plan": "work"}).encode() + b"\n")
+            await writer.drain()
+            writer.write_eof()
+            responses = [json.loads(line) async for line in reader]
+            writer.close()
+        assert len(responses) == 3
+        assert {"id": None, "ok": False, "error": "Request too long"} in responses
+        assert sorted(r["id"] for r in responses if r["ok"]) == [1, 3]
+        assert "work" in service.plans
+    run(scenario())
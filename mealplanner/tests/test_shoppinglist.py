@@ -1,8 +1,10 @@
+import gc
+import json
 import pytest
 from unittest.mock import Mock
-from src.shoppinglist import generate_shopping_list, ShoppingList
+from src.shoppinglist import generate_shopping_list, stream_shopping_list, ShoppingList
 from src.mealplan import MealPlan
-from src.recipe import Recipe
+from src.recipe import Recipe, iter_recipes_jsonl
 
 #############################################
 # Fixtures #
@@ -185,8 +187,14 @@ def test_get_categorized_items():
     """Test item categorization"""
     sl = ShoppingList()
     sl.add_item("flour", 500)
+    sl.add_item("cherry tomatoes", 250)
+    sl.add_item("chicken breast", 300)
+    sl.add_item("unobtainium", 1)
     categories = sl.get_categorized_items()
-    assert "flour" in categories["uncategorized"]
+    assert categories["pantry"] == {"flour": 500}
+    assert categories["produce"] == {"cherry tomatoes": 250}
+    assert categories["meat"] == {"chicken breast": 300}
+    assert categories["uncategorized"] == {"unobtainium": 1}
 
 def test_has_item():
     """Test checking item existence"""
@@ -287,4 +295,143 @@ def test_integration_mealplan_shoppinglist():
     plan.add_meal("Tuesday", recipe2)
     sl = ShoppingList()
     sl.add_from_mealplan(plan)
-    assert sl.get_items() == {"a": 4, "b": 2, "c": 4}
\ No newline at end of file
+    assert sl.get_items() == {"a": 4, "b": 2, "c": 4}
+#############################################
+# Testy strumieniowego generowania listy #
+#############################################
+
+def test_stream_shopping_list_from_generator(sample_recipes):
+    """Test aggregating a lazily generated stream of recipes"""
+    stream = (recipe for _ in range(3) for recipe in sample_recipes)
+    result = stream_shopping_list(stream)
+    assert result == {
+        ingredient: quantity * 3
+        for ingredient, quantity in generate_shopping_list(sample_recipes).items()
+    }
+
+def test_stream_shopping_list_progress(basic_recipe):
+    """Test periodic and final progress callbacks"""
+    reported = []
+    result = stream_shopping_list(
+        (basic_recipe for _ in range(7)), progress=reported.append, progress_every=3
+    )
+    assert result == {"bread": 14}
+    assert reported == [3, 6, 7]
+
+    reported.clear()
+    stream_shopping_list(iter([basic_recipe] * 6), reported.append, progress_every=3)
+    assert reported == [3, 6]
+
+    reported.clear()
+    assert stream_shopping_list(iter([]), reported.append) == {}
+    assert reported == [0]
+
+def test_stream_shopping_list_invalid_interval(basic_recipe):
+    """Test rejection of a non-positive progress interval"""
+    with pytest.raises(ValueError):
+        stream_shopping_list([basic_recipe], progress_every=0)
+
+def test_stream_shopping_list_from_jsonl(tmp_path, sample_recipes):
+    """Test streaming recipes straight from a JSON Lines export"""
+    path = tmp_path / "orders.jsonl"
+    with open(path, "w", encoding="utf-8") as file:
+        for recipe in sample_recipes * 2:
+            file.write(json.dumps(recipe.to_dict()) + "\n")
+    result = stream_shopping_list(iter_recipes_jsonl(str(path)))
+    assert result == generate_shopping_list(sample_recipes * 2)
+
+#############################################
+# Testy listy zakupów śledzącej plan posiłków #
+#############################################
+
+def rebuilt(plan):
+    expected = ShoppingList()
+    expected.add_from_mealplan(plan)
+    return expected.get_items()
+
+def test_tracked_list_follows_plan_edits():
+    """Test that add_meal, remove_meal and clear_day are applied as deltas"""
+    pasta = Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+    salad = Recipe("Salad", {"lettuce": 100, "tomato": 50}, 150, 5, 8, 12)
+    plan = MealPlan()
+    plan.add_meal("Monday", pasta)
+
+    sl = ShoppingList()
+    sl.track_mealplan(plan)
+    assert sl.get_items() == {"pasta": 200, "tomato": 100}
+
+    handle = plan.add_meal("Tuesday", salad)
+    plan.add_meal("Tuesday", pasta)
+    assert sl.get_items() == rebuilt(plan) == {"pasta": 400, "tomato": 250, "lettuce": 100}
+    plan.remove_meal_by_handle(handle)
+    assert sl.get_items() == {"pasta": 400, "tomato": 200}
+    plan.remove_meal("Monday", pasta)
+    plan.clear_day("Tuesday")
+    assert sl.get_items() == rebuilt(plan) == {}
+
+def test_tracked_list_follows_recipe_changes():
+    """Test ingredient changes and scaling of recipes planned several times"""
+    pasta = Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+    plan = MealPlan()
+    sl = ShoppingList()
+    sl.track_mealplan(plan)
+    plan.add_meal("Monday", pasta)
+    plan.add_meal("Friday", pasta)
+
+    pasta.update_ingredient_quantity("pasta", 250)
+    pasta.add_ingredient("basil", 5)
+    pasta.remove_ingredient("tomato")
+    assert sl.get_items() == rebuilt(plan) == {"pasta": 500, "basil": 10}
+    pasta.scale_recipe(2)
+    assert sl.get_items() == pytest.approx(rebuilt(plan))
+
+    plan.clear_day("Monday")
+    plan.clear_day("Friday")
+    pasta.add_ingredient("cheese", 30)
+    assert sl.get_items() == {}
+
+def test_tracked_list_keeps_items_added_by_hand():
+    """Test that removing meals leaves quantities added by hand in place"""
+    pasta = Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+    plan = MealPlan()
+    sl = ShoppingList()
+    sl.add_item("pasta", 50)
+    sl.track_mealplan(plan)
+    plan.add_meal("Monday", pasta)
+    sl.add_item("salt", 3)
+    pasta.add_ingredient("salt", 0.1)
+    pasta.scale_recipe(3)
+    sl.remove_item("tomato")
+    sl.add_item("tomato", 40)
+    plan.clear_day("Monday")
+    assert sl.get_items() == pytest.approx({"pasta": 50, "salt": 3, "tomato": 40})
+
+def test_tracked_list_is_not_kept_alive_by_plan():
+    """Test that a dropped tracked list is released by its plan and recipes"""
+    pasta = Recipe("Pasta", {"pasta": 200}, 500, 20, 10, 80)
+    plan = MealPlan()
+    plan.add_meal("Monday", pasta)
+    sl = ShoppingList()
+    sl.track_mealplan(plan)
+    listeners = len(pasta._listeners)
+    del sl
+    gc.collect()
+    assert not plan._listeners
+    assert len(pasta._listeners) == listeners - 1
+    plan.add_meal("Tuesday", pasta)
+
+def test_untrack_mealplan_stops_updates():
+    """Test that an untracked list keeps its items and ignores later edits"""
+    pasta = Recipe("Pasta", {"pasta": 200}, 500, 20, 10, 80)
+    plan = MealPlan()
+    plan.add_meal("Monday", pasta)
+    sl = ShoppingList()
+    sl.track_mealplan(plan)
+    with pytest.raises(ValueError):
+        sl.track_mealplan(MealPlan())
+    sl.untrack_mealplan()
+    plan.add_meal("Tuesday", pasta)
+    pasta.add_ingredient("salt", 1)
+    assert sl.get_items() == {"pasta": 200}
+    with pytest.raises(ValueError):
+        sl.untrack_mealplan()
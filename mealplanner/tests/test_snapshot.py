@@ -0,0 +1,98 @@
+import gc
+import pickle
+import weakref
+import pytest
+from src.recipe import Recipe
+from src.snapshot import RecipeSnapshot, intern_snapshot, snapshot, unique_snapshots
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipe():
+    return Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+
+#############################################
+# Testy niezmienności i haszowania #
+#############################################
+
+def test_snapshot_copies_recipe_content(recipe):
+    """Test that a snapshot holds the recipe content and survives its changes"""
+    frozen = RecipeSnapshot.from_recipe(recipe)
+    recipe.update_kcal(900)
+    recipe.add_ingredient("cheese", 30)
+    assert frozen.kcal == 500
+    assert dict(frozen.ingredients) == {"pasta": 200, "tomato": 100}
+    assert frozen.total_nutrients() == {"kcal": 500, "protein": 20, "fat": 10, "carbs": 80}
+    assert frozen.to_recipe() == Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+
+def test_snapshot_is_immutable(recipe):
+    """Test that snapshot fields cannot be set, deleted or added"""
+    frozen = RecipeSnapshot.from_recipe(recipe)
+    with pytest.raises(AttributeError):
+        frozen.kcal = 0
+    with pytest.raises(AttributeError):
+        del frozen.name
+    with pytest.raises(AttributeError):
+        frozen.extra = 1
+
+def test_snapshot_equality_and_hash(recipe):
+    """Test content-based equality, ignoring ingredient order"""
+    first = RecipeSnapshot.from_recipe(recipe)
+    reordered = RecipeSnapshot("Pasta", {"tomato": 100, "pasta": 200}, 500, 20, 10, 80)
+    other = RecipeSnapshot("Pasta", {"tomato": 100, "pasta": 200}, 501, 20, 10, 80)
+    assert first == reordered and hash(first) == hash(reordered)
+    assert first != other
+    assert first != recipe
+    assert len({first, reordered, other}) == 2
+
+def test_snapshot_pickle_round_trip(recipe):
+    """Test that pickled snapshots keep their content and hash"""
+    frozen = RecipeSnapshot.from_recipe(recipe)
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert restored == frozen
+    assert hash(restored) == hash(frozen)
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("", {}, 1, 1, 1, 1),
+        ("X", {}, -1, 1, 1, 1),
+        ("X", {"a": [1]}, 1, 1, 1, 1),
+    ],
+)
+def test_invalid_snapshot(args):
+    """Test rejection of invalid snapshot content"""
+    with pytest.raises((ValueError, TypeError)):
+        RecipeSnapshot(*args)
+
+#############################################
+# Testy współdzielenia i deduplikacji #
+#############################################
+
+def test_interned_snapshots_are_shared(recipe):
+    """Test that equal recipes share one interned snapshot"""
+    copy = Recipe("Pasta", {"tomato": 100, "pasta": 200}, 500, 20, 10, 80)
+    assert snapshot(recipe) is snapshot(copy)
+    different = Recipe("Pasta", {"pasta": 200}, 500, 20, 10, 80)
+    assert snapshot(different) is not snapshot(recipe)
+
+def test_interned_snapshots_are_released():
+    """Test that the intern table does not keep unused snapshots alive"""
+    first = intern_snapshot(RecipeSnapshot("Temp", {"x": 1}, 1, 1, 1, 1))
+    reference = weakref.ref(first)
+    del first
+    gc.collect()
+    assert reference() is None
+    second = RecipeSnapshot("Temp", {"x": 1}, 1, 1, 1, 1)
+    assert intern_snapshot(second) is second
+
+def test_unique_snapshots_preserves_first_seen_order():
+    """Test linear deduplication of many recipes"""
+    recipes = [
+        Recipe(f"R{i % 50}", {"x": i % 50}, i % 50, 0, 0, 0) for i in range(5000)
+    ]
+    unique = unique_snapshots(recipes)
+    assert [item.name for item in unique] == [f"R{i}" for i in range(50)]
+    assert unique_snapshots([]) == []
@@ -0,0 +1,48 @@
+import pytest
+from src.synthetic import (
+    iter_recipes,
+    make_mealplan,
+    make_recipes,
+    make_shopping_list,
+    sample_meals,
+)
+
+#############################################
+# Testy generatorów danych syntetycznych #
+#############################################
+
+def test_recipes_are_reproducible():
+    """Test that the same seed yields the same recipes"""
+    first = make_recipes(50, seed=7)
+    assert first == make_recipes(50, seed=7)
+    assert first != make_recipes(50, seed=8)
+    assert all(2 <= len(recipe.ingredients) <= 8 for recipe in first)
+
+def test_iter_recipes_is_lazy():
+    """Test that recipes are generated on demand"""
+    recipes = iter_recipes(10**9, ingredients=20, per_recipe=(1, 3))
+    assert next(recipes).name == "recipe-0"
+    assert next(recipes).name == "recipe-1"
+
+@pytest.mark.parametrize(
+    "options",
+    [{"count": -1}, {"count": 1, "per_recipe": (0, 2)}, {"count": 1, "ingredients": 3, "per_recipe": (2, 4)}],
+)
+def test_invalid_recipe_options(options):
+    """Test rejection of impossible generator settings"""
+    with pytest.raises(ValueError):
+        make_recipes(**options)
+
+def test_plans_and_shopping_lists():
+    """Test plan and shopping list generators"""
+    recipes = make_recipes(20)
+    meals = sample_meals(recipes, 100, seed=1)
+    assert meals == sample_meals(recipes, 100, seed=1)
+    plan = make_mealplan(recipes, 100, seed=1)
+    assert sum(len(day) for day in plan.plan.values()) == 100
+    assert len(plan.get_meals("Monday")) == 15
+    shopping_list = make_shopping_list(300, seed=2)
+    assert shopping_list.get_total_items() == 300
+    assert shopping_list.export() == make_shopping_list(300, seed=2).export()
+    with pytest.raises(ValueError):
+        sample_meals([], 1)
@@ -0,0 +1,228 @@
+import pickle
+import threading
+import pytest
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList
+from src.threadsafe import ConcurrentMealPlan, ConcurrentShoppingList
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def recipes():
+    return [Recipe(f"R{i}", {f"ing{i}": 10, "salt": 1}, 100 + i, i, 1, 2) for i in range(10)]
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+#############################################
+# Testy planu posiłków #
+#############################################
+
+def test_behaves_like_mealplan(recipes):
+    """Test the single-threaded MealPlan API"""
+    plan = ConcurrentMealPlan()
+    handle = plan.add_meal("Monday", recipes[0])
+    plan.add_meal("Monday", recipes[1])
+    plan.add_meal("Friday", recipes[1])
+    assert plan.daily_summary("Monday")["kcal"] == 201
+    assert plan.remove_meal_by_handle(handle) is recipes[0]
+    plan.remove_meal("Friday", Recipe("R1", {"ing1": 10, "salt": 1}, 101, 1, 1, 2))
+    assert plan.get_meals("Friday") == ()
+    plan.clear_day("Monday")
+    assert plan.weekly_summary() == MealPlan().weekly_summary()
+    with pytest.raises(ValueError):
+        plan.remove_meal_by_handle(handle)
+    with pytest.raises(ValueError):
+        plan.add_meal("Someday", recipes[0])
+    with pytest.raises(TypeError):
+        plan.add_meal("Monday", "soup")
+
+def test_summaries_follow_recipe_changes_and_pickling(recipes):
+    """Test stale totals after in-place recipe edits and a pickle round trip"""
+    plan = ConcurrentMealPlan()
+    plan.add_meal("Tuesday", recipes[2])
+    recipes[2].update_kcal(900)
+    assert plan.daily_summary("Tuesday")["kcal"] == 900
+    copy = pickle.loads(pickle.dumps(plan))
+    assert copy.weekly_summary() == plan.weekly_summary()
+    copy.add_meal("Tuesday", recipes[0])
+    assert len(plan.get_meals("Tuesday")) == 1
+
+def test_many_meals_in_one_day(recipes):
+    """Test removals by handle and by recipe across many chunks of a day"""
+    plan = ConcurrentMealPlan()
+    reference = MealPlan()
+    handles = [plan.add_meal("Sunday", recipes[i % 10]) for i in range(300)]
+    reference_handles = [reference.add_meal("Sunday", recipes[i % 10]) for i in range(300)]
+    for i in range(0, 300, 3):
+        assert plan.remove_meal_by_handle(handles[i]) is recipes[i % 10]
+        reference.remove_meal_by_handle(reference_handles[i])
+    plan.remove_meal("Sunday", recipes[4])
+    reference.remove_meal("Sunday", recipes[4])
+    assert plan.get_meals("Sunday") == tuple(reference.get_meals("Sunday"))
+    assert plan.daily_summary("Sunday") == reference.daily_summary("Sunday")
+    plan.clear_day("Sunday")
+    assert not plan._where
+    with pytest.raises(ValueError):
+        plan.remove_meal_by_handle(handles[1])
+
+def test_recomputed_totals_are_cached(recipes):
+    """Test that totals recomputed after a recipe edit are reused"""
+    plan = ConcurrentMealPlan()
+    plan.add_meal("Monday", recipes[0])
+    recipes[0].update_kcal(300)
+    assert plan.daily_summary("Monday")["kcal"] == 300
+    state = plan._week["Monday"]
+    assert state._totals == (plan._epochs["Monday"], {"kcal": 300, "protein": 0, "fat": 1, "carbs": 2})
+    plan.add_meal("Monday", recipes[1])
+    assert plan._week["Monday"]._totals[1] is None
+    assert plan.daily_summary("Monday")["kcal"] == 401
+
+def test_totals_do_not_depend_on_edit_history():
+    """Test that removing a meal gives the same totals as never adding it"""
+    plan = ConcurrentMealPlan()
+    small, large = Recipe("Small", {}, 0.1, 1, 0, 0), Recipe("Large", {}, 1e17, 1e17, 0, 0)
+    plan.add_meal("Monday", small)
+    plan.add_meal("Monday", Recipe("Other", {}, 0.2, 1, 0, 0))
+    plan.add_meal("Monday", large)
+    plan.daily_summary("Monday")
+    plan.remove_meal("Monday", small)
+    plan.remove_meal("Monday", large)
+    assert plan.daily_summary("Monday") == {"kcal": 0.2, "protein": 1, "fat": 0, "carbs": 0}
+
+def test_unrelated_recipe_edits_keep_cached_totals(recipes):
+    """Test that only days planning an edited recipe are invalidated"""
+    plan = ConcurrentMealPlan()
+    plan.add_meal("Monday", recipes[0])
+    plan.add_meal("Tuesday", recipes[1])
+    plan.weekly_summary()
+    epochs = dict(plan._epochs)
+    recipes[5].update_kcal(1)
+    Recipe("Other", {}, 1, 1, 1, 1).update_kcal(2)
+    recipes[1].update_kcal(50)
+    assert plan._epochs["Monday"] is epochs["Monday"]
+    assert plan._epochs["Tuesday"] is not epochs["Tuesday"]
+    assert plan.weekly_summary()["Tuesday"]["kcal"] == 50
+    plan.clear_day("Tuesday")
+    assert id(recipes[1]) not in plan._watched
+    tuesday = plan._epochs["Tuesday"]
+    recipes[1].update_kcal(60)
+    assert plan._epochs["Tuesday"] is tuesday
+
+def test_concurrent_writers_and_readers(recipes):
+    """Test that parallel edits are not lost and readers see whole days"""
+    plan = ConcurrentMealPlan()
+    errors = []
+
+    def writer(index):
+        day = DAYS[index % 7]
+        for _ in range(200):
+            first = plan.add_meal(day, recipes[index])
+            plan.add_meal(day, recipes[index])
+            plan.remove_meal_by_handle(first)
+
+    def reader(index):
+        for _ in range(200):
+            for day, state in plan._week.items():
+                if state.current_totals(plan._epochs[day])["kcal"] != sum(meal.kcal for meal in state.meals):
+                    errors.append(state)
+
+    def worker(index):
+        (writer if index < 8 else reader)(index)
+
+    run_threads(worker, 10)
+    assert not errors
+    assert sum(len(meals) for meals in plan.plan.values()) == 8 * 200
+    expected = {day: {"kcal": 0, "protein": 0, "fat": 0, "carbs": 0} for day in DAYS}
+    for index in range(8):
+        for key, value in recipes[index].total_nutrients().items():
+            expected[DAYS[index % 7]][key] += 200 * value
+    assert plan.weekly_summary() == expected
+
+#############################################
+# Testy listy zakupów #
+#############################################
+
+def test_shopping_list_api():
+    """Test the single-threaded ShoppingList API"""
+    shopping_list = ConcurrentShoppingList(stripes=4)
+    shopping_list.add_item("flour", 100)
+    shopping_list.add_item("sugar", 50)
+    shopping_list.update_item_quantity("sugar", 20)
+    shopping_list.scale_quantities(2)
+    assert shopping_list.snapshot() == {"flour": 200, "sugar": 40}
+    other = ShoppingList()
+    other.add_item("flour", 1)
+    merged = shopping_list.merge(other)
+    assert isinstance(merged, ConcurrentShoppingList)
+    assert merged.get_item_quantity("flour") == 201
+    shopping_list.merge_in_place(merged)
+    assert shopping_list.get_total_quantity() == 481
+    assert shopping_list.filter_by_threshold(100).get_items() == {"flour": 401}
+    copy = pickle.loads(pickle.dumps(shopping_list))
+    assert copy.get_items() == shopping_list.get_items()
+    shopping_list.remove_item("sugar")
+    shopping_list.clear()
+    assert shopping_list.get_total_items() == 0
+    with pytest.raises(ValueError):
+        ConcurrentShoppingList(stripes=0)
+    with pytest.raises(ValueError):
+        shopping_list.scale_quantities(-1)
+
+def test_concurrent_adds_are_not_lost():
+    """Test striped read-modify-write updates from many threads"""
+    shopping_list = ConcurrentShoppingList(stripes=2)
+
+    def add(index):
+        for round in range(500):
+            shopping_list.add_item(f"item{round % 20}", 1)
+
+    run_threads(add, 8)
+    assert shopping_list.get_items() == {f"item{i}": 200 for i in range(20)}
+
+def test_scaling_is_atomic_for_readers():
+    """Test that readers never see a partially scaled list"""
+    shopping_list = ConcurrentShoppingList()
+    shopping_list.import_list({f"item{i}": 1.0 for i in range(200)})
+    torn = []
+
+    def worker(index):
+        for round in range(100):
+            if index == 0:
+                shopping_list.scale_quantities(2 if round % 2 == 0 else 0.5)
+            elif index == 1:
+                shopping_list.add_item("other", 1)
+            else:
+                items = shopping_list.snapshot()
+                items.pop("other", None)
+                if len(set(items.values())) != 1:
+                    torn.append(items)
+
+    run_threads(worker, 4)
+    assert not torn
+    assert shopping_list.get_item_quantity("item0") == 1.0
+
+def test_tracking_concurrent_plan(recipes):
+    """Test a shopping list following a plan edited from several threads"""
+    plan = ConcurrentMealPlan()
+    shopping_list = ConcurrentShoppingList()
+    shopping_list.track_mealplan(plan)
+
+    def edit(index):
+        for _ in range(100):
+            handle = plan.add_meal(DAYS[index], recipes[index])
+            plan.add_meal(DAYS[index], recipes[index])
+            plan.remove_meal_by_handle(handle)
+
+    run_threads(edit, 7)
+    assert shopping_list.get_item_quantity("salt") == 700
+    assert shopping_list.get_item_quantity("ing3") == 1000
@@ -0,0 +1,144 @@
+import pytest
+from src.recipe import Recipe
+from src.shoppinglist import ShoppingList, generate_shopping_list
+from src.units import Quantity, UnitRegistry, parse_quantity, unit_name, unit_registry
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def registry():
+    return UnitRegistry()
+
+#############################################
+# Testy parsowania i przeliczania jednostek #
+#############################################
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (200, 200),
+        ("1.5 kg", Quantity(1.5, "kg")),
+        ("2tbsp", Quantity(2.0, "tbsp")),
+        ("3 Pieces", Quantity(3.0, "pcs")),
+        ("250", 250.0),
+        ((1, "Litre"), Quantity(1, "l")),
+        ([2, "cups"], Quantity(2, "cup")),
+    ],
+)
+def test_parse_quantity(value, expected):
+    """Test parsing of numbers, strings and (amount, unit) pairs"""
+    assert parse_quantity(value) == expected
+
+@pytest.mark.parametrize("value", ["a lot", "2 bushels", (1, "g", 2), ("1", "g"), None])
+def test_parse_invalid_quantity(value):
+    """Test rejection of malformed quantities and unknown units"""
+    with pytest.raises((ValueError, TypeError)):
+        parse_quantity(value)
+
+def test_same_dimension_conversions(registry):
+    """Test precomputed conversions within mass, volume and count"""
+    assert registry.convert("x", 1.5, "kg", "g") == 1500
+    assert registry.convert("x", 2, "l", "ml") == 2000
+    assert registry.convert("x", 3, "tsp", "tbsp") == pytest.approx(1)
+    assert registry.convert("x", 2, "dozen", "pcs") == 24
+    assert unit_name("Grams") == "g"
+
+def test_density_conversions(registry):
+    """Test volume to mass conversion through ingredient densities"""
+    assert registry.convert("flour", 100, "ml", "g") == pytest.approx(53)
+    assert registry.convert("water", 1, "kg", "l") == pytest.approx(1)
+    registry.set_density("syrup", 1.3)
+    assert registry.convert("syrup", 2, "tbsp", "g") == pytest.approx(2 * 14.78676478125 * 1.3)
+    with pytest.raises(ValueError):
+        registry.convert("gravel", 1, "cup", "g")
+    with pytest.raises(ValueError):
+        registry.convert("pebbles", 2, "pcs", "g")
+    assert registry.convert("eggs", 2, "pcs", "g") == 100
+    assert registry.convert("eggs", 1, "kg", "dozen") == pytest.approx(20 / 12)
+    with pytest.raises(ValueError):
+        registry.set_density("syrup", 0)
+
+def test_canonical_unit_is_fixed(registry):
+    """Test that canonical units come from declarations and defaults only"""
+    assert registry.unit_of("flour") == "g"
+    assert registry.unit_of("milk") == "ml"
+    assert registry.unit_of("eggs") == "pcs"
+    assert registry.to_canonical("milk", "103 g") == pytest.approx(100)
+    assert registry.to_canonical("milk", 50) == 50
+    assert registry.to_canonical("eggs", "100 g") == 2
+    registry.set_unit("syrup", "dozen")
+    assert registry.unit_of("syrup") == "pcs"
+    registry.set_unit("syrup", "l")
+    registry.to_canonical("syrup", 5)
+    registry.set_unit("syrup", "g")
+    registry.mark_stored("syrup")
+    with pytest.raises(ValueError):
+        registry.set_unit("syrup", "ml")
+    registry.set_unit("syrup", "kg")
+
+@pytest.mark.parametrize("quantities", [[500, "1 l", "200 g"], ["200 g", "1 l", 500], ["1 l", 500, "200 g"]])
+def test_conversion_does_not_depend_on_load_order(quantities):
+    """Test that the same quantities give the same canonical amounts in any order"""
+    registry = UnitRegistry()
+    converted = {quantity: registry.to_canonical("stock", quantity) for quantity in quantities}
+    assert converted == {500: 500, "1 l": 1000, "200 g": 200}
+    with pytest.raises(ValueError):
+        registry.to_canonical("mystery sauce", "1 l")
+    assert registry.to_canonical("mystery sauce", "1 kg") == 1000
+
+#############################################
+# Testy normalizacji w przepisach i listach #
+#############################################
+
+def test_recipe_normalizes_quantities_at_ingestion():
+    """Test that recipes store plain canonical floats"""
+    recipe = Recipe(
+        "Pancakes",
+        {"test flour": "0.25 kg", "milk": (0.5, "l"), "eggs": "2 pcs", "test salt": 1},
+        800, 30, 20, 100,
+    )
+    assert dict(recipe.ingredients) == {"test flour": 250, "milk": 500, "eggs": 2, "test salt": 1}
+    recipe.add_ingredient("milk", "1 cup")
+    recipe.update_ingredient_quantity("test flour", (1, "lb"))
+    assert recipe.ingredients["milk"] == pytest.approx(236.5882365)
+    assert recipe.ingredients["test flour"] == pytest.approx(453.59237)
+    details = recipe.detailed_str()
+    assert "- eggs: 2.0 pcs" in details
+    assert "- test salt: 1g" in details
+    assert "ml" in details
+    with pytest.raises(ValueError):
+        Recipe("Bad", {"test flour": "-1 kg"}, 1, 1, 1, 1)
+
+def test_shopping_list_aggregates_canonical_quantities():
+    """Test that unit-aware recipes aggregate as plain float sums"""
+    first = Recipe("A", {"test sugar": "1 kg"}, 1, 1, 1, 1)
+    second = Recipe("B", {"test sugar": "250 g"}, 1, 1, 1, 1)
+    assert generate_shopping_list([first, second]) == {"test sugar": 1250}
+
+    sl = ShoppingList()
+    sl.add_item("test sugar", "0.5 kg")
+    sl.add_item("test sugar", 100)
+    assert sl.get_item_quantity("test sugar") == 600
+    assert sl.get_item_quantity("test sugar", "kg") == pytest.approx(0.6)
+    sl.update_item_quantity("test sugar", "2 kg")
+    assert sl.get_item_quantity("test sugar") == 2000
+
+def test_unit_of_stored_plain_quantities_is_fixed():
+    """Test that plain numbers already stored keep their unit"""
+    Recipe("Bread", {"test rye flour": 200}, 1, 1, 1, 1)
+    with pytest.raises(ValueError):
+        unit_registry.set_unit("test rye flour", "ml")
+    ShoppingList().add_item("test semolina", 300)
+    with pytest.raises(ValueError):
+        unit_registry.set_unit("test semolina", "pcs")
+    assert unit_registry.unit_of("test rye flour") == unit_registry.unit_of("test semolina") == "g"
+
+def test_mixed_units_aggregate_in_one_unit():
+    """Test that plain numbers and unit quantities of one ingredient add up consistently"""
+    first = Recipe("Soup", {"stock": 500}, 1, 1, 1, 1)
+    second = Recipe("Stew", {"stock": "1 l", "eggs": "2 pcs"}, 1, 1, 1, 1)
+    third = Recipe("Gravy", {"stock": "200 g", "eggs": "100 g"}, 1, 1, 1, 1)
+    assert generate_shopping_list([first, second, third]) == {"stock": 1700, "eggs": 4}
+    assert "- stock: 500ml" in first.detailed_str()
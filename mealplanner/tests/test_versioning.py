@@ -0,0 +1,122 @@
+import pytest
+from src.mealplan import MealPlan
+from src.recipe import Recipe
+from src.snapshot import RecipeSnapshot
+from src.versioning import PlanVersion, VersionedMealPlan
+
+#############################################
+# Fixtures #
+#############################################
+
+@pytest.fixture
+def pasta():
+    return Recipe("Pasta", {"pasta": 200, "tomato": 100}, 500, 20, 10, 80)
+
+@pytest.fixture
+def salad():
+    return Recipe("Salad", {"lettuce": 100}, 150, 5, 8, 10)
+
+#############################################
+# Testy migawek i współdzielenia #
+#############################################
+
+def test_snapshots_share_unedited_days(pasta, salad):
+    """Test that an edit copies only the day it touches"""
+    plan = VersionedMealPlan()
+    plan.add_meal("Monday", pasta)
+    before = plan.snapshot()
+    plan.add_meal("Tuesday", salad)
+    after = plan.snapshot()
+    assert before.get_meals("Monday") is after.get_meals("Monday")
+    assert before.get_meals("Tuesday") == ()
+    assert after.get_meals("Tuesday")[0].name == "Salad"
+
+def test_versions_are_isolated_from_recipe_changes(pasta):
+    """Test copy-on-write semantics for recipes modified after planning"""
+    plan = VersionedMealPlan()
+    plan.add_meal("Monday", pasta)
+    plan.add_meal("Friday", pasta)
+    frozen = plan.snapshot()
+    pasta.update_kcal(900)
+    assert frozen.daily_summary("Monday")["kcal"] == 500
+    assert frozen.get_meals("Monday")[0] is frozen.get_meals("Friday")[0]
+    plan.add_meal("Monday", pasta)
+    assert plan.daily_summary("Monday")["kcal"] == 1400
+    with pytest.raises(AttributeError):
+        frozen.extra = 1
+
+def test_round_trip_with_mealplan(pasta, salad):
+    """Test conversion from and to a regular MealPlan"""
+    original = MealPlan()
+    original.add_meal("Monday", pasta)
+    original.add_meal("Sunday", salad)
+    plan = VersionedMealPlan.from_mealplan(original)
+    assert plan.weekly_summary() == original.weekly_summary()
+    restored = plan.snapshot().to_mealplan()
+    assert restored.get_meals("Sunday") == [salad]
+    assert restored.get_meals("Monday")[0] is not pasta
+
+#############################################
+# Testy cofania i porównywania #
+#############################################
+
+def test_undo_redo_and_restore(pasta, salad):
+    """Test walking through the edit history"""
+    plan = VersionedMealPlan()
+    empty = plan.snapshot()
+    plan.add_meal("Monday", pasta)
+    plan.add_meal("Monday", salad)
+    plan.remove_meal("Monday", pasta)
+    assert [meal.name for meal in plan.get_meals("Monday")] == ["Salad"]
+    plan.undo()
+    assert [meal.name for meal in plan.get_meals("Monday")] == ["Pasta", "Salad"]
+    plan.redo()
+    assert len(plan.get_meals("Monday")) == 1
+    plan.restore(empty)
+    assert plan.snapshot() == empty
+    plan.undo()
+    assert len(plan.get_meals("Monday")) == 1
+    plan.clear_day("Monday")
+    assert not plan.can_redo()
+    with pytest.raises(ValueError):
+        plan.redo()
+
+def test_history_is_bounded(pasta):
+    """Test that only the configured number of versions is retained"""
+    plan = VersionedMealPlan(history=3)
+    for _ in range(10):
+        plan.add_meal("Monday", pasta)
+    for _ in range(3):
+        plan.undo()
+    assert len(plan.get_meals("Monday")) == 7
+    with pytest.raises(ValueError):
+        plan.undo()
+
+def test_diff_reports_added_and_removed_meals(pasta, salad):
+    """Test diffing two versions"""
+    plan = VersionedMealPlan()
+    plan.add_meal("Monday", pasta)
+    plan.add_meal("Monday", pasta)
+    plan.add_meal("Friday", salad)
+    before = plan.snapshot()
+    plan.remove_meal("Monday", pasta)
+    plan.add_meal("Monday", salad)
+    plan.clear_day("Friday")
+    plan.add_meal("Friday", salad)
+    changes = before.diff(plan.snapshot())
+    assert changes == {"Monday": ((RecipeSnapshot.from_recipe(salad),), (RecipeSnapshot.from_recipe(pasta),))}
+    assert before.diff(before) == {}
+
+def test_invalid_input(pasta):
+    """Test rejection of unknown days, missing meals and wrong types"""
+    plan = VersionedMealPlan()
+    with pytest.raises(ValueError):
+        plan.add_meal("Someday", pasta)
+    with pytest.raises(ValueError):
+        plan.remove_meal("Monday", pasta)
+    with pytest.raises(TypeError):
+        plan.add_meal("Monday", "pasta")
+    with pytest.raises(ValueError):
+        VersionedMealPlan(history=0)
+    with pytest.raises(ValueError):
+        PlanVersion(((),) * 3)